@@ -16,6 +16,9 @@ __all__ = [
     "trackswhere",
     "interp_time",
     "concat_tracks",
+    "encode_categories",
+    "decode_categories",
+    "track_index",
     # Parameters
     "basins",
     "example_csv_file",
@@ -62,7 +65,9 @@ from ._data import (
 from ._basins import basins
 from ._interp import interp_time
 from ._concat import concat_tracks
+from ._categorical import encode_categories, decode_categories
 from ._subset import sel_id, trackswhere
+from ._track_index import track_index
 from . import calc, plot, assess, info, tc
 
 from . import _accessor
@@ -5,9 +5,12 @@ from . import info
 from . import calc
 from . import tc
 from . import plot
+from ._categorical import decode_categories, encode_categories
 from ._data import save
+from ._data._netcdf import _find_rowsize, is_ragged
 from ._interp import interp_time
 from ._subset import sel_id, trackswhere
+from ._track_index import track_index
 
 
 @xr.register_dataarray_accessor("hrcn")
@@ -45,28 +48,87 @@ class HuracanPyDatasetAccessor:
     def sel_id(self, track_id, track_id_name="track_id"):
         return sel_id(self._dataset, self._dataset[track_id_name], track_id)
 
-    def trackswhere(self, condition, track_id_name="track_id"):
-        return trackswhere(self._dataset, self._dataset[track_id_name], condition)
+    def trackswhere(
+        self,
+        condition=None,
+        track_id_name="track_id",
+        *,
+        reductions=None,
+        op=None,
+        value=None,
+    ):
+        return trackswhere(
+            self._dataset,
+            self._dataset[track_id_name],
+            condition,
+            reductions=reductions,
+            op=op,
+            value=value,
+        )
+
+    def track_index(self, track_id_name="track_id"):
+        """
+        Get the index of the records of each track, computed once and then reused.
+        """
+        track_ids = self._dataset[track_id_name]
+        if is_ragged(self._dataset, track_ids):
+            return track_index(track_ids, rowsize=_find_rowsize(self._dataset))
+        return track_index(track_ids)
+
+    def encode_categories(self, var_name, categories=None):
+        """
+        Replace a variable with integer codes and a table of labels.
+        """
+        self._dataset[var_name] = encode_categories(
+            self._dataset[var_name], categories=categories
+        )
+        return self._dataset
+
+    def decode_categories(self, var_name):
+        """
+        Replace a variable of integer codes with its labels.
+        """
+        self._dataset[var_name] = decode_categories(self._dataset[var_name])
+        return self._dataset
 
     # %% utils
     # ---- geography
-    def get_hemisphere(self, lat_name="lat"):
-        return info.hemisphere(self._dataset[lat_name])
+    def get_hemisphere(self, lat_name="lat", categorical=False):
+        return info.hemisphere(self._dataset[lat_name], categorical=categorical)
 
-    def add_hemisphere(self, lat_name="lat"):
-        self._dataset["hemisphere"] = self.get_hemisphere(lat_name=lat_name)
+    def add_hemisphere(self, lat_name="lat", categorical=False):
+        self._dataset["hemisphere"] = self.get_hemisphere(
+            lat_name=lat_name, categorical=categorical
+        )
         return self._dataset
 
-    def get_basin(self, lon_name="lon", lat_name="lat", convention="WMO-TC", crs=None):
+    def get_basin(
+        self,
+        lon_name="lon",
+        lat_name="lat",
+        convention="WMO-TC",
+        crs=None,
+        categorical=False,
+    ):
         return info.basin(
             self._dataset[lon_name],
             self._dataset[lat_name],
             convention=convention,
             crs=crs,
+            categorical=categorical,
         )
 
-    def add_basin(self, lon_name="lon", lat_name="lat", convention="WMO-TC", crs=None):
-        self._dataset["basin"] = self.get_basin(lon_name, lat_name, convention, crs)
+    def add_basin(
+        self,
+        lon_name="lon",
+        lat_name="lat",
+        convention="WMO-TC",
+        crs=None,
+        categorical=False,
+    ):
+        self._dataset["basin"] = self.get_basin(
+            lon_name, lat_name, convention, crs, categorical
+        )
         return self._dataset
 
     def get_is_land(self, lon_name="lon", lat_name="lat", resolution="10m", crs=None):
@@ -95,29 +157,61 @@ class HuracanPyDatasetAccessor:
         )
         return self._dataset
 
-    def get_country(self, lon_name="lon", lat_name="lat", resolution="10m", crs=None):
+    def get_country(
+        self,
+        lon_name="lon",
+        lat_name="lat",
+        resolution="10m",
+        crs=None,
+        categorical=False,
+    ):
         return info.country(
             self._dataset[lon_name],
             self._dataset[lat_name],
             resolution=resolution,
             crs=crs,
+            categorical=categorical,
         )
 
-    def add_country(self, lon_name="lon", lat_name="lat", resolution="10m", crs=None):
-        self._dataset["country"] = self.get_country(lon_name, lat_name, resolution, crs)
+    def add_country(
+        self,
+        lon_name="lon",
+        lat_name="lat",
+        resolution="10m",
+        crs=None,
+        categorical=False,
+    ):
+        self._dataset["country"] = self.get_country(
+            lon_name, lat_name, resolution, crs, categorical
+        )
         return self._dataset
 
-    def get_continent(self, lon_name="lon", lat_name="lat", resolution="10m", crs=None):
+    def get_continent(
+        self,
+        lon_name="lon",
+        lat_name="lat",
+        resolution="10m",
+        crs=None,
+        categorical=False,
+    ):
         return info.continent(
             self._dataset[lon_name],
             self._dataset[lat_name],
             resolution=resolution,
             crs=crs,
+            categorical=categorical,
         )
 
-    def add_continent(self, lon_name="lon", lat_name="lat", resolution="10m", crs=None):
+    def add_continent(
+        self,
+        lon_name="lon",
+        lat_name="lat",
+        resolution="10m",
+        crs=None,
+        categorical=False,
+    ):
         self._dataset["continent"] = self.get_continent(
-            lon_name, lat_name, resolution, crs
+            lon_name, lat_name, resolution, crs, categorical
         )
         return self._dataset
 
@@ -255,6 +349,7 @@ class HuracanPyDatasetAccessor:
         lat_name="lat",
         time_name="time",
         convention="tc-short",
+        categorical=False,
     ):
         """
         Derive the season for each track based on latitude and time.
@@ -264,6 +359,7 @@ class HuracanPyDatasetAccessor:
             self._dataset[lat_name],
             self._dataset[time_name],
             convention=convention,
+            categorical=categorical,
         )
 
     def add_season(
@@ -272,12 +368,13 @@ class HuracanPyDatasetAccessor:
         lat_name="lat",
         time_name="time",
         convention="tc-short",
+        categorical=False,
     ):
         """
         Add the season as a new variable to the dataset.
         """
         self._dataset["season"] = self.get_season(
-            track_id_name, lat_name, time_name, convention
+            track_id_name, lat_name, time_name, convention, categorical
         )
         return self._dataset
 
@@ -296,6 +393,7 @@ class HuracanPyDatasetAccessor:
         bins=None,
         labels=None,
         variable_units=None,
+        categorical=False,
     ):
         """
         Calculate a generic category from a variable and a set of thresholds.
@@ -305,6 +403,7 @@ class HuracanPyDatasetAccessor:
             bins=bins,
             labels=labels,
             variable_units=variable_units,
+            categorical=categorical,
         )
 
     def add_category(
@@ -314,6 +413,7 @@ class HuracanPyDatasetAccessor:
         bins=None,
         labels=None,
         variable_units=None,
+        categorical=False,
     ):
         """
         Add a generic category to the dataset as a new variable.
@@ -325,6 +425,7 @@ class HuracanPyDatasetAccessor:
             bins=bins,
             labels=labels,
             variable_units=variable_units,
+            categorical=categorical,
         )
         return self._dataset
 
@@ -585,12 +686,22 @@ class HuracanPyDatasetAccessor:
         return self._dataset
 
     # ---- interp
-    def interp_time(self, freq="1h", track_id_name="track_id", prog_bar=False):
+    def interp_time(
+        self,
+        freq="1h",
+        track_id_name="track_id",
+        prog_bar=False,
+        method_non_numeric="nearest",
+    ):
         """
         Interpolate track data at a given frequency.
         """
         return interp_time(
-            self._dataset, self._dataset[track_id_name], freq=freq, prog_bar=prog_bar
+            self._dataset,
+            self._dataset[track_id_name],
+            freq=freq,
+            prog_bar=prog_bar,
+            method_non_numeric=method_non_numeric,
         )
 
     # ---- lifecycle
@@ -716,6 +827,11 @@ class HuracanPyDatasetAccessor:
             self._dataset[time_name], self._dataset[track_id_name]
         )
 
+    def get_track_reduce(self, reductions, track_id_name="track_id"):
+        return calc.track_reduce(
+            self._dataset, reductions, self._dataset[track_id_name]
+        )
+
     def get_gen_vals(self, time_name="time", track_id_name="track_id"):
         return calc.gen_vals(
             self._dataset, self._dataset[time_name], self._dataset[track_id_name]
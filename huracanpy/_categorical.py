@@ -0,0 +1,133 @@
+"""
+Functions to store low-cardinality variables (e.g. basin) as integer codes
+"""
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+__all__ = ["encode_categories", "decode_categories"]
+
+
+def encode_categories(values, categories=None):
+    """Store a variable with a small number of distinct values (e.g. basin or
+    hemisphere) as integer codes with a table of the labels
+
+    The labels are kept in the "categories" attribute, and each code is the index of
+    its label in the table. Missing values, or values not in `categories`, are given
+    the code -1. The labels are kept when the tracks are saved and loaded with
+    :py:func:`huracanpy.save` and :py:func:`huracanpy.load` (netCDF, Zarr, parquet, and
+    Feather files), and the codes can be used directly for e.g.
+    :py:meth:`xarray.Dataset.groupby` or :py:func:`huracanpy.trackswhere`
+
+    >>> tracks["basin"] = huracanpy.encode_categories(tracks.basin)
+    >>> tracks.groupby("basin")
+
+    Parameters
+    ----------
+    values : array_like
+        The values to encode
+    categories : array_like, optional
+        The labels to use for the codes. If None, the sorted unique values are used
+
+    Returns
+    -------
+    xarray.DataArray
+        The integer codes, using the smallest integer type that fits the number of
+        categories
+    """
+    if is_categorical(values):
+        if categories is None:
+            return values
+        values = decode_categories(values)
+
+    flat = np.asarray(values).ravel()
+    if categories is None:
+        codes, categories = pd.factorize(flat, sort=True)
+    else:
+        codes = pd.Index(categories).get_indexer(flat)
+    categories = [str(label) for label in categories]
+    codes = codes.reshape(np.shape(values))
+    codes = codes.astype(np.min_scalar_type(-max(len(categories), 1)))
+
+    if isinstance(values, xr.DataArray):
+        attrs = {**values.attrs, "categories": categories}
+        return values.copy(data=codes).assign_attrs(attrs)
+
+    return xr.DataArray(codes, attrs=dict(categories=categories))
+
+
+def decode_categories(codes):
+    """Convert integer codes, from :py:func:`huracanpy.encode_categories`, back to
+    their labels
+
+    Parameters
+    ----------
+    codes : xarray.DataArray
+        The integer codes, with the table of labels in the "categories" attribute
+
+    Returns
+    -------
+    xarray.DataArray
+        The label at each point. Missing values (code -1) are returned as "nan"
+    """
+    if not is_categorical(codes):
+        msg = f"{codes.name} does not have a categories attribute"
+        raise ValueError(msg)
+
+    labels = np.append(categories(codes), "nan")
+    attrs = {key: value for key, value in codes.attrs.items() if key != "categories"}
+
+    return codes.copy(data=labels[np.asarray(codes)]).assign_attrs(attrs)
+
+
+def is_categorical(values):
+    """Whether values are integer codes with a categories attribute"""
+    return (
+        isinstance(values, xr.DataArray)
+        and "categories" in values.attrs
+        and np.issubdtype(values.dtype, np.integer)
+    )
+
+
+def categories(codes):
+    """The table of labels for integer codes. Single labels loaded from netCDF files
+    are returned as a str rather than a list, so always return an array
+    """
+    return np.atleast_1d(np.asarray(codes.attrs["categories"], dtype=str))
+
+
+def combine_categories(objs):
+    """Give variables encoded as categories the same codes in each Dataset, so the
+    Datasets can be concatenated
+
+    Parameters
+    ----------
+    objs : list of xarray.Dataset
+        The Datasets to be concatenated
+
+    Returns
+    -------
+    list of xarray.Dataset
+    """
+    names = {
+        name
+        for tracks in objs
+        for name in tracks.variables
+        if is_categorical(tracks[name])
+    }
+
+    for name in names:
+        tables = [categories(tracks[name]) for tracks in objs if name in tracks]
+        if all(np.array_equal(table, tables[0]) for table in tables[1:]):
+            continue
+
+        union = list(dict.fromkeys(np.concatenate(tables)))
+        objs = [
+            tracks.assign({name: encode_categories(tracks[name], union)})
+            if name in tracks
+            else tracks
+            for tracks in objs
+        ]
+
+    return objs
@@ -1,6 +1,8 @@
 import numpy as np
 import xarray as xr
 
+from ._categorical import combine_categories
+
 
 def concat_tracks(
     objs, track_id="track_id", *, prefix=None, start=0, keep_track_id=False, **kwargs
@@ -55,6 +57,9 @@ def concat_tracks(
 
         all_tracks.append(tracks)
 
+    # Variables encoded as categories may have different labels in each set of tracks
+    all_tracks = combine_categories(all_tracks)
+
     return xr.concat(all_tracks, dim=track_id_old.dims[0], **kwargs)
 
 
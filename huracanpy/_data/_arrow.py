@@ -0,0 +1,108 @@
+"""
+Module to save tracks as parquet or Arrow IPC (Feather) files
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .._categorical import categories, is_categorical
+from . import _netcdf
+
+
+def save(dataset, filename, file_format="parquet", row_group_size=100_000, **kwargs):
+    """Save tracks as a parquet or Arrow IPC (Feather) file
+
+    Each row group (parquet) or record batch (Arrow IPC) contains whole tracks, and
+    string variables (e.g. basin, name, sid) are dictionary encoded. Parquet files are
+    written with the statistics (min/max) of each column for each row group, so the
+    row groups can be skipped by readers filtering on e.g. time, lon, lat or track_id
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The tracks to save
+    filename : str
+        The file to save to
+    file_format : str, default="parquet"
+        "parquet" or "feather"
+    row_group_size : int, default=100_000
+        The approximate number of records in each row group. Row groups are only split
+        between tracks, so will be larger if a track would be split
+    **kwargs
+        Remaining keywords are passed to :py:class:`pyarrow.parquet.ParquetWriter` or
+        :py:class:`pyarrow.ipc.IpcWriteOptions`
+    """
+    table, track_starts = _to_arrow(dataset)
+
+    # Split at the first track start after each multiple of row_group_size
+    idx = np.searchsorted(
+        track_starts, np.arange(row_group_size, table.num_rows, row_group_size)
+    )
+    splits = np.unique(
+        np.concatenate(
+            [[0], track_starts[idx[idx < len(track_starts)]], [table.num_rows]]
+        )
+    )
+
+    if file_format == "parquet":
+        kwargs = {**dict(write_statistics=True), **kwargs}
+        with pq.ParquetWriter(filename, table.schema, **kwargs) as writer:
+            for start, end in zip(splits[:-1], splits[1:]):
+                writer.write_table(table.slice(start, end - start))
+    elif file_format == "feather":
+        options = pa.ipc.IpcWriteOptions(**kwargs)
+        with pa.ipc.new_file(filename, table.schema, options=options) as writer:
+            for start, end in zip(splits[:-1], splits[1:]):
+                writer.write_table(
+                    table.slice(start, end - start), max_chunksize=end - start
+                )
+    else:
+        msg = f"file_format must be one of {{parquet, feather}}, not {file_format}"
+        raise ValueError(msg)
+
+
+def _to_arrow(dataset):
+    # Convert the tracks to a pyarrow.Table with the points of each track contiguous.
+    # Also returns the index of the first point of each track
+    trajectory_id = _netcdf._find_trajectory_id(dataset)
+    if _netcdf.is_ragged(dataset, trajectory_id):
+        dataset = _netcdf.stretch_trid(dataset, trajectory_id)
+        trajectory_id = dataset.track_id
+
+    if trajectory_id.ndim != 1:
+        msg = f"{trajectory_id.name} spans multiple dimensions, should be 1d"
+        raise ValueError(msg)
+
+    # Sort by trajectory_id if the tracks are not contiguous, so row groups can be
+    # split between tracks. Stable, so the order of points within tracks is kept
+    track_ids = trajectory_id.values
+    track_starts = np.flatnonzero(
+        np.concatenate([[True], track_ids[1:] != track_ids[:-1]])
+    )
+    if len(track_starts) != len(np.unique(track_ids)):
+        order = np.argsort(track_ids, kind="stable")
+        dataset = dataset.isel({trajectory_id.dims[0]: order})
+        track_ids = track_ids[order]
+        track_starts = np.flatnonzero(
+            np.concatenate([[True], track_ids[1:] != track_ids[:-1]])
+        )
+
+    # Variables encoded as categories are stored as dictionary arrays of their labels.
+    # Mark them in the pandas metadata, to tell them apart from dictionary encoded
+    # strings when loading
+    df = dataset.to_dataframe().reset_index(drop=True)
+    categorical = [var for var in dataset.data_vars if is_categorical(dataset[var])]
+    for var in categorical:
+        df[var] = pd.Categorical.from_codes(df[var], categories(dataset[var]))
+    df.attrs = dict(categorical=categorical) if len(categorical) > 0 else dict()
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Dictionary encode strings, which are typically repeated within and across tracks
+    for n, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(n, field.name, table.column(n).dictionary_encode())
+
+    return table, track_starts
@@ -2,7 +2,9 @@
 Module to load tracks stored as csv files, including TempestExtremes output.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 # All values recognised as NaN by pandas.read_csv, except "NA" which we want to load
 # normally because it is a basin, and added "" to interpret empty entries as NaN
@@ -63,8 +65,227 @@ def load(
 
     ## Read file
     tracks = load_function(filename, **kwargs)
+
+    return _to_xarray(tracks)
+
+
+def load_parquet(
+    filename,
+    variables=None,
+    track_ids=None,
+    time_range=None,
+    bbox=None,
+    keep_whole_tracks=False,
+    rename=None,
+):
+    """Load a parquet file of tracks as an xarray.Dataset, skipping row groups that
+    can't contain the tracks requested
+
+    Row groups are skipped using the statistics (min/max) of the track_id, time and lat
+    columns, where they are available. The points within each row group are not
+    filtered, so the tracks still need to be subset after loading
+
+    Parameters
+    ----------
+    filename : str
+        The parquet file to be loaded
+    variables : set, optional
+        Only load columns with these names (after stripping and making lowercase)
+    track_ids : array_like, optional
+        Skip row groups that don't contain these track IDs
+    time_range : tuple, optional
+        Skip row groups that don't contain times in this (start, end) range
+    bbox : tuple, optional
+        Skip row groups that don't contain latitudes in the range of this
+        (lon_min, lat_min, lon_max, lat_max) box
+    keep_whole_tracks : bool, default=False
+        If True, also load row groups with points from the same tracks as the row
+        groups that may match the time_range and bbox
+    rename : dict, optional
+        Mapping of column names to names used by huracanpy, used to find the track_id,
+        time, and lat columns
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    parquet_file = pq.ParquetFile(filename)
+    metadata = parquet_file.metadata
+
+    # Find the column index for the variables that are used to skip row groups
+    rename = {} if rename is None else rename
+    names = [name.strip().lower() for name in parquet_file.schema_arrow.names]
+    names = [rename.get(name, name) for name in names]
+    columns = {
+        key: names.index(key) for key in ["track_id", "time", "lat"] if key in names
+    }
+
+    bounds = dict()
+    if track_ids is not None and "track_id" in columns:
+        bounds["track_id"] = np.asarray(track_ids)
+    if time_range is not None and "time" in columns:
+        start, end = time_range
+        bounds["time"] = (
+            np.datetime64(start) if start is not None else None,
+            np.datetime64(end) if end is not None else None,
+        )
+    if bbox is not None and "lat" in columns:
+        bounds["lat"] = (bbox[1], bbox[3])
+
+    row_groups = [
+        n
+        for n in range(metadata.num_row_groups)
+        if all(
+            _overlaps(metadata.row_group(n).column(columns[key]).statistics, value)
+            for key, value in bounds.items()
+        )
+    ]
+
+    # Tracks can be split across row groups, so add any other row groups that might
+    # contain points from tracks in the selected row groups
+    if (
+        keep_whole_tracks
+        and "track_id" in columns
+        and len(row_groups) < metadata.num_row_groups
+    ):
+        selected_ids = parquet_file.read_row_groups(
+            row_groups, columns=[parquet_file.schema_arrow.names[columns["track_id"]]]
+        )
+        selected_ids = np.unique(selected_ids.column(0).to_numpy())
+        row_groups = [
+            n
+            for n in range(metadata.num_row_groups)
+            if n in row_groups
+            or _overlaps(
+                metadata.row_group(n).column(columns["track_id"]).statistics,
+                selected_ids,
+            )
+        ]
+
+    if variables is not None:
+        columns = [
+            name
+            for name in parquet_file.schema_arrow.names
+            if name.strip().lower() in variables
+        ]
+    else:
+        columns = None
+
+    tracks = parquet_file.read_row_groups(row_groups, columns=columns).to_pandas()
+
+    return _to_xarray(tracks)
+
+
+def _overlaps(statistics, bounds):
+    # Check whether the range of values in a row group could contain the selected
+    # track IDs (array) or values in the (start, end) range. Assume it does if it can't
+    # be checked
+    if statistics is None or not statistics.has_min_max:
+        return True
+
+    vmin, vmax = statistics.min, statistics.max
+    try:
+        if isinstance(bounds, np.ndarray):
+            return bool(np.any((bounds >= vmin) & (bounds <= vmax)))
+
+        start, end = bounds
+        if isinstance(start, np.datetime64) or isinstance(end, np.datetime64):
+            vmin, vmax = np.datetime64(vmin), np.datetime64(vmax)
+        return (start is None or vmax >= start) and (end is None or vmin <= end)
+    except TypeError:
+        return True
+
+
+def iter_load(filename, chunksize, load_function=pd.read_csv, **kwargs):
+    """Load csv tracks data as a sequence of xarray.Dataset
+
+    Parameters
+    ----------
+    filename : str
+        The file to be loaded. See :py:func:`load`
+    chunksize : int
+        The number of rows to read at a time. Note that this will generally split
+        tracks across the returned Datasets
+    load_function : callable
+        Either :py:func:`pandas.read_csv` or :py:func:`pandas.read_parquet`
+    **kwargs
+        Remaining keywords are passed to the pandas
+
+    Yields
+    ------
+    xarray.Dataset
+    """
+    if load_function is pd.read_parquet:
+        # Read the parquet file in batches of rows with pyarrow. Only the "columns"
+        # keyword is used from the pandas.read_parquet arguments
+        parquet_file = pq.ParquetFile(filename)
+        for batch in parquet_file.iter_batches(
+            batch_size=chunksize, columns=kwargs.get("columns")
+        ):
+            yield _to_xarray(batch.to_pandas())
+    else:
+        kwargs = {**dict(na_values=pandas_na_values, keep_default_na=False), **kwargs}
+        with load_function(filename, chunksize=chunksize, **kwargs) as reader:
+            for tracks in reader:
+                yield _to_xarray(tracks)
+
+
+def _usecols(variables, always):
+    # Select columns for pandas.read_csv, so the other columns are not converted. The
+    # columns in "always" are loaded regardless of the variables requested
+    if variables is None:
+        return None
+
+    return lambda name: name in always or name.strip().lower() in variables
+
+
+def _to_xarray(tracks):
     # Remove leading/trailing spaces and make all column names lowercase
     tracks.columns = tracks.columns.str.strip().str.lower()
 
+    # Variables saved as categories by huracanpy are marked in the parquet/Arrow
+    # metadata. Keep these as integer codes with the table of labels
+    names = list(tracks.columns)
+    marked = [name.strip().lower() for name in tracks.attrs.get("categorical", [])]
+    categorical = {
+        name: tracks[name].cat
+        for name in names
+        if name in marked and isinstance(tracks[name].dtype, pd.CategoricalDtype)
+    }
+    tracks = tracks.drop(columns=list(categorical))
+
+    # Dictionary-encoded columns in parquet/Arrow files are loaded as categoricals
+    for column in tracks.columns:
+        if isinstance(tracks[column].dtype, pd.CategoricalDtype) and not (
+            pd.api.types.is_string_dtype(tracks[column].cat.categories.dtype)
+        ):
+            tracks[column] = tracks[column].astype(tracks[column].cat.categories.dtype)
+
+    # Convert columns of strings directly to fixed-width numpy strings, rather than
+    # going through object arrays. Missing values become "nan", and strings like "NA"
+    # (e.g. the North Atlantic basin) are kept as is
+    strings = [column for column in tracks.columns if _is_strings(tracks[column])]
+
     # Output xr dataset
-    return tracks.to_xarray().rename({"index": "record"}).drop_vars("record")
+    dataset = tracks.drop(columns=strings).to_xarray()
+    dataset = dataset.rename({"index": "record"}).drop_vars("record")
+    for column in strings:
+        dataset[column] = ("record", tracks[column].to_numpy(dtype=object).astype(str))
+    for column, values in categorical.items():
+        dataset[column] = (
+            "record",
+            values.codes.to_numpy(),
+            dict(categories=[str(label) for label in values.categories]),
+        )
+
+    return dataset[names]
+
+
+def _is_strings(column):
+    values = column
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        values = column.cat.categories
+
+    if pd.api.types.is_object_dtype(values.dtype):
+        return pd.api.types.infer_dtype(values, skipna=True) == "string"
+    return pd.api.types.is_string_dtype(values.dtype)
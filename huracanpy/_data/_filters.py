@@ -0,0 +1,152 @@
+"""
+Module to filter tracks while loading them
+"""
+
+import numpy as np
+
+from .._subset import sel_id
+from . import _netcdf
+
+
+def select(
+    tracks,
+    time_range=None,
+    bbox=None,
+    track_ids=None,
+    variables=None,
+    keep_whole_tracks=False,
+):
+    """Subset loaded tracks to the points matching the filters passed to load
+
+    Parameters
+    ----------
+    tracks : xarray.Dataset
+        The loaded tracks
+    time_range : tuple, optional
+        (start, end) times. Either can be None to leave the range open-ended
+    bbox : tuple, optional
+        (lon_min, lat_min, lon_max, lat_max). Longitudes can be in any range, and the
+        box crosses the dateline if lon_min > lon_max
+    track_ids : array_like, optional
+        The track IDs to keep
+    variables : list of str, optional
+        The variables to keep, as well as the track_id
+    keep_whole_tracks : bool, default=False
+        Keep all the points of a track if any of its points match the time_range and
+        bbox. Otherwise, only the matching points are kept
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    if _netcdf.is_ragged(tracks, tracks.track_id):
+        # Tracks kept as a contiguous ragged array can only be selected by track
+        if time_range is not None or bbox is not None:
+            msg = (
+                "time_range and bbox can not be used for ragged netCDF files when"
+                " netcdf_stretch_track_id=False"
+            )
+            raise ValueError(msg)
+        if track_ids is not None:
+            tracks = sel_id(tracks, tracks.track_id, track_ids)
+
+    elif track_ids is not None or time_range is not None or bbox is not None:
+        track_id = tracks.track_id.values
+        mask = np.ones(track_id.shape, dtype=bool)
+        if track_ids is not None:
+            mask &= np.isin(track_id, track_ids)
+
+        points = points_mask(
+            tracks.time.values if time_range is not None else None,
+            tracks.lon.values if bbox is not None else None,
+            tracks.lat.values if bbox is not None else None,
+            time_range,
+            bbox,
+        )
+        if keep_whole_tracks:
+            points = np.isin(track_id, track_id[points])
+        mask &= points
+
+        if not mask.all():
+            tracks = tracks.isel({tracks.track_id.dims[0]: np.flatnonzero(mask)})
+
+    if variables is not None:
+        missing = [var for var in variables if var not in tracks.variables]
+        if len(missing) > 0:
+            msg = f"Variables {missing} not found in tracks"
+            raise ValueError(msg)
+        tracks = tracks.drop_vars(
+            [var for var in tracks.data_vars if var not in ["track_id", *variables]]
+        )
+
+    return tracks
+
+
+def points_mask(time, lon, lat, time_range, bbox):
+    """Find which points are within the time_range and bbox
+
+    Parameters
+    ----------
+    time, lon, lat : numpy.ndarray or None
+        The values at each point. Only needed for the filters that are used
+    time_range : tuple or None
+        (start, end) times, as for :py:func:`select`
+    bbox : tuple or None
+        (lon_min, lat_min, lon_max, lat_max), as for :py:func:`select`
+
+    Returns
+    -------
+    numpy.ndarray or bool
+        A mask of points matching the filters, or True if no filters are given
+    """
+    mask = True
+    if time_range is not None:
+        start, end = _time_bounds(time, time_range)
+        if start is not None:
+            mask = mask & (time >= start)
+        if end is not None:
+            mask = mask & (time <= end)
+
+    if bbox is not None:
+        lon_min, lat_min, lon_max, lat_max = bbox
+        mask = mask & (lat >= lat_min) & (lat <= lat_max)
+        if lon_max - lon_min < 360:
+            mask = mask & (((lon - lon_min) % 360) <= ((lon_max - lon_min) % 360))
+
+    return mask
+
+
+def file_variables(variables, rename, needed):
+    """The names of variables that need to be read from a file to give the variables
+    requested after renaming
+
+    Parameters
+    ----------
+    variables : list of str
+        The variables requested
+    rename : dict
+        The mapping of names in the file to names in the loaded tracks
+    needed : list of str
+        Other variables that are needed, e.g. for filtering
+
+    Returns
+    -------
+    set
+    """
+    # The time is always needed to load the tracks, and can be split across multiple
+    # columns in CSV files
+    wanted = {*variables, *needed, "track_id", "time"}
+    wanted |= {"year", "month", "day", "hour", "minute", "second"}
+
+    return wanted | {key for key, value in rename.items() if value in wanted}
+
+
+def _time_bounds(time, time_range):
+    # Convert the bounds to numpy.datetime64 to compare with numpy.datetime64 times.
+    # Otherwise, e.g. for cftime, use the bounds as given
+    start, end = time_range
+    if np.issubdtype(time.dtype, np.datetime64):
+        start = np.datetime64(start) if start is not None else None
+        end = np.datetime64(end) if end is not None else None
+
+    return start, end
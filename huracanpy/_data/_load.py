@@ -1,9 +1,12 @@
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
+from functools import partial
 
 import cftime
 import numpy as np
 import pandas as pd
+import xarray as xr
 from dateutil.parser import parse
 from pandas.errors import OutOfBoundsDatetime
 
@@ -11,6 +14,7 @@ from .._concat import concat_tracks
 from .._util import combine_kws
 from . import (
     _csv,
+    _filters,
     _netcdf,
     _tempestextremes,
     ibtracs,
@@ -40,6 +44,10 @@ rename_defaults = dict(
     sname="name",
 )
 
+# Number of rows read at a time when loading files incrementally (chunk_tracks) for
+# sources that are not read by track
+records_per_read = 100_000
+
 pandas_valid_time_labels = [
     "year",
     "years",
@@ -78,7 +86,17 @@ def load(
     iris_timestep=timedelta(hours=3),
     tempest_extremes_unstructured=False,
     tempest_extremes_header_str="start",
+    netcdf_stretch_track_id=True,
     track_calendar=None,
+    lazy=False,
+    time_range=None,
+    bbox=None,
+    track_ids=None,
+    variables=None,
+    keep_whole_tracks=False,
+    chunk_tracks=None,
+    n_workers=None,
+    cache=True,
     **kwargs,
 ):
     """Load track data
@@ -93,7 +111,8 @@ def load(
         The file or files to be loaded. If `source="ibtracs"`, this is not needed as the
         data is either included in huracanpy or downloaded when called. If the filename
         is provided for an online IBTrACS subset, then the raw downloaded data will be
-        saved there.
+        saved there. If `source="old_hurdat"`, this can also be a directory, in which
+        case all the files in the directory are loaded.
     source : str, optional
         If the file is not a CSV or NetCDF (identified by the file extension) then the
         source needs to be specified to decide how to load the data
@@ -169,11 +188,15 @@ def load(
         * **since1980**: Entire IBTrACS database since 1980 (advent of satellite era,
           considered reliable from then on)
 
+        A list of these subsets (e.g. basins) are downloaded at the same time and
+        combined
+
     iris_timestep : int or datetime.timedelta, default=datetime.timedelta(hours=3)
         The timestep used in the Imperial College Storm Model (IRIS). This is 3-hours
         in the paper
         (https://www.nature.com/articles/s41597-024-03250-y/tables/1), so unlikely to
-        need changing, but provided here in case it does.
+        need changing, but provided here in case it does. Integers are a number of
+        hours
 
     tempest_extremes_unstructured : bool, default=False
         By default the first two columns in TempestExtremes files are the i, j indices
@@ -183,6 +206,16 @@ def load(
         This is an option in the Colin's load function, so I assume this can change
         between files
 
+    netcdf_stretch_track_id : bool, default=True
+        netCDF files using the CF contiguous ragged array representation store one
+        track_id per track, with the number of points in each track (rowSize). By
+        default, the track_id is repeated for every point so it can be used with
+        `groupby`. If False, the compact track_id and rowSize are kept instead, which
+        saves memory for large files (e.g. IBTrACS). :py:func:`huracanpy.sel_id`,
+        :py:func:`huracanpy.calc.track_reduce`, :py:func:`huracanpy.track_index` (with
+        `rowsize`) and :py:func:`huracanpy.save` work with either form. Other
+        functions need the track_id for each point. Not used with `chunk_tracks`
+
     track_calendar : [str, tuple] optional
           When loading data from a TRACK ASCII file, if the data uses a different
           calendar to the default :class:`datetime.datetime`, then you can pass this
@@ -199,13 +232,84 @@ def load(
             and is assumed to be in hours, or you can explicitly pass a
             :class:`numpy.timedelta64` object and specify the units
 
+    lazy : bool, default=False
+        For netCDF files, open the variables as :py:mod:`dask` arrays (requires dask)
+        so nothing is read from the file until it is used. The data stays lazy when the
+        track_id is stretched and when 2d files (e.g. CHAZ, MIT) are converted to 1d,
+        apart from the mask used to remove the empty points of 2d files. This allows
+        large files to be subset, e.g. with :py:func:`huracanpy.sel_id`, before loading
+        the data with `tracks.load()`. Not used with `chunk_tracks`
+
+    time_range : tuple, optional
+        Only load points with times in the range (start, end), including the end
+        points. Either can be None to leave the range open-ended, e.g.
+        `time_range=("1980-01-01", None)`
+    bbox : tuple, optional
+        Only load points within the box (lon_min, lat_min, lon_max, lat_max). The
+        longitudes can be in either [-180, 180) or [0, 360) independently of the
+        longitudes in the file, and the box crosses the dateline if lon_min > lon_max
+    track_ids : array_like, optional
+        Only load the tracks with these track IDs. If `infer_track_id` is used or
+        multiple files are loaded, these are the new track IDs, which are assigned
+        after applying the other filters
+    variables : list of str, optional
+        Only load these variables (as well as the track_id). The names are the names
+        after renaming
+    keep_whole_tracks : bool, default=False
+        If True, load the whole of any track that has a point matching the
+        `time_range` and `bbox`, rather than only the matching points
+
+        The filters are applied while reading where possible, so that less data is
+        read and parsed: parquet files skip row groups using the column statistics,
+        netCDF files only read the selected tracks and variables, TRACK and
+        TempestExtremes files skip the unselected tracks, and the ASCII readers
+        (TRACK, TempestExtremes, WiTRACK and IRIS) skip converting unused variables
+
+    chunk_tracks : int, optional
+        Instead of loading all the tracks at once, return an iterator of
+        :class:`xarray.Dataset`, each containing `chunk_tracks` whole tracks (the last
+        may contain fewer). This allows files larger than memory to be processed, e.g.
+
+        >>> for tracks in huracanpy.load(filename, source="iris", chunk_tracks=1000):
+        >>>     ...
+
+        The points of each track are assumed to be contiguous in the file. When
+        loading a list of files, each Dataset only contains tracks from one file. CSV,
+        parquet, TRACK, TempestExtremes, IRIS and netCDF files are read
+        incrementally. Other sources are loaded in full and then split.
+        If `infer_track_id` is used or multiple files are loaded (without
+        `track_id_prefix`), the new track IDs are unique across the returned Datasets
+        but may be numbered differently to loading all the tracks at once
+
+    n_workers : int, optional
+        When loading a list of files, the number of processes used to load the files
+        in parallel. The tracks are combined in the same order as the list of files
+        and given the same track IDs as loading the files one at a time. By default,
+        the files are loaded one at a time. Not used with `chunk_tracks`
+
+        For online sources made of several files (SuperBT years, or a list of IBTrACS
+        subsets), the files are always downloaded at the same time, and `n_workers`
+        gives the number of processes used to parse them
+
+    cache : bool or str, default=True
+        How to use the local cache of files downloaded for online sources (IBTrACS
+        online subsets and SuperBT). The cache is in the directory given by the
+        HURACANPY_CACHE_DIR environment variable, or ~/.cache/huracanpy by default
+
+        * True - Only download the files if they have changed since they were cached.
+          A parsed copy of each file is also kept, so repeat loads skip reading the
+          CSV files
+        * False - Download the files to temporary files every time
+        * "offline" - Use the cached files without checking for newer versions
+
     **kwargs
         When loading tracks from a standard files these will be passed to the relevant
         load function
 
-        * netCDF file - :func:`xarray.open_dataset`
+        * netCDF file or Zarr store - :func:`xarray.open_dataset`
         * CSV file - :func:`pandas.read_csv`
         * parquet file - :func:`pandas.read_parquet`
+        * feather/arrow file - :func:`pandas.read_feather`
 
         For CSV files pandas interprets "NA" as `nan` by default, which is overridden in
         this function. To restore the pandas default behaviours set
@@ -213,45 +317,151 @@ def load(
 
     Returns
     -------
-    xarray.Dataset
+    xarray.Dataset or iterator of xarray.Dataset
+        A single Dataset of all the tracks, or an iterator of Datasets if
+        `chunk_tracks` is given
 
     """
     # Overwrite default arguments with explicit arguments passed to rename by putting
     # "rename" second in this dictionary combination
     rename = combine_kws(rename, rename_defaults)
 
+    read_kws = dict(
+        source=source,
+        variable_names=variable_names,
+        ibtracs_subset=ibtracs_subset,
+        iris_timestep=iris_timestep,
+        tempest_extremes_unstructured=tempest_extremes_unstructured,
+        tempest_extremes_header_str=tempest_extremes_header_str,
+        netcdf_stretch_track_id=netcdf_stretch_track_id,
+        lazy=lazy,
+        cache=cache,
+        n_workers=n_workers,
+        **kwargs,
+    )
+    postprocess_kws = dict(
+        rename=rename, units=units, baselon=baselon, track_calendar=track_calendar
+    )
+    filters = dict(
+        time_range=time_range,
+        bbox=bbox,
+        track_ids=track_ids,
+        variables=variables,
+        keep_whole_tracks=keep_whole_tracks,
+    )
+
+    if chunk_tracks is not None:
+        return _iter_load(
+            filename,
+            chunk_tracks,
+            infer_track_id=infer_track_id,
+            track_id_prefix=track_id_prefix,
+            read_kws=read_kws,
+            postprocess_kws=postprocess_kws,
+            filters=filters,
+        )
+
     if isinstance(filename, (list, tuple, np.ndarray)):
         # Loop through all the files and open them
-        tracks = [
-            load(
-                filename=f,
-                source=source,
-                variable_names=variable_names,
-                rename=rename,
-                units=units,
-                baselon=baselon,
-                infer_track_id=infer_track_id,
-                ibtracs_subset=ibtracs_subset,
-                iris_timestep=iris_timestep,
-                tempest_extremes_unstructured=tempest_extremes_unstructured,
-                tempest_extremes_header_str=tempest_extremes_header_str,
-                track_calendar=track_calendar,
-                **kwargs,
-            )
-            for f in filename
-        ]
+        load_file = partial(
+            load,
+            source=source,
+            variable_names=variable_names,
+            rename=rename,
+            units=units,
+            baselon=baselon,
+            infer_track_id=infer_track_id,
+            ibtracs_subset=ibtracs_subset,
+            iris_timestep=iris_timestep,
+            tempest_extremes_unstructured=tempest_extremes_unstructured,
+            tempest_extremes_header_str=tempest_extremes_header_str,
+            netcdf_stretch_track_id=netcdf_stretch_track_id,
+            track_calendar=track_calendar,
+            lazy=lazy,
+            time_range=time_range,
+            bbox=bbox,
+            variables=variables,
+            keep_whole_tracks=keep_whole_tracks,
+            **kwargs,
+        )
+        if n_workers is None:
+            tracks = [load_file(f) for f in filename]
+        else:
+            # map returns the results in the same order as the files, so the track IDs
+            # are assigned the same way by concat_tracks
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                tracks = list(executor.map(load_file, filename))
+
+        # Files with no tracks matching the filters can't be combined. If no files have
+        # matching tracks, return the (empty) tracks from the first file
+        matching = [t for t in tracks if len(t.track_id) > 0]
+        if len(matching) == 0:
+            return tracks[0]
+
+        # The track IDs are only known after combining the tracks
+        tracks = concat_tracks(matching, prefix=track_id_prefix)
+        return _filters.select(tracks, track_ids=track_ids)
+
+    tracks = _read(
+        filename, pushdown=_pushdown(filters, rename, infer_track_id), **read_kws
+    )
+    tracks = _postprocess(tracks, **postprocess_kws)
+
+    if infer_track_id is not None:
+        tracks = tracks.hrcn.add_inferred_track_id(*infer_track_id)
+
+    tracks = _filters.select(tracks, **filters)
+    tracks.track_id.attrs["cf_role"] = "trajectory_id"
 
-        return concat_tracks(tracks, prefix=track_id_prefix)
+    return tracks
+
+
+def _read(
+    filename,
+    source,
+    variable_names,
+    ibtracs_subset,
+    iris_timestep,
+    tempest_extremes_unstructured,
+    tempest_extremes_header_str,
+    netcdf_stretch_track_id=True,
+    lazy=False,
+    cache=True,
+    n_workers=None,
+    pushdown=None,
+    **kwargs,
+):
+    # pushdown contains the filters that can be applied while reading the file. The
+    # tracks still need to be subset after by _filters.select
+    if pushdown is None:
+        pushdown = dict(
+            variables=None,
+            track_ids=None,
+            time_range=None,
+            bbox=None,
+            keep_whole_tracks=False,
+        )
 
     # If source is not given, try to derive the right function from the file extension
     if source is None:
         extension = filename.split(".")[-1]
         if extension == "csv":
             tracks = _csv.load(filename, **kwargs)
+        elif extension == "parquet" and len(kwargs) == 0:
+            tracks = _csv.load_parquet(filename, **pushdown)
         elif extension == "parquet":
             tracks = _csv.load(filename, load_function=pd.read_parquet, **kwargs)
-        elif filename.split(".")[-1] == "nc":
-            tracks = _netcdf.load(filename, **kwargs)
+        elif extension in ["feather", "arrow"]:
+            tracks = _csv.load(filename, load_function=pd.read_feather, **kwargs)
+        elif extension in ["nc", "zarr"]:
+            tracks = _netcdf.load(
+                filename,
+                stretch_track_id=netcdf_stretch_track_id,
+                lazy=lazy,
+                track_ids=pushdown["track_ids"],
+                variables=pushdown["variables"],
+                **kwargs,
+            )
         else:
             msg = "Source is set to None and file type is not detected"
             raise ValueError(msg)
@@ -260,7 +470,12 @@ def load(
     else:
         source = source.lower()
         if source == "track":
-            tracks = track_files.load(filename, variable_names=variable_names)
+            tracks = track_files.load(
+                filename,
+                variable_names=variable_names,
+                track_ids=pushdown["track_ids"],
+                variables=pushdown["variables"],
+            )
         elif source == "track.tilt":
             tracks = track_files.load_tilts(filename)
         elif source in ["csv", "uz"]:
@@ -271,27 +486,259 @@ def load(
                 variable_names,
                 tempest_extremes_unstructured,
                 tempest_extremes_header_str,
+                track_ids=pushdown["track_ids"],
+                variables=pushdown["variables"],
             )
         elif source == "witrack":
-            tracks = witrack.load(filename)
+            tracks = witrack.load(filename, variables=pushdown["variables"])
         elif source == "ibtracs":
-            tracks = ibtracs.load(ibtracs_subset, filename, **kwargs)
+            tracks = ibtracs.load(
+                ibtracs_subset, filename, cache=cache, n_workers=n_workers, **kwargs
+            )
         elif source == "netcdf":
-            tracks = _netcdf.load(filename, **kwargs)
+            tracks = _netcdf.load(
+                filename,
+                stretch_track_id=netcdf_stretch_track_id,
+                lazy=lazy,
+                track_ids=pushdown["track_ids"],
+                variables=pushdown["variables"],
+                **kwargs,
+            )
         elif source in [
             "old_hurdat",
             "ecmwf",
         ]:
             tracks = old_hurdat.load(filename)
         elif source == "iris":
-            tracks = iris_tc.load(filename, iris_timestep, **kwargs)
+            tracks = iris_tc.load(
+                filename, iris_timestep, variables=pushdown["variables"], **kwargs
+            )
         elif source == "superbt":
             # superbt.load call
-            tracks = superbt.load()
+            tracks = superbt.load(cache=cache, n_workers=n_workers)
         else:
             msg = f"Source {source} unsupported or misspelled"
             raise ValueError(msg)
 
+    return tracks
+
+
+def _read_chunks(
+    filename,
+    chunk_tracks,
+    source,
+    variable_names,
+    ibtracs_subset,
+    iris_timestep,
+    tempest_extremes_unstructured,
+    tempest_extremes_header_str,
+    cache=True,
+    n_workers=None,
+    **kwargs,
+):
+    # Equivalent of _read for sources that can be read incrementally. Yields each
+    # Dataset along with whether it is known to end at the end of a track. Otherwise
+    # the tracks at the boundaries are sorted out by _batch_tracks
+    if source is None:
+        extension = filename.split(".")[-1]
+        if extension == "csv":
+            source = "csv"
+        elif extension == "parquet":
+            for tracks in _csv.iter_load(
+                filename, records_per_read, load_function=pd.read_parquet, **kwargs
+            ):
+                yield tracks, False
+            return
+        elif extension in ["nc", "zarr"]:
+            source = "netcdf"
+
+    source = source.lower() if source is not None else source
+    if source == "track":
+        pieces = track_files.iter_load(filename, variable_names, chunk_tracks)
+        whole_tracks = True
+    elif source in ["csv", "uz"]:
+        pieces = _csv.iter_load(filename, records_per_read, **kwargs)
+        whole_tracks = False
+    elif source in ["te", "tempest", "tempestextremes"]:
+        pieces = _tempestextremes.iter_load(
+            filename,
+            variable_names,
+            tempest_extremes_unstructured,
+            tempest_extremes_header_str,
+            chunk_tracks,
+        )
+        whole_tracks = True
+    elif source == "netcdf":
+        # 2d and ragged netCDF files are read by track. CSV-like netCDF files are read
+        # by record
+        with xr.open_dataset(filename, **kwargs) as dataset:
+            whole_tracks = _netcdf._layout(dataset)[0] != "1d"
+        pieces = _netcdf.iter_load(filename, chunk_tracks, records_per_read, **kwargs)
+    elif source == "iris":
+        pieces = iris_tc.iter_load(filename, iris_timestep, records_per_read, **kwargs)
+        whole_tracks = False
+    else:
+        pieces = [
+            _read(
+                filename,
+                source,
+                variable_names,
+                ibtracs_subset=ibtracs_subset,
+                iris_timestep=iris_timestep,
+                tempest_extremes_unstructured=tempest_extremes_unstructured,
+                tempest_extremes_header_str=tempest_extremes_header_str,
+                cache=cache,
+                n_workers=n_workers,
+                **kwargs,
+            )
+        ]
+        whole_tracks = True
+
+    for tracks in pieces:
+        yield tracks, whole_tracks
+
+
+def _iter_load(
+    filename,
+    chunk_tracks,
+    *,
+    infer_track_id,
+    track_id_prefix,
+    read_kws,
+    postprocess_kws,
+    filters,
+):
+    if isinstance(filename, (list, tuple, np.ndarray)):
+        # Loop through the files, making the track IDs unique across files in the same
+        # way as concat_tracks
+        start = 0
+        for n, f in enumerate(filename):
+            for tracks in _iter_load(
+                f,
+                chunk_tracks,
+                infer_track_id=infer_track_id,
+                track_id_prefix=None,
+                read_kws=read_kws,
+                postprocess_kws=postprocess_kws,
+                filters={**filters, "track_ids": None},
+            ):
+                if track_id_prefix is not None:
+                    tracks = concat_tracks([tracks], prefix=track_id_prefix, start=n)
+                else:
+                    tracks = concat_tracks([tracks], start=start)
+                    start = tracks.track_id.values.max() + 1
+
+                tracks = _filters.select(tracks, track_ids=filters["track_ids"])
+                if len(tracks.track_id) > 0:
+                    tracks.track_id.attrs["cf_role"] = "trajectory_id"
+                    yield tracks
+        return
+
+    # The track_id is always stretched when reading in chunks, to find each track, and
+    # each chunk is loaded into memory
+    read_kws = {
+        key: read_kws[key]
+        for key in read_kws
+        if key not in ["netcdf_stretch_track_id", "lazy"]
+    }
+    pieces = (
+        (_postprocess(tracks, **postprocess_kws), whole_tracks)
+        for tracks, whole_tracks in _read_chunks(filename, chunk_tracks, **read_kws)
+    )
+
+    # The variables used to identify where each track starts and ends
+    track_id = ["track_id"] if infer_track_id is None else list(infer_track_id)
+
+    ntracks = 0
+    for tracks in _batch_tracks(pieces, chunk_tracks, track_id):
+        if infer_track_id is not None:
+            tracks = tracks.hrcn.add_inferred_track_id(*infer_track_id)
+            tracks["track_id"] = tracks.track_id + ntracks
+            ntracks = tracks.track_id.values.max() + 1
+
+        tracks = _filters.select(tracks, **filters)
+        if len(tracks.track_id) > 0:
+            tracks.track_id.attrs["cf_role"] = "trajectory_id"
+            yield tracks
+
+
+def _batch_tracks(pieces, chunk_tracks, track_id):
+    # Regroup a sequence of Datasets, which may split tracks at their boundaries, into
+    # Datasets each containing "chunk_tracks" whole tracks. Unless the piece is known to
+    # end with a whole track, the last track is held back until the next piece shows
+    # where it ends
+    buffer = None
+    for tracks, whole_tracks in pieces:
+        dim = tracks[track_id[0]].dims[0]
+        if buffer is None or buffer.sizes[dim] == 0:
+            buffer = tracks
+        else:
+            buffer = xr.concat(
+                [buffer, tracks],
+                dim=dim,
+                data_vars="minimal",
+                coords="minimal",
+                compat="override",
+            )
+
+        starts = _track_starts(buffer, track_id)
+        if whole_tracks:
+            starts = np.append(starts, buffer.sizes[dim])
+        while len(starts) > chunk_tracks:
+            yield buffer.isel({dim: slice(0, starts[chunk_tracks])})
+            buffer = buffer.isel({dim: slice(starts[chunk_tracks], None)})
+            starts = starts[chunk_tracks:] - starts[chunk_tracks]
+
+    # Anything left is the last tracks
+    if buffer is not None and buffer.sizes[dim] > 0:
+        starts = np.append(_track_starts(buffer, track_id), buffer.sizes[dim])
+        for n in range(0, len(starts) - 1, chunk_tracks):
+            end = starts[min(n + chunk_tracks, len(starts) - 1)]
+            yield buffer.isel({dim: slice(starts[n], end)})
+
+
+def _track_starts(tracks, track_id):
+    # Index of the first point of each track, assuming the points in each track are
+    # contiguous. Tracks are identified by the combination of the track_id variables
+    values = [np.asarray(tracks[var]) for var in track_id]
+    if len(values[0]) == 0:
+        return np.array([], dtype=int)
+
+    new_track = np.zeros(len(values[0]), dtype=bool)
+    new_track[0] = True
+    for value in values:
+        new_track[1:] |= value[1:] != value[:-1]
+
+    return np.where(new_track)[0]
+
+
+def _pushdown(filters, rename, infer_track_id):
+    # The filters that can be applied while reading a file, before the variables are
+    # renamed. The track IDs are only known in advance if they are not inferred
+    if infer_track_id is not None:
+        pushdown = dict(
+            track_ids=None, time_range=None, bbox=None, keep_whole_tracks=False
+        )
+        needed = list(infer_track_id)
+    else:
+        pushdown = {key: filters[key] for key in filters if key != "variables"}
+        needed = []
+
+    if filters["variables"] is not None:
+        if filters["bbox"] is not None:
+            needed.extend(["lon", "lat"])
+        pushdown["variables"] = _filters.file_variables(
+            filters["variables"], rename, needed
+        )
+    else:
+        pushdown["variables"] = None
+
+    pushdown["rename"] = rename
+
+    return pushdown
+
+
+def _postprocess(tracks, rename, units, baselon, track_calendar):
     # xarray.Dataset.rename only accepts keys that are actually in the dataset
     # Also, don't rename to a variable that already exists
     rename = {
@@ -306,18 +753,15 @@ def load(
     # Time attribute
     tracks = _parse_dates(tracks, calendar=track_calendar)
 
-    # Convert any variables that are objects to explicit string objects.
-    # This can cause strings stored as "NA", such as for basin to be converted to NaNs
-    # Revert any nans back to their original values
-    # Better to do it here than getting caught out later
+    # Convert any remaining variables that are objects of strings (e.g. from netCDF
+    # files) to fixed-width strings. Strings read from CSV/parquet files are already
+    # converted when they are read. Only the first value is checked, so lazily loaded
+    # variables stay lazy
     for var in tracks:
         if np.issubdtype(tracks[var].dtype, np.object_) and isinstance(
-            tracks[var].values[0], str
+            tracks[var][(0,) * tracks[var].ndim].item(), str
         ):
-            new_var = tracks[var].astype(str)
-            false_nans = new_var == "nan"
-            new_var[false_nans] = tracks[var][false_nans]
-            tracks[var] = new_var
+            tracks[var] = tracks[var].astype(str)
 
     if units is not None:
         for varname in units:
@@ -326,39 +770,138 @@ def load(
     if baselon is not None:
         tracks["lon"] = ((tracks.lon - baselon) % 360) + baselon
 
-    if infer_track_id is not None:
-        tracks = tracks.hrcn.add_inferred_track_id(*infer_track_id)
+    return tracks
 
-    tracks.track_id.attrs["cf_role"] = "trajectory_id"
 
-    return tracks
+def _yyyymmddhh(values):
+    # Return times in the format YYYYMMDDHH, as integers or strings of digits, as an
+    # integer array. Returns None if the times aren't in this format
+    if np.issubdtype(values.dtype, np.integer):
+        if not ((values >= 1_000_000_000) & (values < 10_000_000_000)).all():
+            return None
+        return values.astype(np.int64)
+
+    if np.issubdtype(values.dtype, np.str_) or (
+        np.issubdtype(values.dtype, np.object_) and isinstance(values.flat[0], str)
+    ):
+        values = values.astype(str)
+        if not ((np.char.str_len(values) == 10) & np.char.isdigit(values)).all():
+            return None
+        return values.astype(np.int64)
+
+    return None
+
+
+def _split_yyyymmddhh(values):
+    # Integer arithmetic to get the year, month, day, and hour from YYYYMMDDHH
+    return (
+        values // 1_000_000,
+        values // 10_000 % 100,
+        values // 100 % 100,
+        values % 100,
+    )
+
+
+# Regular expression for ISO format times, e.g. "2000-01-01 06:00:00"
+_iso_regex = (
+    r"^\s*(-?\d{1,4})-(\d{1,2})-(\d{1,2})"
+    r"(?:[ T](\d{1,2})(?::(\d{1,2})(?::(\d{1,2}))?)?)?\s*$"
+)
+
+
+def _split_iso(values):
+    # Get the year, month, day, hour, minute and second from ISO format strings as
+    # integer arrays. Returns None if any of the times aren't in this format
+    components = pd.Series(values, dtype=object).str.extract(_iso_regex)
+    if components[[0, 1, 2]].isna().to_numpy().any():
+        return None
+    return tuple(components[n].fillna("0").to_numpy(dtype=np.int64) for n in range(6))
+
+
+_days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _month_lengths(year, month, calendar=None):
+    # Number of days in each month (1-12) for the given calendar. None is the
+    # proleptic Gregorian calendar used by np.datetime64
+    if calendar == "360_day":
+        return np.full(np.shape(month), 30)
+
+    gregorian_leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    if calendar in ["365_day", "noleap"]:
+        leap = False
+    elif calendar in ["366_day", "all_leap"]:
+        leap = True
+    elif calendar == "julian":
+        leap = year % 4 == 0
+    elif calendar in ["standard", "gregorian"]:
+        # Julian calendar before the switch to the Gregorian calendar in 1582
+        leap = np.where(year < 1583, year % 4 == 0, gregorian_leap)
+    else:
+        leap = gregorian_leap
+
+    return _days_in_month[month - 1] + ((month == 2) & leap)
+
+
+def _check_dates(values, year, month, day, hour, minute=0, second=0, calendar=None):
+    # The integer arithmetic would let invalid dates roll over (e.g. 30th February to
+    # 2nd March), so check them first
+    valid_month = (month >= 1) & (month <= 12)
+    invalid = (
+        ~valid_month
+        | (day < 1)
+        | (day > _month_lengths(year, np.where(valid_month, month, 1), calendar))
+        | (hour < 0)
+        | (hour > 23)
+        | (minute < 0)
+        | (minute > 59)
+        | (second < 0)
+        | (second > 59)
+    )
+    if invalid.any():
+        msg = f"Day out of range in time {np.asarray(values).ravel()[invalid][0]}"
+        raise ValueError(msg)
+
+
+def _to_cftime(year, month, day, hour, minute=0, second=0, calendar="standard"):
+    # cftime has no vectorized constructor (cftime.num2date is slower than creating
+    # each datetime), so only create each unique time once
+    seconds = (hour * 60 + minute) * 60 + second
+    unique_times, inverse = np.unique(
+        np.stack([year, month, day, seconds]), axis=1, return_inverse=True
+    )
+    unique_times = np.array(
+        [
+            cftime.datetime(y, m, d, s // 3600, s // 60 % 60, s % 60, calendar=calendar)
+            for y, m, d, s in unique_times.T.tolist()
+        ]
+    )
+    return unique_times[inverse.ravel()]
+
+
+def _strings_to_cftime(values, calendar="standard"):
+    # Split the unique ISO format strings into integers, and only use the (slow)
+    # dateutil parser for other formats
+    unique_times, inverse = np.unique(values, return_inverse=True)
+    components = _split_iso(unique_times)
+    if components is None:
+        default = cftime.datetime(1, 1, 1, calendar=calendar)
+        unique_times = np.array([parse(t, default=default) for t in unique_times])
+    else:
+        _check_dates(unique_times, *components, calendar=calendar)
+        unique_times = _to_cftime(*components, calendar=calendar)
+    return unique_times[inverse.ravel()]
 
 
 def _parse_dates(tracks, calendar):
     if "time" in tracks:
         time = tracks.time
         # If the time has already been correctly parsed just return the tracks as is
-        if np.issubdtype(time.dtype, np.datetime64):
-            return tracks
-
-        # Track YYYYMMDDHH format not interpreted automatically. Change to str with
-        # isoformat
-        if (
-            np.issubdtype(time.dtype, np.integer)
-            and (time.astype(str).str.len() == 10).all()
-            or np.issubdtype(time.dtype, np.str_)
-            and (time.str.len() == 10).all()
+        if np.issubdtype(time.dtype, np.datetime64) or (
+            np.issubdtype(time.dtype, np.object_)
+            and isinstance(time[(0,) * time.ndim].item(), cftime.datetime)
         ):
-            time = tracks.time.astype(str)
-            time = time.str.slice(0, 4).str.cat(
-                "-",
-                time.str.slice(4, 6),
-                "-",
-                time.str.slice(6, 8),
-                " ",
-                time.str.slice(8, 10),
-                ":00",
-            )
+            return tracks
 
         if isinstance(calendar, (tuple, list)):
             # Time is integer timesteps
@@ -368,49 +911,63 @@ def _parse_dates(tracks, calendar):
                 timestep = np.timedelta64(timestep, "h")
             return tracks.assign(time=initial_date + (time - 1) * timestep)
 
+        # Track YYYYMMDDHH format not interpreted automatically. Split into integer
+        # year, month, day, hour
+        values = time.values
+        yyyymmddhh = _yyyymmddhh(values)
+        if yyyymmddhh is not None:
+            components = _split_yyyymmddhh(yyyymmddhh.ravel())
+            _check_dates(values, *components, calendar=calendar)
+        elif np.issubdtype(values.dtype, np.str_) or (
+            np.issubdtype(values.dtype, np.object_) and isinstance(values.flat[0], str)
+        ):
+            values = values.astype(str)
+        else:
+            # Not interpretable as datetime, just return as is
+            return tracks
+
         if isinstance(calendar, str):
             # cftime calendar
-            default = cftime.datetime(1, 1, 1, calendar=calendar)
-            time = [parse(t, default=default) for t in time.values]
-            return tracks.assign(time=("record", time))
-
-        # Convert strings to np.datetime64, but allow for varying precision for possible
-        # out of bounds times
-        if isinstance(time.values[0], str):
-            # This may still break at this point with older versions of xarray
-            # attempting to convert back to "ns" precision
-            try:
-                newtime = time.astype("datetime64")
-
-                if (time.astype("datetime64[Y]").dt.year != newtime.dt.year).any():
-                    raise OutOfBoundsDatetime
-
-                return tracks.assign(time=newtime)
-            except OutOfBoundsDatetime:
-                warnings.warn(
-                    "Converting out of bounds np.datetime64 to cftime.datetime. Update"
-                    " to xarray>=2025.01.2 to remove this warning and use lower"
-                    " precision np.datetime64 instead",
-                    stacklevel=2,
-                )
-                time = [parse(t) for t in time.values]
-                time = [
-                    cftime.datetime(
-                        t.year,
-                        t.month,
-                        t.day,
-                        t.hour,
-                        t.minute,
-                        t.second,
-                        t.microsecond,
-                    )
-                    for t in time
-                ]
-                return tracks.assign(time=("record", time))
-
+            if yyyymmddhh is not None:
+                newtime = _to_cftime(*components, calendar=calendar)
+            else:
+                newtime = _strings_to_cftime(values.ravel(), calendar=calendar)
+            return tracks.assign(time=(time.dims, newtime.reshape(values.shape)))
+
+        if yyyymmddhh is not None:
+            # Build the times with integer arithmetic on np.datetime64
+            year, month, day, hour = components
+            months = (year - 1970) * 12 + (month - 1)
+            newtime = (
+                months.astype("datetime64[M]").astype("datetime64[s]")
+                + (day - 1).astype("timedelta64[D]")
+                + hour.astype("timedelta64[h]")
+            ).reshape(values.shape)
         else:
-            # Not interpretable as datetime, just return as is
+            # Convert strings to np.datetime64, but allow for varying precision for
+            # possible out of bounds times
+            newtime = values.astype("datetime64")
+            year = newtime.astype("datetime64[Y]").astype(np.int64).ravel() + 1970
+
+        # This may still break at this point with older versions of xarray attempting
+        # to convert back to "ns" precision
+        try:
+            tracks = tracks.assign(time=(time.dims, newtime))
+            if (tracks.time.dt.year.values.ravel() != year).any():
+                raise OutOfBoundsDatetime
             return tracks
+        except OutOfBoundsDatetime:
+            warnings.warn(
+                "Converting out of bounds np.datetime64 to cftime.datetime. Update"
+                " to xarray>=2025.01.2 to remove this warning and use lower"
+                " precision np.datetime64 instead",
+                stacklevel=2,
+            )
+            if yyyymmddhh is not None:
+                newtime = _to_cftime(*components)
+            else:
+                newtime = _strings_to_cftime(values.ravel())
+            return tracks.assign(time=(time.dims, newtime.reshape(values.shape)))
 
     else:
         # Combine separate year/month/day etc. values into a time, and drop those
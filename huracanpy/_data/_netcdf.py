@@ -11,37 +11,130 @@ import xarray as xr
 # trajectories to allow us to use groupby() and sel() with track_id to work by
 # individual tracks. So we need to replace the "track_id" or equivalent variable when
 # loading or saving the data
-def load(filename, **kwargs):
+def load(
+    filename,
+    stretch_track_id=True,
+    lazy=False,
+    track_ids=None,
+    variables=None,
+    **kwargs,
+):
+    # Open the variables as dask arrays, so the conversions below only build up the
+    # operations needed and nothing is read from the file until it is used
+    if lazy:
+        kwargs.setdefault("chunks", {})
     dataset = xr.open_dataset(filename, **kwargs)
 
-    # Check which type of netCDF we have (2d, ragged, or CSV-like)
-    track_id = _find_trajectory_id(dataset)
-    time = dataset.time
-
-    if time.dims != track_id.dims:
-        # If time and track_id don't have the same dimension it could be 2d or ragged
-        # Track ID should always be 1d
-        if track_id.ndim != 1:
-            msg = f"File has a track ID with {track_id.ndim} dimensions. Should be 1d"
-            raise ValueError(msg)
-        dims = [track_id.dims[0]] + [
-            dim for dim in time.dims if dim not in track_id.dims
-        ]
-        # If any variables have a time and track_id dimension it is 2d
-        vars_2d = [var for var in dataset if sorted(dims) == sorted(dataset[var].dims)]
-
-        if len(vars_2d) > 0:
-            return as1d(dataset, dims, track_id, vars_2d)
-        # Otherwise ragged array
-        return stretch_trid(dataset, track_id)
+    layout, track_id, dims, vars_2d = _layout(dataset)
+    if layout == "ragged":
+        _check_rowsize(dataset, filename)
+
+    # Drop variables that aren't needed before any data is read. Keep the variables
+    # used to identify the layout and the 2d floats used to remove empty points
+    if variables is not None:
+        keep = [track_id.name, "time", *(vars_2d or [])]
+        dataset = dataset.drop_vars(
+            [
+                var
+                for var in dataset.data_vars
+                if var not in keep
+                and var not in variables
+                and var.lower() not in variables
+                and "sample_dimension" not in dataset[var].attrs
+            ]
+        )
+
+    # Select tracks before converting them
+    if track_ids is not None:
+        if layout == "2d" and dims[0] not in dataset.variables:
+            dataset = dataset.assign_coords(
+                {dims[0]: np.arange(dataset.sizes[dims[0]])}
+            )
+        idx = np.flatnonzero(np.isin(dataset[track_id.name].values, track_ids))
+        if layout == "ragged":
+            dataset = isel_ragged(dataset, dataset[track_id.name], idx)
+        else:
+            dataset = dataset.isel({dataset[track_id.name].dims[0]: idx})
+        track_id = dataset[track_id.name]
+
+    if layout == "2d":
+        return as1d(dataset, dims, track_id, vars_2d)
+    if layout == "ragged":
+        if stretch_track_id:
+            return stretch_trid(dataset, track_id)
+        # Keep the compact ragged form, but use the standard track_id name
+        if track_id.name != "track_id":
+            dataset = dataset.rename({track_id.name: "track_id"})
+        return dataset
     # Otherwise it is in the CSV format used by huracanpy, so just return the
     # dataset
     return dataset
 
 
+def iter_load(filename, chunk_tracks, chunksize, **kwargs):
+    """Load a netCDF file of tracks as a sequence of xarray.Dataset
+
+    Parameters
+    ----------
+    filename : str
+        The file to be loaded
+    chunk_tracks : int
+        The number of tracks to load at a time for 2d and ragged netCDF files
+    chunksize : int
+        The number of records to load at a time for CSV-like netCDF files. This will
+        generally split tracks across the returned Datasets
+    **kwargs
+        Passed to :py:func:`xarray.open_dataset`
+
+    Yields
+    ------
+    xarray.Dataset
+    """
+    with xr.open_dataset(filename, **kwargs) as dataset:
+        layout, track_id, dims, vars_2d = _layout(dataset)
+
+        if layout == "2d":
+            # If the track dimension has no coordinate, the index along it is used
+            # as a variable (possibly the track_id), so add it explicitly to keep the
+            # same values when subsetting
+            ntracks = dataset.sizes[dims[0]]
+            if dims[0] not in dataset.variables:
+                dataset = dataset.assign_coords({dims[0]: np.arange(ntracks)})
+            for n in range(0, ntracks, chunk_tracks):
+                subset = dataset.isel({dims[0]: slice(n, n + chunk_tracks)})
+                yield as1d(subset, dims, subset[track_id.name], vars_2d).load()
+
+        elif layout == "ragged":
+            _check_rowsize(dataset, filename)
+            rowsize = _find_rowsize(dataset)
+            sample_dimension = rowsize.attrs["sample_dimension"]
+            offsets = np.concatenate([[0], np.cumsum(rowsize.values)])
+            ntracks = len(rowsize)
+            for n in range(0, ntracks, chunk_tracks):
+                m = min(n + chunk_tracks, ntracks)
+                subset = dataset.isel(
+                    {
+                        rowsize.dims[0]: slice(n, m),
+                        sample_dimension: slice(offsets[n], offsets[m]),
+                    }
+                )
+                yield stretch_trid(subset, subset[track_id.name]).load()
+
+        else:
+            dim = track_id.dims[0]
+            for n in range(0, dataset.sizes[dim], chunksize):
+                yield dataset.isel({dim: slice(n, n + chunksize)}).load()
+
+
 def save(dataset, filename, **kwargs):
-    # Find the variable with cf_role=trajectory_id
-    trajectory_id = _find_trajectory_id(dataset)
+    compress_trid(dataset, _find_trajectory_id(dataset)).to_netcdf(filename, **kwargs)
+
+
+def compress_trid(dataset, trajectory_id):
+    # Tracks that were loaded without stretching the trajectory_id are already in the
+    # contiguous ragged array representation
+    if is_ragged(dataset, trajectory_id):
+        return dataset
 
     # Get the name of the sample dimension. The name "record" has been used in the load
     # functions, but we don't need to assume that is the name. It may be different when
@@ -68,7 +161,7 @@ def save(dataset, filename, **kwargs):
     dataset["rowSize"] = ("trajectory", rowsize)
     dataset["rowSize"].attrs["sample_dimension"] = sample_dimension
 
-    dataset.to_netcdf(filename, **kwargs)
+    return dataset
 
 
 def stretch_trid(dataset, trajectory_id):
@@ -77,9 +170,7 @@ def stretch_trid(dataset, trajectory_id):
     sample_dimension = rowsize.attrs["sample_dimension"]
 
     # Stretch the trajectory_id out along the sample dimension
-    trajectory_id_stretched = []
-    for npoints, tr_id in zip(rowsize.data, trajectory_id.data):
-        trajectory_id_stretched.extend([tr_id] * npoints)
+    trajectory_id_stretched = np.repeat(trajectory_id.values, rowsize.values)
 
     dataset = dataset.drop_vars([trajectory_id.name, rowsize.name])
 
@@ -90,6 +181,79 @@ def stretch_trid(dataset, trajectory_id):
     return dataset
 
 
+def is_ragged(dataset, trajectory_id):
+    """Check whether the tracks are stored as a contiguous ragged array
+
+    i.e. the trajectory_id has one value per track and is accompanied by a rowSize
+    variable, rather than having one value per point
+    """
+    return any(
+        "sample_dimension" in dataset[var].attrs
+        and dataset[var].dims == trajectory_id.dims
+        and dataset[var].attrs["sample_dimension"] not in trajectory_id.dims
+        for var in dataset.variables
+    )
+
+
+def ragged_index(dataset, trajectory_id):
+    """The compact index of tracks stored as a contiguous ragged array
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The tracks, containing a rowSize variable
+    trajectory_id : xarray.DataArray
+        The trajectory ID, with one value per track
+
+    Returns
+    -------
+    rowsize : xarray.DataArray
+        The number of points in each track
+    offsets : numpy.ndarray
+        The index of the first point of each track along the sample dimension
+    """
+    rowsize = _find_rowsize(dataset)
+    if rowsize.dims != trajectory_id.dims:
+        msg = (
+            f"rowSize variable {rowsize.name} does not match the dimensions of"
+            f" {trajectory_id.name}"
+        )
+        raise ValueError(msg)
+    offsets = np.concatenate([[0], np.cumsum(rowsize.values)[:-1]])
+
+    return rowsize, offsets
+
+
+def isel_ragged(dataset, trajectory_id, idx):
+    """Select tracks stored as a contiguous ragged array by index
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The tracks, containing a rowSize variable
+    trajectory_id : xarray.DataArray
+        The trajectory ID, with one value per track
+    idx : numpy.ndarray
+        The indices of the tracks to select
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    # Select the tracks and their points along the sample dimension
+    rowsize, offsets = ragged_index(dataset, trajectory_id)
+    npoints = rowsize.values[idx]
+    points = np.repeat(offsets[idx] - np.cumsum(npoints) + npoints, npoints)
+    points += np.arange(npoints.sum())
+
+    return dataset.isel(
+        {
+            trajectory_id.dims[0]: idx,
+            rowsize.attrs["sample_dimension"]: points.astype(int),
+        }
+    )
+
+
 def as1d(dataset, dims, track_id, vars_2d):
     # Stack 2d dimensions into a record dimension
     dataset = dataset.stack(record=dims)
@@ -104,12 +268,15 @@ def as1d(dataset, dims, track_id, vars_2d):
         dataset[dim] = ("record", record[dim].values)
 
     # Remove data that is only nans
-    # Use the combination of floating point variables
+    # Use the combination of floating point variables. For dask-backed variables, only
+    # the mask is computed and the remaining data is still loaded lazily
     vars_2d_floats = [
         var for var in vars_2d if np.issubdtype(dataset[var].dtype, np.floating)
     ]
-    nans = np.array([np.isnan(dataset[var]) for var in vars_2d_floats]).all(axis=0)
-    dataset = dataset.isel(record=np.where(~nans)[0])
+    nans = True
+    for var in vars_2d_floats:
+        nans = nans & np.isnan(dataset[var])
+    dataset = dataset.isel(record=np.flatnonzero(~np.asarray(nans)))
 
     # Add cf role to track_id
     if track_id.name != "track_id":
@@ -132,6 +299,32 @@ _trajectory_id_names = [
 ]
 
 
+def _layout(dataset):
+    # Check which type of netCDF we have (2d, ragged, or CSV-like)
+    # Returns the layout with the information needed to convert it to the huracanpy
+    # format
+    track_id = _find_trajectory_id(dataset)
+    time = dataset.time
+
+    if time.dims != track_id.dims:
+        # If time and track_id don't have the same dimension it could be 2d or ragged
+        # Track ID should always be 1d
+        if track_id.ndim != 1:
+            msg = f"File has a track ID with {track_id.ndim} dimensions. Should be 1d"
+            raise ValueError(msg)
+        dims = [track_id.dims[0]] + [
+            dim for dim in time.dims if dim not in track_id.dims
+        ]
+        # If any variables have a time and track_id dimension it is 2d
+        vars_2d = [var for var in dataset if sorted(dims) == sorted(dataset[var].dims)]
+
+        if len(vars_2d) > 0:
+            return "2d", track_id, dims, vars_2d
+        # Otherwise ragged array
+        return "ragged", track_id, None, None
+    return "1d", track_id, None, None
+
+
 def _find_trajectory_id(dataset):
     # Find the variable with cf_role=trajectory_id
     trajectory_id = [
@@ -156,6 +349,21 @@ def _find_trajectory_id(dataset):
     raise ValueError(msg)
 
 
+def _check_rowsize(dataset, filename):
+    # The points of each track are stored contiguously, so the number of points in
+    # each track should add up to the length of the sample dimension. Otherwise, e.g.
+    # after an interrupted append, the points can't be matched to their tracks
+    rowsize = _find_rowsize(dataset)
+    npoints = dataset.sizes[rowsize.attrs["sample_dimension"]]
+    if int(rowsize.values.sum()) != npoints:
+        msg = (
+            f"The {rowsize.name} of the tracks in {filename} add up to "
+            f"{int(rowsize.values.sum())} points, but there are {npoints} points. The "
+            f"file may have been only partially written"
+        )
+        raise ValueError(msg)
+
+
 def _find_rowsize(dataset):
     # Find the variable with sample_dimension="obs" (or equivalent)
     rowsize = [
@@ -0,0 +1,308 @@
+"""
+Module to download and cache tracks data from online sources (IBTrACS, SuperBT)
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+from . import _csv
+
+# Number of files downloaded at the same time
+max_downloads = 4
+# Number of times to retry a failed download, and the wait (in seconds) before the
+# first retry, which doubles for each subsequent retry
+retries = 3
+retry_wait = 1.0
+
+
+def cache_dir(source):
+    """The directory used to cache the files downloaded for a source
+
+    Set by the HURACANPY_CACHE_DIR environment variable, otherwise "huracanpy" in the
+    user cache directory (XDG_CACHE_HOME or ~/.cache)
+
+    Parameters
+    ----------
+    source : str
+        The name of the source, used as a subdirectory
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    if "HURACANPY_CACHE_DIR" in os.environ:
+        root = pathlib.Path(os.environ["HURACANPY_CACHE_DIR"])
+    else:
+        root = (
+            pathlib.Path(
+                os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")
+            )
+            / "huracanpy"
+        )
+
+    return root / source
+
+
+def load(url, source, parse, cache=True, keep_parsed=True):
+    """Download a file and parse it, reusing the cached copy if it is unchanged
+
+    A parsed copy of the file is stored next to the downloaded file as parquet, so
+    repeat loads skip both the download and parsing the file
+
+    Parameters
+    ----------
+    url : str
+        The URL of the file to download
+    source : str
+        The name of the source, used as the subdirectory of the cache
+    parse : callable
+        Function to load the downloaded file as an xarray.Dataset
+    cache : bool or str, default=True
+        * True - Only download the file if it has changed since it was cached
+        * False - Download the file to a temporary directory without caching it
+        * "offline" - Use the cached file without checking for a newer version
+    keep_parsed : bool, default=True
+        Store and reuse the parsed copy of the file. Should be False if `parse` can
+        give different results for the same file, e.g. with user-specified arguments
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    if cache is False:
+        with tempfile.TemporaryDirectory() as directory:
+            filename, _ = fetch(url, pathlib.Path(directory))
+            return parse(filename)
+
+    offline = _check_cache_option(cache)
+    filename, changed = fetch(url, cache_dir(source), offline=offline)
+
+    parsed = filename.with_name(filename.name + ".parquet")
+    if keep_parsed and not changed and parsed.exists():
+        return _csv.load(parsed, load_function=pd.read_parquet)
+
+    if not changed and not _checksum_matches(filename):
+        if offline:
+            msg = f"Cached file {filename} does not match its checksum"
+            raise ValueError(msg)
+        filename, _ = fetch(url, cache_dir(source), force=True)
+
+    tracks = parse(filename)
+    if not keep_parsed:
+        return tracks
+
+    # Write to a temporary file first so an interrupted write isn't used later
+    partial = parsed.with_name(parsed.name + ".part")
+    tracks.to_dataframe().reset_index(drop=True).to_parquet(partial, index=False)
+    partial.replace(parsed)
+
+    return tracks
+
+
+def load_all(urls, source, parse, cache=True, keep_parsed=True, n_workers=None):
+    """Download and parse several files at the same time
+
+    Each file is downloaded (and parsed) in a separate thread, with at most
+    `max_downloads` at once. See :py:func:`load`
+
+    Parameters
+    ----------
+    urls : list of str
+        The files to download
+    source : str
+        The name of the source, used as the subdirectory of the cache
+    parse : callable
+        Function to load each downloaded file
+    cache : bool or str, default=True
+        How to use the cache. See :py:func:`load`
+    keep_parsed : bool, default=True
+        Store and reuse the parsed copy of each file. See :py:func:`load`
+    n_workers : int, optional
+        The number of processes used to parse the files. By default, the files are
+        parsed in the download threads. Parsing in processes avoids being limited by
+        the GIL, but `parse` needs to be picklable
+
+    Returns
+    -------
+    list
+        The parsed files, in the same order as `urls`
+    """
+    if n_workers is None:
+        with ThreadPoolExecutor(max_workers=max_downloads) as threads:
+            return list(
+                threads.map(
+                    lambda url: load(url, source, parse, cache, keep_parsed), urls
+                )
+            )
+
+    # The threads still download the files, but wait for the processes to parse them
+    with ProcessPoolExecutor(max_workers=n_workers) as processes:
+
+        def parse_in_process(filename):
+            return processes.submit(parse, filename).result()
+
+        with ThreadPoolExecutor(max_workers=max_downloads) as threads:
+            return list(
+                threads.map(
+                    lambda url: load(url, source, parse_in_process, cache, keep_parsed),
+                    urls,
+                )
+            )
+
+
+def fetch(url, directory, offline=False, force=False):
+    """Download a file to the cache directory, unless the cached copy is up to date
+
+    The ETag and Last-Modified headers and sha256 checksum of each downloaded file
+    are stored alongside it in a JSON file. If the file is already cached, it is only
+    downloaded again if the server reports that it has changed. Failed downloads are
+    retried (`retries` times), waiting longer between each attempt
+
+    Parameters
+    ----------
+    url : str
+        The URL of the file to download
+    directory : pathlib.Path
+        The cache directory for the file
+    offline : bool, default=False
+        Use the cached file without checking for a newer version
+    force : bool, default=False
+        Download the file even if the cached copy is up to date
+
+    Returns
+    -------
+    filename : pathlib.Path
+        The path to the cached file
+    changed : bool
+        Whether a new copy of the file was downloaded
+    """
+    filename = directory / pathlib.PurePosixPath(urlparse(url).path).name
+    metadata = _read_metadata(filename)
+
+    if offline:
+        if not filename.exists():
+            msg = f"{url} is not in the cache ({directory}) and cache='offline'"
+            raise FileNotFoundError(msg)
+        return filename, False
+
+    cached = filename.exists() and metadata.get("url") == url and not force
+    headers = dict()
+    if cached and "etag" in metadata:
+        headers["If-None-Match"] = metadata["etag"]
+    if cached and "last_modified" in metadata:
+        headers["If-Modified-Since"] = metadata["last_modified"]
+
+    directory.mkdir(parents=True, exist_ok=True)
+    partial = filename.with_name(filename.name + ".part")
+    for attempt in range(retries + 1):
+        try:
+            result = _download(url, partial, headers, cached, metadata)
+            break
+        except HTTPError as error:
+            if error.code == 304 and cached:
+                return filename, False
+            # Only retry server errors, not e.g. a missing file
+            if error.code < 500 or attempt == retries:
+                raise
+        except OSError:
+            if attempt == retries:
+                if not cached:
+                    raise
+                warnings.warn(
+                    f"Could not check {url} for updates. Using the cached copy",
+                    stacklevel=2,
+                )
+                return filename, False
+        time.sleep(retry_wait * 2**attempt)
+
+    if result is None:
+        return filename, False
+    etag, last_modified, checksum = result
+
+    partial.replace(filename)
+    metadata = dict(url=url, sha256=checksum)
+    if etag is not None:
+        metadata["etag"] = etag
+    if last_modified is not None:
+        metadata["last_modified"] = last_modified
+    _metadata_file(filename).write_text(json.dumps(metadata, indent=2))
+
+    # Remove the parsed copy of the previous version
+    filename.with_name(filename.name + ".parquet").unlink(missing_ok=True)
+
+    return filename, True
+
+
+def _download(url, filename, headers, cached, metadata):
+    # Download the url to filename, unless the headers show it hasn't changed since the
+    # cached version (returns None). Otherwise returns the ETag, Last-Modified, and
+    # sha256 checksum of the new file
+    # Ruff (Flake8 bandit) complains that this url isn't checked, but the urls are set
+    # by huracanpy
+    with urlopen(Request(url, headers=headers)) as response:  # noqa: S310
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        # Servers (and file:// urls) may ignore the conditional request, so also
+        # compare the headers directly
+        if (
+            cached
+            and (etag is not None or last_modified is not None)
+            and etag == metadata.get("etag")
+            and last_modified == metadata.get("last_modified")
+        ):
+            return None
+
+        checksum = hashlib.sha256()
+        with open(filename, "wb") as f:
+            while chunk := response.read(1024 * 1024):
+                checksum.update(chunk)
+                f.write(chunk)
+
+    return etag, last_modified, checksum.hexdigest()
+
+
+def _check_cache_option(cache):
+    # Returns whether to use the cache without checking for updates
+    if cache is True:
+        return False
+    if cache == "offline":
+        return True
+
+    msg = f"cache must be one of {{True, False, 'offline'}}, not {cache!r}"
+    raise ValueError(msg)
+
+
+def _metadata_file(filename):
+    return filename.with_name(filename.name + ".json")
+
+
+def _read_metadata(filename):
+    try:
+        return json.loads(_metadata_file(filename).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return dict()
+
+
+def _checksum_matches(filename):
+    metadata = _read_metadata(filename)
+    if "sha256" not in metadata:
+        return False
+
+    checksum = hashlib.sha256()
+    with open(filename, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            checksum.update(chunk)
+
+    return checksum.hexdigest() == metadata["sha256"]
@@ -1,30 +1,67 @@
 """huracanpy module for saving tracks data"""
 
-from . import _netcdf
+from .._categorical import decode_categories, is_categorical
+from . import _arrow, _netcdf, _zarr
 
 
 def save(dataset, filename, **kwargs):
     """
     Save dataset as filename.
-    The file type (NetCDF or csv supported) is detected based on filename extension.
+    The file type (NetCDF, csv, parquet, Arrow IPC/Feather or Zarr supported) is
+    detected based on filename extension.
 
     Parameters
     ----------
     dataset : xarray.Dataset
-        The tracks to save
+        The tracks to save. Variables encoded with
+        :py:func:`huracanpy.encode_categories` keep their labels in netCDF, parquet,
+        Arrow IPC/Feather and Zarr files, and are written as labels in CSV files
     filename : str
-        Must end in ".nc" or ".csv"
+        Must end in ".nc", ".csv", ".parquet", ".feather", ".arrow" or ".zarr"
     **kwargs
         Remaining keywords are passed to the save function, one of
 
         - :obj:`pandas.DataFrame.to_csv`
         - :obj:`xarray.Dataset.to_netcdf`
+        - :obj:`pyarrow.parquet.ParquetWriter`
+        - :obj:`pyarrow.ipc.IpcWriteOptions`
+        - :obj:`xarray.Dataset.to_zarr`
+
+        For parquet and Arrow IPC files, `row_group_size` can also be given to set the
+        approximate number of records in each row group (default 100,000). Row groups
+        always contain whole tracks
+
+        For Zarr stores, `append=True` adds the tracks to an existing store without
+        rewriting it, and `record_chunks` sets the chunk size along the record
+        dimension (default 100,000)
 
     """
     if filename.split(".")[-1] == "nc":
         _netcdf.save(dataset, filename, **kwargs)
     elif filename.split(".")[-1] == "csv":
+        # Tracks stored as a ragged array need a track_id for each row
+        if any("sample_dimension" in dataset[var].attrs for var in dataset.variables):
+            dataset = _netcdf.stretch_trid(
+                dataset, _netcdf._find_trajectory_id(dataset)
+            )
+        # CSV files can't store the table of labels, so write the labels instead
+        dataset = dataset.assign(
+            {
+                var: decode_categories(dataset[var])
+                for var in dataset.data_vars
+                if is_categorical(dataset[var])
+            }
+        )
         dataset.to_dataframe().to_csv(filename, index=False, **kwargs)
+    elif filename.split(".")[-1] == "parquet":
+        _arrow.save(dataset, filename, file_format="parquet", **kwargs)
+    elif filename.split(".")[-1] in ["feather", "arrow"]:
+        _arrow.save(dataset, filename, file_format="feather", **kwargs)
+    elif filename.split(".")[-1] == "zarr":
+        _zarr.save(dataset, filename, **kwargs)
     else:
-        msg = "File format not recognized. Please use one of {.nc, .csv}"
+        msg = (
+            "File format not recognized. Please use one of "
+            "{.nc, .csv, .parquet, .feather, .arrow, .zarr}"
+        )
         raise NotImplementedError(msg)
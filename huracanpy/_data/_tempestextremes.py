@@ -1,6 +1,9 @@
-from io import StringIO
+import re
 
-from . import _csv
+import numpy as np
+import xarray as xr
+
+from .track_files import _open_bytes
 
 
 def load(
@@ -8,19 +11,138 @@ def load(
     variable_names=None,
     tempest_extremes_unstructured=False,
     tempest_extremes_header_str="start",
+    track_ids=None,
+    variables=None,
+):
+    return next(
+        iter_load(
+            filename,
+            variable_names,
+            tempest_extremes_unstructured,
+            tempest_extremes_header_str,
+            track_ids=track_ids,
+            variables=variables,
+        )
+    )
+
+
+def iter_load(
+    filename,
+    variable_names=None,
+    tempest_extremes_unstructured=False,
+    tempest_extremes_header_str="start",
+    chunk_tracks=None,
+    track_ids=None,
+    variables=None,
 ):
-    with open(filename) as f:
-        data = f.readlines()
+    # Each track starts with a header line, e.g. "start 33 1999 9 10 0", giving the
+    # number of points, followed by one line per point
+    header_regex = re.compile(
+        rb"^[ \t]*"
+        + re.escape(tempest_extremes_header_str.encode())
+        + rb"[ \t]+(\d+)[^\n]*(?:\n|$)",
+        flags=re.MULTILINE,
+    )
+
+    with _open_bytes(filename) as data:
+        # Locate the header of each track by its byte offset. The points of each track
+        # are everything between the end of its header and the start of the next one
+        headers = list(header_regex.finditer(data))
+        npoints = np.array([int(match.group(1)) for match in headers], dtype=int)
+        starts = np.array([match.end() for match in headers], dtype=int)
+        ends = np.array([match.start() for match in headers[1:]] + [len(data)])
+
+        # TempestExtremes ASCII does not have a track_id, so just use a counter variable
+        ids = np.arange(len(headers))
+        # Count the fields on the first point, skipping any tracks without points
+        nonempty = np.flatnonzero(npoints > 0)
+        if len(nonempty) > 0:
+            start = starts[nonempty[0]]
+            end = data.find(b"\n", start)
+            nfields = len(data[start : end if end >= 0 else len(data)].split())
+        else:
+            # No points, so assume no extra variables
+            nfields = 4 + (3 if tempest_extremes_unstructured else 4)
+        del headers
 
-    lineno = 0
+        varnames = _varnames(nfields, variable_names, tempest_extremes_unstructured)
 
-    # Just in case there are any empty lines at the start of the file
-    # This can probably be deleted
-    while data[lineno].split()[0] != tempest_extremes_header_str:
-        lineno += 1
+        # Only convert the requested columns. The track_id and time are always loaded
+        if variables is None:
+            columns = np.arange(len(varnames))
+        else:
+            columns = np.array(
+                [
+                    n
+                    for n, name in enumerate(varnames)
+                    if name in ["year", "month", "day", "hour"]
+                    or name.lower() in variables
+                ],
+                dtype=int,
+            )
+
+        # Skip tracks that aren't selected, but still count them so the track_id is the
+        # same
+        if track_ids is not None:
+            keep = np.isin(ids, track_ids)
+            ids, npoints, starts, ends = (
+                ids[keep],
+                npoints[keep],
+                starts[keep],
+                ends[keep],
+            )
 
-    nfields = len(data[lineno + 1].split())
+        if chunk_tracks is None:
+            yield _parse_tracks(data, ids, npoints, starts, ends, varnames, columns)
+        else:
+            for n in range(0, len(ids), chunk_tracks):
+                chunk = slice(n, n + chunk_tracks)
+                yield _parse_tracks(
+                    data,
+                    ids[chunk],
+                    npoints[chunk],
+                    starts[chunk],
+                    ends[chunk],
+                    varnames,
+                    columns,
+                )
 
+
+def _parse_tracks(data, track_ids, npoints, starts, ends, varnames, columns):
+    # Parse the points of all the tracks in a single call. Only the selected columns
+    # are converted. The lines are passed one track at a time, so the text of all the
+    # points isn't copied into one buffer
+    if npoints.sum() == 0:
+        values = np.empty((0, len(columns)))
+    else:
+        values = np.loadtxt(
+            (
+                line
+                for start, end in zip(starts, ends)
+                for line in data[start:end].splitlines()
+            ),
+            usecols=columns,
+            ndmin=2,
+        )
+    if len(values) != npoints.sum():
+        msg = (
+            f"Tracks do not match the expected {npoints.sum()} points. Found"
+            f" {len(values)}"
+        )
+        raise ValueError(msg)
+
+    data_vars = dict(track_id=("record", np.repeat(track_ids, npoints)))
+    for column, column_values in zip(columns, values.T):
+        name = varnames[column].lower()
+        # Grid indices and times are integers
+        if name in ["i", "j", "year", "month", "day", "hour"]:
+            column_values = column_values.astype(np.int64)
+        data_vars[name] = ("record", np.ascontiguousarray(column_values))
+
+    return xr.Dataset(data_vars)
+
+
+def _varnames(nfields, variable_names, tempest_extremes_unstructured):
     # First three or four variables are grid index and lon,lat
     # i, j for structures grid. Single index for unstructured
     # Last four variables are year, month, day, hour
@@ -40,23 +162,5 @@ def load(
             raise ValueError(msg)
         varnames += variable_names
 
-    # TempestExtremes ASCII does not have a track_id, so just use a counter variable
-    track_id = 0
     # Last four columns are always year, month, day, hour
-    varnames = ["track_id"] + varnames + ["year", "month", "day", "hour"]
-
-    output = [",".join(varnames)]
-    while lineno < len(data):
-        start, npoints, year, month, day, hour = data[lineno].split()
-        npoints = int(npoints)
-
-        # Populate time and data line by line
-        output.extend(
-            ",".join([str(track_id)] + data[lineno + 1 + m].split())
-            for m in range(npoints)
-        )
-
-        track_id += 1
-        lineno += npoints + 1
-
-    return _csv.load(StringIO("\n".join(output)), index_col=False)
+    return varnames + ["year", "month", "day", "hour"]
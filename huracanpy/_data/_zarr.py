@@ -0,0 +1,99 @@
+"""
+Module to save tracks to Zarr stores
+"""
+
+import numpy as np
+import xarray as xr
+
+from . import _netcdf
+
+
+def save(dataset, filename, append=False, record_chunks=100_000, **kwargs):
+    """Save tracks to a Zarr store as a contiguous ragged array
+
+    The tracks are stored the same way as netCDF files, following the CF conventions
+    for contiguous ragged arrays, with one track_id per track and the number of points
+    in each track (rowSize). Zarr stores can be loaded with :py:func:`huracanpy.load`
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The tracks to save
+    filename : str
+        The path to the Zarr store
+    append : bool, default=False
+        If True, add the tracks to the end of an existing store, rather than
+        overwriting it. The existing data is not modified, so new tracks must have
+        different track IDs to the tracks already stored, and the same variables on
+        the same dimensions with the same dtypes. The points and the track variables
+        are appended separately, so if the append is interrupted the store can be
+        left with points that don't belong to a track. This is detected when the store
+        is loaded or appended to again
+    record_chunks : int, default=100_000
+        The size of the Zarr chunks along the sample (record) dimension, so the points
+        can be read in parallel. Only used when creating the store
+    **kwargs
+        Remaining keywords are passed to :py:meth:`xarray.Dataset.to_zarr`
+    """
+    trajectory_id = _netcdf._find_trajectory_id(dataset)
+    dataset = _netcdf.compress_trid(dataset, trajectory_id)
+
+    rowsize = _netcdf._find_rowsize(dataset)
+    trajectory_dim = rowsize.dims[0]
+    sample_dim = rowsize.attrs["sample_dimension"]
+
+    if not append:
+        encoding = {
+            var: dict(
+                chunks=tuple(
+                    min(record_chunks, size) if dim == sample_dim else size
+                    for dim, size in dataset[var].sizes.items()
+                )
+            )
+            for var in dataset.variables
+            if sample_dim in dataset[var].dims and dataset[var].size > 0
+        }
+        dataset.to_zarr(filename, mode="w", encoding=encoding, **kwargs)
+        return
+
+    with xr.open_zarr(filename) as existing:
+        if existing[trajectory_id.name].dims != (trajectory_dim,):
+            msg = f"{filename} does not contain tracks stored as a ragged array"
+            raise ValueError(msg)
+        _netcdf._check_rowsize(existing, filename)
+
+        # Check everything that could make the append fail before writing anything
+        existing_dims = {var: existing[var].dims for var in existing.variables}
+        new_dims = {var: dataset[var].dims for var in dataset.variables}
+        if existing_dims != new_dims:
+            msg = (
+                f"Can't append tracks with variables {new_dims} to {filename} with "
+                f"variables {existing_dims}"
+            )
+            raise ValueError(msg)
+        mismatched = {
+            var: (existing[var].dtype, dataset[var].dtype)
+            for var in dataset.variables
+            if existing[var].dtype != dataset[var].dtype
+        }
+        if len(mismatched) > 0:
+            msg = (
+                f"Can't append tracks to {filename} with different dtypes (existing, "
+                f"new): {mismatched}"
+            )
+            raise ValueError(msg)
+        existing_ids = existing[trajectory_id.name].values
+
+    duplicates = np.intersect1d(existing_ids, dataset[trajectory_id.name].values)
+    if len(duplicates) > 0:
+        msg = (
+            f"Tracks with {trajectory_id.name} {list(duplicates)} are already in "
+            f"{filename}"
+        )
+        raise ValueError(msg)
+
+    # Each variable is on either the trajectory or sample dimension, so append each
+    # set separately along its own dimension. The points are appended first, so if
+    # appending the tracks fails, the extra points are found by _check_rowsize
+    dataset.drop_dims(trajectory_dim).to_zarr(filename, append_dim=sample_dim, **kwargs)
+    dataset.drop_dims(sample_dim).to_zarr(filename, append_dim=trajectory_dim, **kwargs)
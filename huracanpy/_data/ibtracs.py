@@ -1,10 +1,16 @@
 """Module for functions related to the ibtracs database"""
 
+import json
 import pathlib
 import warnings
+from functools import partial
 from urllib.request import urlretrieve
 
-from . import _csv
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from . import _csv, _remote
 
 here = pathlib.Path(__file__).parent
 ibdata_dir = here / "_ibtracs_files/"
@@ -12,6 +18,16 @@ ibdata_dir = here / "_ibtracs_files/"
 wmo_file = str(ibdata_dir / "wmo.csv")
 jtwc_file = str(ibdata_dir / "jtwc.csv")
 
+# Pre-parsed copies of the offline files, with one .npy file per variable
+wmo_bundle = ibdata_dir / "wmo"
+jtwc_bundle = ibdata_dir / "jtwc"
+
+online_url = (
+    "https://www.ncei.noaa.gov/data/"
+    "international-best-track-archive-for-climate-stewardship-ibtracs/"
+    "v04r01/access/csv/ibtracs.{subset}.list.v04r01.csv"
+)
+
 online_default_kwargs = dict(
     header=0,
     skiprows=[1],
@@ -26,20 +42,20 @@ online_default_kwargs = dict(
 )
 
 
-def load(subset, filename, **kwargs):
-    if subset.lower() in ["wmo", "usa", "jtwc"]:
+def load(subset, filename, cache=True, n_workers=None, **kwargs):
+    if isinstance(subset, str) and subset.lower() in ["wmo", "usa", "jtwc"]:
         return offline(subset)
-    return online(subset, filename=filename, **kwargs)
+    return online(subset, filename=filename, cache=cache, n_workers=n_workers, **kwargs)
 
 
-def online(subset, filename=None, **kwargs):
+def online(subset, filename=None, cache=True, n_workers=None, **kwargs):
     """
     Downloads and load into the current workspace the specified ibtracs subset from the
     IBTrACS archive online.
 
     Parameters
     ----------
-    subset : str
+    subset : str or list of str
         IBTrACS subset. Can be one of
         * ACTIVE: TCs currently active
         * ALL: Entire IBTrACS database
@@ -48,9 +64,25 @@ def online(subset, filename=None, **kwargs):
         * since1980: Entire IBTrACS database since 1980 (advent of satellite era,
                      considered reliable from then on)
 
+        A list of subsets (e.g. basins) are downloaded at the same time and combined.
+        Storms in more than one subset are only included once
+
     filename : str, optional
-        file to which to save the raw data. None to use a temporary file. Default is
-        None
+        file to which to save the raw data, for a single subset. None to use the cache
+        (see `cache`). Default is None
+
+    cache : bool or str, default=True
+        How to use the local cache of downloaded files, when `filename` is None. The
+        cache is in the directory given by the HURACANPY_CACHE_DIR environment
+        variable, or ~/.cache/huracanpy by default
+
+        * True - Only download the file if it has changed since the last download.
+          A parsed copy is also kept to skip reading the CSV file again
+        * False - Download the file to a temporary file every time
+        * "offline" - Use the cached file without checking for a newer version
+
+    n_workers : int, optional
+        The number of processes used to parse the files for a list of subsets
 
     **kwargs
         Other keyword arguments are passed to pandas.read_csv
@@ -60,22 +92,41 @@ def online(subset, filename=None, **kwargs):
     xarray.DataArray
         the IBTrACS subset requested
     """
+    # The parsed copy in the cache is only valid for the default arguments
+    keep_parsed = len(kwargs) == 0
+
     # Put IBTrACS specific arguments to read_csv second, so it
     # overwrites any arguments passed
     kwargs = {**kwargs, **online_default_kwargs}
 
-    url = (
-        "https://www.ncei.noaa.gov/data/"
-        "international-best-track-archive-for-climate-stewardship-ibtracs/"
-        f"v04r01/access/csv/ibtracs.{subset}.list.v04r01.csv"
+    if isinstance(subset, str):
+        subset = [subset]
+    urls = [online_url.format(subset=name) for name in subset]
+
+    if filename is not None:
+        if len(urls) > 1:
+            msg = "filename can only be used to download a single IBTrACS subset"
+            raise ValueError(msg)
+        # Ruff (Flake8 bandit) complains that this url isn't checked, but it explicitly
+        # has "https:/" at the start anyway
+        filename, _ = urlretrieve(urls[0], filename)  # noqa: S310
+        return _csv.load(filename, **kwargs)
+
+    tracks = _remote.load_all(
+        urls,
+        "ibtracs",
+        partial(_csv.load, **kwargs),
+        cache=cache,
+        keep_parsed=keep_parsed,
+        n_workers=n_workers,
     )
+    if len(tracks) == 1:
+        return tracks[0]
 
-    # filename=None downloads the data to a temporary file
-    # Ruff (Flake8 bandit) complains that this url isn't checked, but it explicitly has
-    # "https:/" at the start anyway
-    filename, _ = urlretrieve(url, filename)  # noqa: S310
-
-    return _csv.load(filename, **kwargs)
+    # Storms that pass through multiple basins are in each of the basin files
+    tracks = xr.concat(tracks, dim="record")
+    duplicated = pd.DataFrame(dict(sid=tracks.sid, time=tracks.iso_time)).duplicated()
+    return tracks.isel(record=~duplicated.to_numpy())
 
 
 def offline(subset="wmo"):
@@ -135,14 +186,50 @@ def offline(subset="wmo"):
             " https://www.ncei.noaa.gov/sites/default/files/2021-07/IBTrACS_v04_column_documentation.pdf",
             stacklevel=2,
         )
-        return _csv.load(wmo_file)
+        return _load_offline(wmo_file, wmo_bundle)
     elif subset.lower() in ["usa", "jtwc"]:
-        return _csv.load(jtwc_file)
+        return _load_offline(jtwc_file, jtwc_bundle)
     else:
         msg = f"{subset} not available"
         raise ValueError(msg)
 
 
+def write_bundle(filename, directory):
+    """Write the pre-parsed copy of an offline IBTrACS file
+
+    Each variable is saved as a .npy file, so they can be memory-mapped when loaded
+    rather than parsing the CSV file
+
+    Parameters
+    ----------
+    filename : str
+        The offline CSV file
+    directory : pathlib.Path
+        The directory to save the .npy files to
+    """
+    tracks = _csv.load(filename)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for var in tracks.variables:
+        np.save(directory / f"{var}.npy", tracks[var].values, allow_pickle=False)
+    (directory / "variables.json").write_text(json.dumps(list(tracks.variables)))
+
+
+def _load_offline(filename, directory):
+    # Use the pre-parsed copy if it is available. The arrays are memory-mapped, so
+    # the data is only read when it is used, and can be shared by multiple processes
+    if not (directory / "variables.json").exists():
+        return _csv.load(filename)
+
+    variables = json.loads((directory / "variables.json").read_text())
+    return xr.Dataset(
+        {
+            var: ("record", np.load(directory / f"{var}.npy", mmap_mode="r"))
+            for var in variables
+        }
+    )
+
+
 # TODOS:
 # Make warnings better
 # Deal with units, in general
@@ -1,38 +1,49 @@
-from datetime import datetime
-from io import StringIO
+import numpy as np
+import pandas as pd
 
 from . import _csv
 
 time_vars = ["year", "month", "timestep"]
 
 
-def load(filename, iris_timestep, **kwargs):
-    with open(filename) as f:
-        # First line is variable names. Rename track_id
-        header = f.readline().strip().replace("#tcid", "track_id").split()
+def load(filename, iris_timestep, variables=None, **kwargs):
+    return next(iter_load(filename, iris_timestep, variables=variables, **kwargs))
 
-        # Time is split into year, month, timestep replace these columns with a single
-        # time column. Retain the indices to convert
-        indices = [header.index(var) for var in time_vars]
-        for idx in reversed(indices):
-            del header[idx]
 
-        header.append("time")
+def iter_load(filename, iris_timestep, chunksize=None, variables=None, **kwargs):
+    # Only convert the requested columns, but always load the track_id and time
+    if variables is not None:
+        kwargs["usecols"] = _csv._usecols(variables, ["#tcid", *time_vars])
 
-        output = [",".join(header)]
+    # Put kwargs second in this statement, so it can override defaults
+    kwargs = {
+        **dict(na_values=_csv.pandas_na_values, keep_default_na=False, index_col=False),
+        **kwargs,
+    }
 
-        # Format each line as a CSV with time values replace
-        for line in f:
-            line = line.split()
-            year, month, timestep = [int(line[idx]) for idx in indices]
-            time = datetime(year, ((month - 1) % 12) + 1, 1) + timestep * iris_timestep
+    if isinstance(iris_timestep, (int, np.integer)):
+        iris_timestep = np.timedelta64(iris_timestep, "h")
+    iris_timestep = np.timedelta64(iris_timestep).astype("timedelta64[s]")
 
-            for idx in reversed(indices):
-                del line[idx]
+    # Columns are separated by spaces. First line is variable names
+    if chunksize is None:
+        yield _to_xarray(pd.read_csv(filename, sep=r"\s+", **kwargs), iris_timestep)
+    else:
+        with pd.read_csv(filename, sep=r"\s+", chunksize=chunksize, **kwargs) as reader:
+            for tracks in reader:
+                yield _to_xarray(tracks, iris_timestep)
 
-            line.append(time.isoformat())
 
-            output.append(",".join(line))
+def _to_xarray(tracks, iris_timestep):
+    tracks = tracks.rename(columns={"#tcid": "track_id"})
 
-    # Use existing CSV load function
-    return _csv.load(StringIO("\n".join(output)), index_col=False, **kwargs)
+    # Time is split into year, month, timestep. Replace these columns with a single
+    # time column, counting timesteps from the start of the month
+    year, month, timestep = (tracks.pop(var).to_numpy() for var in time_vars)
+    months = (year - 1970) * 12 + (month - 1) % 12
+    tracks["time"] = (
+        months.astype("datetime64[M]").astype("datetime64[s]")
+        + timestep * iris_timestep
+    )
+
+    return _csv._to_xarray(tracks)
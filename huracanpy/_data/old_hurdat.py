@@ -1,87 +1,121 @@
+import pathlib
 import warnings
 
+import numpy as np
 import pandas as pd
 
+# Lengths of the content of each type of line (after the 5-digit line number)
+_line_types = dict(track_header=28, track_point=38, track_type=3)
 
-def parse_any_line(line):
-    line_number = line[:5]
-    content = line[6:]
-    return line_number, content
 
+def load(filename):
+    """Load tracks from old HURDAT format files (e.g. ECMWF forecast tracks)
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path, or list
+        A file, a list of files, or a directory, in which case all files in the
+        directory are loaded. When loading multiple files, the track IDs are replaced
+        by an ascending sequence, as in :py:func:`huracanpy.concat_tracks`
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    filenames = _find_files(filename)
+    tracks = [_parse(f) for f in filenames]
 
-def identify_line_type(content):
-    if len(content) == 28:
-        return "track_header"
-    elif len(content) == 38:
-        return "track_point"
-    elif len(content) == 3:
-        return "track_type"
+    if len(tracks) == 1:
+        tracks = tracks[0]
     else:
-        warnings.warn("Line type not recognized", stacklevel=2)
+        start = 0
+        for file_tracks in tracks:
+            _, track_id = np.unique(file_tracks["track_id"], return_inverse=True)
+            file_tracks["track_id"] = start + track_id
+            start = file_tracks["track_id"].max(initial=start - 1) + 1
+
+        tracks = {
+            name: np.concatenate([file_tracks[name] for file_tracks in tracks])
+            for name in tracks[0]
+        }
+
+    # Format
+    df = pd.DataFrame(tracks)
+    df["time"] = pd.to_datetime(df.time, format="%Y/%m/%d/%H")
 
+    # Return as xarray
+    return df.to_xarray().rename({"index": "record"}).drop_vars("record")
 
-def parse_track_header(content):
-    date = content[:10]
-    track_length = int(content[13:15])
-    track_id = int(content[-4:])
-    return date, track_length, track_id
 
+def _find_files(filename):
+    if isinstance(filename, (list, tuple, np.ndarray)):
+        return list(filename)
 
-def parse_track_point(content):
-    time = content[:13]
-    lat = int(content[14:17]) / 10
-    lon = int(content[17:21]) / 10
-    wind = int(content[22:25])
-    pres = int(content[26:30])
-    lat_wind = int(content[31:34]) / 10
-    lon_wind = int(content[34:38]) / 10
-    return time, lat, lon, wind, pres, lat_wind, lon_wind
+    if pathlib.Path(filename).is_dir():
+        return sorted(f for f in pathlib.Path(filename).iterdir() if f.is_file())
 
+    return [filename]
 
-def load(filename):
-    with open(filename) as f:
-        # Read file
-        lines = f.readlines()
-        # Remove escape character
-        lines = [line[:-1] if line.endswith("\n") else line for line in lines]
-
-    # Parse through file
-    c, track_length = 0, 0
-    lines_out = []
-    while len(lines) > 0:
-        line = lines.pop(0)
-        nb, content = parse_any_line(line)
-        line_type = identify_line_type(content)
-        if line_type == "track_header":
-            # Check that previous track was finished
-            if c != track_length:
-                msg = "Previous track not finished"
-                raise ValueError(msg)
-            # Start new track
-            c = 0
-            date, track_length, track_id = parse_track_header(content)
-        elif line_type == "track_point":
-            c += 1  # Count point
-            time, lat, lon, wind, pres, lat_wind, lon_wind = parse_track_point(content)
-            lines_out.append([track_id, time, lat, lon, wind, pres, lat_wind, lon_wind])
-        elif line_type == "track_type":
-            pass
 
-    # Format
-    df = pd.DataFrame(
-        lines_out,
-        columns=[
-            "track_id",
-            "time",
-            "lat",
-            "lon",
-            "wind",
-            "pres",
-            "lat_wind",
-            "lon_wind",
-        ],
+def _parse(filename):
+    # Parse the fixed-width lines of the file all at once. Only the bytes of the fields
+    # that are needed are taken from the file contents, by their position
+    with open(filename, "rb") as f:
+        data = np.frombuffer(f.read(), dtype=np.uint8)
+
+    # Start and end (excluding the newline) of each line
+    newlines = np.flatnonzero(data == ord("\n"))
+    if len(data) > 0 and data[-1] != ord("\n"):
+        newlines = np.append(newlines, len(data))
+    starts = np.concatenate([[0], newlines[:-1] + 1])[: len(newlines)].astype(np.int64)
+    ends = newlines - ((newlines > starts) & (data[newlines - 1] == ord("\r")))
+
+    # The content of each line follows the 5-digit line number and a space
+    lengths = ends - starts - 6
+    is_header = lengths == _line_types["track_header"]
+    is_point = lengths == _line_types["track_point"]
+    if not np.isin(lengths, list(_line_types.values())).all():
+        warnings.warn("Line type not recognized", stacklevel=3)
+
+    track_number = np.cumsum(is_header) - 1
+    if (track_number[is_point] < 0).any():
+        msg = "Track point found before the first track header"
+        raise ValueError(msg)
+
+    # Check that each track has the number of points given in its header. The last
+    # track is not checked
+    headers = starts[is_header] + 6
+    track_length = _to_int(data, headers + 13, 2)
+    n_points = np.bincount(track_number[is_point], minlength=len(headers))
+    if (n_points != track_length)[:-1].any():
+        msg = "Previous track not finished"
+        raise ValueError(msg)
+
+    points = starts[is_point] + 6
+    return dict(
+        track_id=_to_int(data, headers + 24, 4)[track_number[is_point]],
+        time=_field(data, points, 13).view("S13")[:, 0].astype("U13"),
+        lat=_to_int(data, points + 14, 3) / 10,
+        lon=_to_int(data, points + 17, 4) / 10,
+        wind=_to_int(data, points + 22, 3),
+        pres=_to_int(data, points + 26, 4),
+        lat_wind=_to_int(data, points + 31, 3) / 10,
+        lon_wind=_to_int(data, points + 34, 4) / 10,
     )
-    df["time"] = pd.to_datetime(df.time)
 
-    # Return as xarray
-    return df.to_xarray().rename({"index": "record"}).drop_vars("record")
+
+def _field(data, starts, width):
+    # The bytes of a fixed-width field starting at each of the given positions, as a
+    # 2d array
+    return data[starts[:, np.newaxis] + np.arange(width)]
+
+
+def _to_int(data, starts, width):
+    # Convert fixed-width fields representing right-aligned integers (padded with
+    # spaces) to an array of integers
+    chars = _field(data, starts, width)
+    values = np.zeros(len(starts), dtype=np.int64)
+    for n in range(width):
+        digits = chars[:, n].astype(np.int64) - ord("0")
+        values = values * 10 + np.where((digits >= 0) & (digits <= 9), digits, 0)
+    return np.where((chars == ord("-")).any(axis=1), -values, values)
@@ -1,10 +1,9 @@
 import re
-from urllib.request import urlretrieve
 
 import pandas as pd
 import xarray as xr
 
-from . import _csv
+from . import _csv, _remote
 
 path = "https://raw.githubusercontent.com/tenkiman/superBT-V04/refs/heads/v04/dat/"
 # Currently headers are broken for sbt file
@@ -15,22 +14,37 @@ path = "https://raw.githubusercontent.com/tenkiman/superBT-V04/refs/heads/v04/da
 # TODO add options for different files/time periods
 meta_fname = "h-meta-md3-vars.csv"
 tracks_fname = "all-md3-{year}-MRG.csv"
+years = range(2007, 2024 + 1)
 units_rename = dict(degN="degrees_north", degE="degrees_east")
 
 
-def load():
-    filename, _ = urlretrieve(path + meta_fname, None)  # noqa: S310
-    # Use custom separator because some variable details also have a comma within the
-    # quotes. Second line removes the quotes at the other end
-    meta = pd.read_csv(filename, names=["varname", "details"]).replace(
-        "osname", "sname"
+def load(cache=True, n_workers=None):
+    """Download and load the SuperBT tracks
+
+    The yearly files are downloaded at the same time
+
+    Parameters
+    ----------
+    cache : bool or str, default=True
+        How to use the local cache of downloaded files. See :py:func:`huracanpy.load`
+    n_workers : int, optional
+        The number of processes used to parse the yearly files
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    meta = _remote.load(
+        path + meta_fname, "superbt", _parse_meta, cache=cache, keep_parsed=False
     )
-    meta.details = meta.details.apply(lambda x: x.split("'")[1])
 
-    tracks = []
-    for year in range(2007, 2024 + 1):
-        filename, _ = urlretrieve(path + tracks_fname.format(year=year), None)  # noqa: S310
-        tracks.append(_csv.load(filename).drop_vars("unnamed: 33"))
+    tracks = _remote.load_all(
+        [path + tracks_fname.format(year=year) for year in years],
+        "superbt",
+        _parse_year,
+        cache=cache,
+        n_workers=n_workers,
+    )
 
     tracks = xr.concat(tracks, dim="record")
 
@@ -49,3 +63,18 @@ def load():
         tracks[varname].attrs["description"] = details
 
     return tracks
+
+
+def _parse_meta(filename):
+    # Use custom separator because some variable details also have a comma within the
+    # quotes. Second line removes the quotes at the other end
+    meta = pd.read_csv(filename, names=["varname", "details"]).replace(
+        "osname", "sname"
+    )
+    meta.details = meta.details.apply(lambda x: x.split("'")[1])
+
+    return meta
+
+
+def _parse_year(filename):
+    return _csv.load(filename).drop_vars("unnamed: 33")
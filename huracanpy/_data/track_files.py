@@ -1,25 +1,33 @@
+import contextlib
 import gzip
+import itertools
+import mmap
+import re
 import warnings
-from io import StringIO
 
 import numpy as np
 import xarray as xr
 from parse import parse
 
-from . import _csv
-
 # Use align specifications (^, <, >) to allow variable whitespace in headers
 # Left aligned (<) for "nvars" so nfields takes all whitespace between in case there is
 # only one space
 # Right aligned (>) for variables at the end since lines are stripped of whitespace
 # prior to parsing
 header_fmt = "TRACK_NUM{ntracks:^d}ADD_FLD{nfields:^d}{nvars:<d}&{var_has_coords}"
-track_header_fmt = "TRACK_ID{track_id:>d}"
-track_header_fmt_new = "TRACK_ID{track_id:^d}START_TIME{start_time:>}"
-track_info_fmt = "POINT_NUM{npoints:>d}"
+
+# Each track starts with two header lines giving the track ID (and optionally the start
+# time) and then the number of points
+_track_header_regex = re.compile(
+    rb"^[ \t]*TRACK_ID[ \t]+(\d+)[^\n]*\n[ \t]*POINT_NUM[ \t]+(\d+)[^\n]*(?:\n|$)",
+    flags=re.MULTILINE,
+)
 
 tilt_header_fmt = "NTRACK {ntracks:d} NFIELD {nfields:d}"
-tilt_track_header_fmt = "TRACK_NO {track_id:d} NUMPT {npoints:d}"
+_tilt_track_header_regex = re.compile(
+    rb"^[ \t]*TRACK_NO[ \t]+(\d+)[ \t]+NUMPT[ \t]+(\d+)[^\n]*(?:\n|$)",
+    flags=re.MULTILINE,
+)
 
 
 def _parse(fmt, string, **kwargs):
@@ -33,7 +41,7 @@ def _parse(fmt, string, **kwargs):
     return result
 
 
-def load(filename, variable_names=None):
+def load(filename, variable_names=None, track_ids=None, variables=None):
     """Load ASCII TRACK data as an xarray.Dataset
 
     Parameters
@@ -43,19 +51,53 @@ def load(filename, variable_names=None):
     variable_names : list of str, optional
         The names of variables that have been added to the files
         (excludes time, lon, lat, vorticity) which are always included
+    track_ids : array_like, optional
+        Only parse the tracks with these IDs
+    variables : list of str, optional
+        Only keep these variables. The track_id and time are always kept
 
     Returns
     -------
     xarray.Dataset
     """
-    open_func = gzip.open if filename.split(".")[-1] == "gz" else open
+    return next(
+        iter_load(filename, variable_names, track_ids=track_ids, variables=variables)
+    )
+
 
-    with open_func(filename, "rt") as f:
+def iter_load(
+    filename, variable_names=None, chunk_tracks=None, track_ids=None, variables=None
+):
+    """Load ASCII TRACK data as a sequence of xarray.Dataset
+
+    Parameters
+    ----------
+    filename: str
+        The file to be loaded
+    variable_names : list of str, optional
+        The names of variables that have been added to the files
+        (excludes time, lon, lat, vorticity) which are always included
+    chunk_tracks : int, optional
+        The number of tracks in each Dataset. If None, all tracks are returned in a
+        single Dataset
+    track_ids : array_like, optional
+        Only parse the tracks with these IDs. The other tracks are skipped without
+        being parsed
+    variables : list of str, optional
+        Only keep these variables. The track_id and time are always kept
+
+    Yields
+    ------
+    xarray.Dataset
+    """
+    with _open_bytes(filename) as data:
         # The first lines can contain extra information bounded by two extra lines
         # Just skip to the main header line for now
-        line = ""
-        while not line.startswith("TRACK_NUM"):
-            line = f.readline().strip()
+        match = re.search(rb"^[ \t]*TRACK_NUM[^\n]*", data, flags=re.MULTILINE)
+        if match is None:
+            msg = f"No TRACK_NUM header line found in {filename}"
+            raise ValueError(msg)
+        line = match.group().decode().strip()
 
         # Load information about tracks from header line
         # If there are no added variables the line ends at the "&"
@@ -89,7 +131,7 @@ def load(filename, variable_names=None):
 
         # Create a list of variables stored in each track
         # Generic names for variables as there is currently no information otherwise
-        var_labels = ["track_id", "time", "lon", "lat", "vorticity"]
+        var_labels = ["time", "lon", "lat", "vorticity"]
         if variable_names is None:
             variable_names = [f"feature_{n}" for n in range(nfields)]
         else:
@@ -105,85 +147,185 @@ def load(filename, variable_names=None):
                 var_labels.append(f"{variable_name}_lat")
             var_labels.append(variable_name)
 
-        # Read in each track as an xarray dataset with time as the coordinate
-        output = [",".join(var_labels)]
-        for _n in range(ntracks):
-            # Read individual track header (two lines)
-            line = f.readline().strip()
-            if line.replace(" ", "") != "":  # If line is empty
-                try:
-                    track_info = _parse(track_header_fmt, line).named
-                except ValueError:
-                    track_info = _parse(track_header_fmt_new, line).named
-
-                line = f.readline().strip()
-                npoints = _parse(track_info_fmt, line)["npoints"]
-
-                # Populate time and data line by line
-                for _m in range(npoints):
-                    line = f.readline().strip()
-                    output.append(
-                        ",".join(
-                            [str(track_info["track_id"])]
-                            + line.replace("&", " ").split()
-                        )
-                    )
-            else:
-                warnings.warn(
-                    "Parsed line is empty. It is possible this problem arises because"
-                    "the number of tracks expected from the header was not found in the"
-                    "file.",
-                    stacklevel=2,
+        # The indices of the values on each line to keep
+        if variables is None:
+            columns = np.arange(len(var_labels))
+        else:
+            columns = np.array(
+                [
+                    n
+                    for n, label in enumerate(var_labels)
+                    if n == 0 or label.lower() in variables
+                ]
+            )
+
+        # Locate the two-line header of each track by its byte offset. The data for
+        # each track is then everything between the end of its header and the start
+        # of the next one
+        headers = list(
+            itertools.islice(_track_header_regex.finditer(data, match.end()), ntracks)
+        )
+        if len(headers) < ntracks:
+            warnings.warn(
+                f"Found {len(headers)} tracks but expected {ntracks} from the file"
+                f" header.",
+                stacklevel=2,
+            )
+
+        ids = np.array([int(match.group(1)) for match in headers], dtype=int)
+        npoints = np.array([int(match.group(2)) for match in headers], dtype=int)
+        starts = np.array([match.end() for match in headers], dtype=int)
+        ends = np.array([match.start() for match in headers[1:]] + [len(data)])
+        del headers
+
+        if track_ids is not None:
+            keep = np.isin(ids, track_ids)
+            ids, npoints, starts, ends = (
+                ids[keep],
+                npoints[keep],
+                starts[keep],
+                ends[keep],
+            )
+
+        if chunk_tracks is None:
+            yield _parse_tracks(data, ids, npoints, starts, ends, var_labels, columns)
+        else:
+            for n in range(0, len(ids), chunk_tracks):
+                chunk = slice(n, n + chunk_tracks)
+                yield _parse_tracks(
+                    data,
+                    ids[chunk],
+                    npoints[chunk],
+                    starts[chunk],
+                    ends[chunk],
+                    var_labels,
+                    columns,
                 )
 
-    return _csv.load(StringIO("\n".join(output)), index_col=False)
+
+def _parse_tracks(data, track_ids, npoints, starts, ends, var_labels, columns):
+    # Parse each block of numbers straight into a preallocated array with one row
+    # per variable, so each variable is contiguous in memory. Only the selected columns
+    # are kept, so unused variables are only held in memory one track at a time
+    output = np.empty((len(columns), npoints.sum()))
+    offset = 0
+    for track_id, n, start, end in zip(track_ids, npoints, starts, ends):
+        values = np.fromstring(data[start:end].replace(b"&", b" "), sep=" ")
+        if values.size != n * len(var_labels):
+            msg = (
+                f"Track {track_id} does not match the expected {n} points with"
+                f" {len(var_labels)} values each"
+            )
+            raise ValueError(msg)
+        values = values.reshape(n, len(var_labels))
+        output[:, offset : offset + n] = values[:, columns].T
+        offset += n
+
+    data_vars = dict(track_id=("record", np.repeat(track_ids, npoints)))
+    for column, values in zip(columns, output):
+        data_vars[var_labels[column].lower()] = ("record", values)
+    # Times are YYYYMMDDHH or integer timesteps
+    data_vars["time"] = ("record", output[0].astype(np.int64))
+
+    return xr.Dataset(data_vars)
+
+
+@contextlib.contextmanager
+def _open_bytes(filename):
+    # Provide the full contents of the file as a bytes-like object. Uncompressed files
+    # are memory-mapped so only the pages being parsed need to be held in memory
+    if str(filename).split(".")[-1] == "gz":
+        with gzip.open(filename, "rb") as f:
+            yield f.read()
+    else:
+        with (
+            open(filename, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            yield data
 
 
 def load_tilts(filename, nans=1e25):
-    output = list()
-    track_id = list()
-    times = list()
-    with open(filename) as f:
-        # First line
-        header = _parse(tilt_header_fmt, f.readline().strip()).named
+    """Load TRACK tilt files as an xarray.Dataset
+
+    Parameters
+    ----------
+    filename: str
+        The file to be loaded
+    nans : float, optional
+        The fill value for missing data, which is replaced by NaN. Default is 1e25
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    with _open_bytes(filename) as data:
+        # First two lines are the number of tracks/levels and the pressure levels
+        header_end = data.find(b"\n")
+        levels_end = data.find(b"\n", header_end + 1)
+        header = _parse(tilt_header_fmt, data[:header_end].decode().strip()).named
         ntracks = header["ntracks"]
         nfields = header["nfields"]
 
         line_fmt = "LEVELS " + " ".join(["{:f}"] * nfields)
-        levels = np.asarray(_parse(line_fmt, f.readline().strip()).fixed)
-
-        # Read in each track as an xarray dataset with time as the coordinate
-        for _n in range(ntracks):
-            # Read individual track header
-            track_info = _parse(tilt_track_header_fmt, f.readline().strip()).named
-            npoints = track_info["npoints"]
-
-            # Add track ID as a variable along the record dimension so that it can be
-            # used for groupby
-            track_id.extend([track_info["track_id"]] * npoints)
-
-            # Populate time and data line by line
-            for _m in range(npoints):
-                line = f.readline().strip()
-                times.append(line.split(" ")[0])
-                output.append(line)
-
-    output = np.genfromtxt(output)
-    data_vars = dict(
-        tilt=(["record", "levels"], output[:, 1:]),
-        track_id=("record", track_id),
-        time=("record", times),
-    )
-    coords = dict(pressure=("levels", levels))
+        levels = np.asarray(
+            _parse(line_fmt, data[header_end:levels_end].decode().strip()).fixed
+        )
 
-    output = xr.Dataset(data_vars=data_vars, coords=coords)
-    output.track_id.attrs["cf_role"] = "trajectory_id"
+        # Locate the header of each track. The points of each track are everything
+        # between the end of its header and the start of the next one
+        headers = list(
+            itertools.islice(
+                _tilt_track_header_regex.finditer(data, levels_end), ntracks
+            )
+        )
+        if len(headers) < ntracks:
+            warnings.warn(
+                f"Found {len(headers)} tracks but expected {ntracks} from the file"
+                f" header.",
+                stacklevel=2,
+            )
+        track_ids = np.array([int(match.group(1)) for match in headers], dtype=int)
+        npoints = np.array([int(match.group(2)) for match in headers], dtype=int)
+        starts = [match.end() for match in headers]
+        ends = [match.start() for match in headers[1:]] + [len(data)]
+        del headers
+
+        # Parse the points of all the tracks in a single call. Each line is the time
+        # followed by the tilt on each level. The lines are passed one track at a time,
+        # so the text of all the points isn't copied into one buffer
+        if npoints.sum() == 0:
+            values = np.empty((0, nfields + 1))
+        else:
+            values = np.loadtxt(
+                (
+                    line
+                    for start, end in zip(starts, ends)
+                    for line in data[start:end].splitlines()
+                ),
+                ndmin=2,
+            )
 
-    if nans is not None:
-        output["tilt"] = (
-            ["record", "levels"],
-            np.where(output.tilt == nans, np.nan, output.tilt),
+    if values.shape != (npoints.sum(), nfields + 1):
+        msg = (
+            f"Tracks do not match the expected {npoints.sum()} points with"
+            f" {nfields + 1} values each"
         )
+        raise ValueError(msg)
+
+    tilt = values[:, 1:]
+    if nans is not None:
+        tilt[tilt == nans] = np.nan
+
+    output = xr.Dataset(
+        data_vars=dict(
+            tilt=(["record", "levels"], tilt),
+            track_id=("record", np.repeat(track_ids, npoints)),
+            # Times are YYYYMMDDHH
+            time=("record", values[:, 0].astype(np.int64)),
+        ),
+        coords=dict(pressure=("levels", levels)),
+    )
     output.track_id.attrs["cf_role"] = "trajectory_id"
 
     return output
@@ -1,9 +1,10 @@
-from io import StringIO
+import numpy as np
+import pandas as pd
 
 from . import _csv
 
 
-def load(filename):
+def load(filename, variables=None):
     with open(filename) as f:
         line = ""
         while "DATE" not in line:
@@ -13,12 +14,50 @@ def load(filename):
         # Read others as is (but lower case)
         varnames = ["time", "track_id"] + [var.lower() for var in line.split()][2:]
 
-        # Reformat the file in place like a CSV
-        # Header line
-        output = [",".join(varnames)]
+        # Parse the rest of the file in one pass, skipping the header line at the start
+        # of each track ("Event: ..."). Only convert the requested columns, but always
+        # load the track_id and time
+        tracks = pd.read_csv(
+            _SkipEvents(f),
+            sep=r"\s+",
+            header=None,
+            names=varnames,
+            index_col=False,
+            usecols=_csv._usecols(variables, ["time", "track_id"]),
+            dtype=dict(time=np.int64, track_id=np.int64),
+            na_values=_csv.pandas_na_values,
+            keep_default_na=False,
+        )
 
-        # Skip track header lines and collect data as CSV
-        output += [",".join(line.split()) for line in f if not line.startswith("Event")]
+    return _csv._to_xarray(tracks)
 
-    # Use existing CSV load function
-    return _csv.load(StringIO("\n".join(output)), index_col=False)
+
+class _SkipEvents:
+    # Read-only file-like object giving the lines of an open WiTRACK file without the
+    # header line at the start of each track ("Event: ..."). The lines are read from
+    # the file as pandas asks for them, so the whole file is never held in memory
+    def __init__(self, f):
+        self._lines = (line for line in f if not line.lstrip().startswith("Event:"))
+        self._buffer = ""
+
+    def read(self, size=-1):
+        chunks, nchars = [self._buffer], len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            nchars += len(line)
+            if 0 <= size <= nchars:
+                break
+        data = "".join(chunks)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            return line
+        return next(self._lines)
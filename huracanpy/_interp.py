@@ -5,7 +5,7 @@ import pandas as pd
 import xarray as xr
 from tqdm import tqdm
 
-from ._subset import sel_id
+from ._track_index import track_index
 
 
 def interp_time(
@@ -13,10 +13,16 @@ def interp_time(
     track_ids,
     freq="1h",
     prog_bar=False,
+    method_non_numeric="nearest",
 ):
     """
     Function to interpolate track data at a given frequency.
 
+    Each track is interpolated from its first time to its last time. All tracks are
+    interpolated at once, with numeric variables interpolated linearly. The longitude
+    ("lon") is interpolated along the shortest path, so tracks crossing the dateline or
+    the prime meridian are handled correctly.
+
     Parameters
     ----------
     tracks : xarray.Dataset
@@ -24,33 +30,121 @@ def interp_time(
     track_ids : xarray.DataArray
         The array of track_ids
     freq : str, optional
-        Frequency at which you want to interpolate the data. The default is '1h'.
+        Frequency at which you want to interpolate the data. The default is '1h'. Must
+        be a fixed frequency (e.g. '30min', '6h', '1D')
     prog_bar : bool, optional
-        Show a progress bar during interpolation
+        Show a progress bar (over the variables) during interpolation
+    method_non_numeric : str, optional
+        How to fill non-numeric variables (e.g. strings). "nearest" uses the value of
+        the nearest point in time and "previous" uses the value of the last point
+        before. The default is "nearest".
 
     Returns
     -------
     xarray.Dataset
         The input `xarray.Dataset` with each individual track interpolated to the
-        requested frequency
+        requested frequency, ordered by track_id
     """
+    if method_non_numeric not in ["nearest", "previous"]:
+        msg = "method_non_numeric must be 'nearest' or 'previous'"
+        raise ValueError(msg)
+
+    try:
+        step = np.timedelta64(pd.tseries.frequencies.to_offset(freq).nanos, "ns")
+    except ValueError as e:
+        msg = f"freq must be a fixed frequency, not {freq}"
+        raise ValueError(msg) from e
+
+    dim = track_ids.dims[0]
+    index = track_index(track_ids)
+    time = tracks.time.values
 
-    new_tracks = []
+    # Sort the records by track then time, leaving out records without a track ID
+    order = np.lexsort((time, index.inverse))
+    order = order[index.inverse[order] >= 0]
+    track = index.inverse[order]
+    time = time[order]
 
-    if prog_bar:
-        iterator = tqdm(np.unique(track_ids.values))
+    # Times to interpolate to for each track, from the first to last time of the track
+    start = time[index.offsets]
+    end = time[index.offsets + index.lengths - 1]
+    npoints = (end - start) // step + 1
+    new_track = np.repeat(np.arange(len(index)), npoints)
+    new_offsets = np.cumsum(npoints) - npoints
+    new_time = (
+        start[new_track] + (np.arange(npoints.sum()) - new_offsets[new_track]) * step
+    ).astype(time.dtype)
+
+    # Find the last point before (or at) each new time, by sorting the new times along
+    # with the original times
+    merged = np.lexsort(
+        (
+            np.concatenate([np.zeros(len(time)), np.ones(len(new_time))]),
+            np.concatenate([time, new_time]),
+            np.concatenate([track, new_track]),
+        )
+    )
+    position = np.where(merged < len(time), merged, -1)
+    before = np.maximum.accumulate(position)[merged >= len(time)]
+    after = np.minimum(before + 1, (index.offsets + index.lengths - 1)[new_track])
+
+    # Fraction of the way from the point before to the point after for each new time
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = (new_time - time[before]) / (time[after] - time[before])
+    weight = np.where(after > before, weight, 0.0)
+
+    if method_non_numeric == "nearest":
+        nearest = np.where(weight < 0.5, before, after)
     else:
-        iterator = np.unique(track_ids.values)
-
-    for tid in iterator:
-        t = sel_id(tracks, track_ids, tid)
-        new_tracks.append(
-            t.set_coords("time")
-            .swap_dims({"record": "time"})
-            .interp(
-                time=pd.date_range(t.time.min().values, t.time.max().values, freq=freq)
+        nearest = before
+
+    result = dict()
+    iterator = tqdm(tracks.variables.items()) if prog_bar else tracks.variables.items()
+    for name, variable in iterator:
+        if dim not in variable.dims:
+            result[name] = variable
+            continue
+
+        axis = variable.dims.index(dim)
+        values = np.take(variable.values, order, axis=axis)
+        if name == track_ids.name:
+            values = np.take(values, index.offsets[new_track], axis=axis)
+        elif name == "time":
+            values = new_time
+        elif values.dtype.kind in "iufcmM":
+            values = _interp_linear(
+                values, before, after, weight, axis, is_lon=(name == "lon")
             )
-            .swap_dims({"time": "record"})
-            .reset_coords("time")
+        else:
+            values = np.take(values, nearest, axis=axis)
+
+        result[name] = xr.Variable(variable.dims, values, attrs=variable.attrs)
+
+    return xr.Dataset(result, attrs=tracks.attrs).set_coords(list(tracks.coords))
+
+
+def _interp_linear(values, before, after, weight, axis, is_lon=False):
+    # Reshape the weights to broadcast along the record axis
+    weight = np.expand_dims(weight, tuple(n for n in range(values.ndim) if n != axis))
+
+    if values.dtype.kind in "iu":
+        values = values.astype(np.float64)
+    before = np.take(values, before, axis=axis)
+    after = np.take(values, after, axis=axis)
+
+    if values.dtype.kind in "mM":
+        # Interpolate times as a fraction of the time difference
+        result = before + np.round(weight * (after - before).astype(np.int64)).astype(
+            (after - before).dtype
         )
-    return xr.concat(new_tracks, dim="record")
+    elif is_lon:
+        # Go the short way around the globe, then put the longitudes back in the same
+        # range as the input
+        result = before + weight * ((after - before + 180) % 360 - 180)
+        result = (result + 180) % 360 - 180 if (values < 0).any() else result % 360
+    else:
+        result = before + weight * (after - before)
+
+    # Use the original values at the original times, so they aren't made missing by
+    # a missing value at the next point
+    return np.where(weight == 0, before, result)
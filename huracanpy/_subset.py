@@ -1,6 +1,11 @@
+import operator
+
 import numpy as np
 import xarray as xr
 
+from ._data._netcdf import _find_rowsize, is_ragged, isel_ragged
+from ._track_index import track_index
+
 __all__ = ["trackswhere", "sel_id"]
 
 
@@ -12,13 +17,17 @@ def sel_id(tracks, track_ids, track_id):
     tracks : xarray.Dataset
         The tracks to subset from
     track_ids : xarray.DataArray
-        The track_ids corresponding to the tracks Dataset
+        The track_ids corresponding to the tracks Dataset. If the tracks are stored as
+        a contiguous ragged array (see `netcdf_stretch_track_id` in
+        :py:func:`huracanpy.load`), this has one value per track
     track_id : Any
         The track ID or IDs to be selected from the tracks
 
     Returns
     -------
     xarray.Dataset
+        If the selected records are contiguous (e.g. a single track), the variables
+        are views of the data in `tracks` rather than copies
 
     """
     if track_ids.ndim != 1:
@@ -28,22 +37,40 @@ def sel_id(tracks, track_ids, track_id):
     if np.isscalar(track_id):
         track_id = [track_id]
 
+    # Find the tracks with a binary search of the (cached) sorted track IDs, rather than
+    # checking every record
     dim = track_ids.dims[0]
-    idx = np.where(np.isin(track_ids, track_id))[0]
+    idx = track_index(track_ids).records(track_id)
+
+    if is_ragged(tracks, track_ids):
+        return isel_ragged(tracks, track_ids, idx)
+
+    # If the records are contiguous (e.g. a single track) select them with a slice,
+    # which gives views of the data rather than copies
+    if len(idx) > 0 and idx[-1] - idx[0] + 1 == len(idx):
+        idx = slice(idx[0], idx[-1] + 1)
 
     return tracks.isel(**{dim: idx})
 
 
-def trackswhere(tracks, track_ids, condition):
+def trackswhere(
+    tracks, track_ids, condition=None, *, reductions=None, op=None, value=None
+):
     """Subset tracks that verify a condition.
 
-    e.g select all tracks that are solely in the Northern hemisphere:
+    The condition can be given as per-track reductions of variables, compared to a
+    value with an operator. e.g. select all tracks that reach north of 30 degrees:
 
     >>> tracks_subset = huracanpy.trackswhere(
-    >>>     tracks, tracks.track_id, lambda x: (x.lat > 0).all()
+    >>>     tracks, tracks.track_id, reductions=dict(lat="max"), op=">", value=30
     >>> )
 
-    e.g. select all tracks that are category 2 at least once in their lifetime:
+    The reductions are calculated for all tracks at once, so this is much faster than
+    using a function for datasets with many tracks. If more than one variable is
+    given in `reductions`, the tracks must verify the condition for all of them.
+
+    Alternatively, the condition can be a function applied to each track. e.g. select
+    all tracks that are category 2 at least once in their lifetime:
 
     >>> track_subset = huracanpy.trackswhere(
         tracks, tracks.track_id, lambda track: track.pressure_category.max() >= 2
@@ -54,23 +81,76 @@ def trackswhere(tracks, track_ids, condition):
     tracks : xarray.Dataset
         The tracks to subset from
     track_ids : xarray.DataArray
-        The track_ids corresponding to the tracks Dataset
-    condition : callable
+        The track_ids corresponding to the tracks Dataset. With `reductions`, the
+        tracks can also be stored as a contiguous ragged array (see
+        `netcdf_stretch_track_id` in :py:func:`huracanpy.load`), with one track_id per
+        track
+    condition : callable, optional
         A function that takes an `xarray.Dataset` of an individual track and returns
-        True or False
+        True or False. Use either `condition` or `reductions`
+    reductions : dict, optional
+        The reduction to apply to each variable over each track, e.g.
+        :code:`dict(lat="max")`. One of "max", "min", "sum", "mean", "count", "first",
+        "last", "any", "all", "mode", "argmax", "argmin" (see
+        :py:func:`huracanpy.track_index`). Missing values are ignored, except by
+        "first" and "last", which give the first and last values even if they are
+        missing
+    op : str, optional
+        The comparison of the reduced values to `value`. One of ">", ">=", "<", "<=",
+        "==", "!="
+    value : Any, optional
+        The value to compare the reduced values to
 
     Returns
     -------
     xarray.Dataset
-        A dataset with the subset of tracks from the input that match the given criteria
+        A dataset with the subset of tracks from the input that match the given
+        criteria. With `reductions`, the records are kept in their original order.
+        With `condition`, the tracks are sorted by track ID
 
     """
     if track_ids.ndim != 1:
         msg = "track_ids must be 1d"
         raise ValueError(msg)
 
-    track_groups = [
-        track for track_id, track in tracks.groupby(track_ids) if condition(track)
-    ]
+    if condition is not None:
+        if reductions:
+            msg = "Use either condition or reductions, not both"
+            raise ValueError(msg)
+
+        track_groups = [
+            track for track_id, track in tracks.groupby(track_ids) if condition(track)
+        ]
+
+        return xr.concat(track_groups, dim=track_ids.dims[0])
+
+    if not reductions:
+        msg = "Either condition or reductions must be given"
+        raise ValueError(msg)
+    if op not in _operators:
+        msg = f"op must be one of {list(_operators)}"
+        raise ValueError(msg)
 
-    return xr.concat(track_groups, dim=track_ids.dims[0])
+    # Evaluate the condition for all tracks at once, then select the records of the
+    # matching tracks with a single isel
+    ragged = is_ragged(tracks, track_ids)
+    index = track_index(track_ids, rowsize=_find_rowsize(tracks) if ragged else None)
+    keep = np.ones(len(index), dtype=bool)
+    for varname, how in reductions.items():
+        keep &= _operators[op](index.reduce(tracks[varname], how), value)
+
+    if ragged:
+        idx = np.flatnonzero(np.isin(track_ids.values, index.track_ids[keep]))
+        return isel_ragged(tracks, track_ids, idx)
+
+    return tracks.isel({track_ids.dims[0]: np.flatnonzero(index.expand(keep, False))})
+
+
+_operators = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
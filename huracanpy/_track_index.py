@@ -0,0 +1,477 @@
+"""
+Index of which records belong to each track, shared by functions working per track
+"""
+
+import weakref
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+__all__ = ["track_index", "TrackIndex"]
+
+# Indexes already computed, by id of the track_id array, with a weak reference to the
+# array to check it is still the same array
+_cache = dict()
+
+
+def track_index(track_ids, rowsize=None):
+    """Get the index of the records of each track
+
+    The index is computed once for each array of track IDs and then reused, so
+    functions working per track (e.g. :py:func:`huracanpy.sel_id`) don't need to search
+    for the records of each track every time they are called
+
+    >>> index = huracanpy.track_index(tracks.track_id)
+    >>> index = tracks.hrcn.track_index()
+
+    The cached index is not updated if the track IDs are modified in place (e.g.
+    :code:`tracks.track_id.values[:] = ...`). Assigning a new track_id variable
+    (e.g. :code:`tracks["track_id"] = ...`) gives a new index
+
+    Parameters
+    ----------
+    track_ids : array_like
+        The track ID of each record, or of each track if `rowsize` is given
+    rowsize : array_like, optional
+        The number of records in each track, for tracks stored as a contiguous ragged
+        array (see `netcdf_stretch_track_id` in :py:func:`huracanpy.load`)
+
+    Returns
+    -------
+    TrackIndex
+    """
+    arrays = [_as_array(track_ids)]
+    if rowsize is not None:
+        arrays.append(_as_array(rowsize))
+
+    key = tuple(id(array) for array in arrays)
+    if key in _cache:
+        refs, index = _cache[key]
+        if all(ref() is array for ref, array in zip(refs, arrays)):
+            return index
+
+    index = TrackIndex(*arrays) if rowsize is None else TrackIndex.from_rowsize(*arrays)
+    try:
+        refs = [weakref.ref(array, lambda _: _cache.pop(key, None)) for array in arrays]
+    except TypeError:
+        return index
+    _cache[key] = (refs, index)
+
+    return index
+
+
+class TrackIndex:
+    """The records of each track, from the track ID of each record
+
+    Attributes
+    ----------
+    track_ids : numpy.ndarray
+        The unique track IDs, sorted
+    starts : numpy.ndarray
+        The position of the first record of each track
+    lengths : numpy.ndarray
+        The number of records in each track
+    contiguous : bool
+        Whether the records of each track are next to each other. If so, the records of
+        track `n` are `starts[n]` to `starts[n] + lengths[n]`
+    order : numpy.ndarray
+        The positions of the records sorted by track ID (keeping the original order
+        within each track). Records with a missing track ID (NaN/NaT) are not part of
+        any track and are left out
+    offsets : numpy.ndarray
+        The position of the first record of each track in `order`
+    size : int
+        The number of records
+    """
+
+    def __init__(self, track_ids):
+        track_ids = _as_array(track_ids)
+        if track_ids.ndim != 1:
+            msg = "track_ids must be 1d"
+            raise ValueError(msg)
+
+        self.size = len(track_ids)
+        self.order = np.argsort(track_ids, kind="stable")
+        # Records with a missing track ID (NaN/NaT) are not part of any track, like
+        # xarray groupby. They are sorted to the end
+        self.order = self.order[: self.size - _missing(track_ids).sum()]
+        sorted_ids = track_ids[self.order]
+
+        is_new = np.ones(len(sorted_ids), dtype=bool)
+        is_new[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        self.offsets = np.flatnonzero(is_new)
+        self.lengths = np.diff(np.append(self.offsets, len(sorted_ids)))
+        self.track_ids = sorted_ids[self.offsets]
+        self.starts = self.order[self.offsets]
+
+        # The stable sort keeps the records of each track in order, so the track is
+        # contiguous if its records span the same number of positions as its length
+        self.contiguous = bool((self.ends - self.starts + 1 == self.lengths).all())
+
+    @classmethod
+    def from_rowsize(cls, track_ids, rowsize):
+        """The index of tracks stored as a contiguous ragged array, without repeating
+        the track ID for each record
+
+        Parameters
+        ----------
+        track_ids : array_like
+            The track ID of each track
+        rowsize : array_like
+            The number of records in each track. The records of each track follow on
+            from the records of the previous track
+
+        Returns
+        -------
+        TrackIndex
+        """
+        track_ids, rowsize = _as_array(track_ids), _as_array(rowsize).astype(int)
+        if track_ids.shape != rowsize.shape or track_ids.ndim != 1:
+            msg = "track_ids and rowsize must be 1d with one value per track"
+            raise ValueError(msg)
+
+        # Tracks without records or with a missing track ID don't appear in the index
+        keep = (rowsize > 0) & ~_missing(track_ids)
+        starts = (np.cumsum(rowsize) - rowsize)[keep]
+        order = np.argsort(track_ids[keep], kind="stable")
+        sorted_ids = track_ids[keep][order]
+        if (sorted_ids[1:] == sorted_ids[:-1]).any():
+            # A track split over more than one row
+            return cls(np.repeat(track_ids, rowsize))
+
+        index = cls.__new__(cls)
+        index.size = int(rowsize.sum())
+        index.track_ids = sorted_ids
+        index.starts = starts[order]
+        index.lengths = rowsize[keep][order]
+        index.offsets = np.cumsum(index.lengths) - index.lengths
+        index.order = np.repeat(index.starts - index.offsets, index.lengths)
+        index.order += np.arange(index.lengths.sum())
+        index.contiguous = True
+
+        return index
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    @cached_property
+    def ends(self):
+        """The position of the last record of each track"""
+        return self.order[self.offsets + self.lengths - 1]
+
+    @cached_property
+    def inverse(self):
+        """The number of the track (position in `track_ids`) of each record, or -1 for
+        records with a missing track ID
+        """
+        inverse = np.full(self.size, -1, dtype=int)
+        inverse[self.order] = np.repeat(np.arange(len(self)), self.lengths)
+        return inverse
+
+    @cached_property
+    def _complete(self):
+        # Whether every record is part of a track
+        return len(self.order) == self.size
+
+    @cached_property
+    def _in_order(self):
+        # Whether the tracks cover all the records, are contiguous, and are already
+        # sorted by track ID
+        return (
+            self._complete
+            and self.contiguous
+            and bool((np.diff(self.starts) > 0).all())
+        )
+
+    @cached_property
+    def transitions(self):
+        """The positions, n, where the records n and n+1 are from different tracks"""
+        if self._complete and self.contiguous:
+            # The end of each track, except the last
+            return np.sort(self.ends)[:-1]
+        return np.flatnonzero(self.inverse[1:] != self.inverse[:-1])
+
+    def expand(self, values, fill_value=np.nan):
+        """The value for each track at each of its records
+
+        Parameters
+        ----------
+        values : array_like
+            One value for each track, in the same order as `track_ids`
+        fill_value : Any, default=np.nan
+            The value for records with a missing track ID
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        values = np.asarray(values)
+        if self._complete:
+            return values[self.inverse]
+        if len(self) == 0:
+            return np.full(self.size, fill_value)
+        return np.where(self.inverse >= 0, values[self.inverse], fill_value)
+
+    def find(self, track_ids):
+        """The number of each track (position in `track_ids`), or -1 if the track ID is
+        not in the index
+
+        Parameters
+        ----------
+        track_ids : array_like
+            The track IDs to look up
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        track_ids = np.atleast_1d(np.asarray(track_ids))
+        if len(self) == 0:
+            return np.full(track_ids.shape, -1)
+
+        try:
+            n = np.searchsorted(self.track_ids, track_ids)
+        except TypeError:
+            # Track IDs of a different type (e.g. str and int) can't match
+            return np.full(track_ids.shape, -1)
+        n[n == len(self)] = 0
+        return np.where(self.track_ids[n] == track_ids, n, -1)
+
+    def arg_extreme(self, values, stat="max"):
+        """The position of the record with the maximum/minimum value in each track
+
+        Missing values are ignored, unless all values in the track are missing. If the
+        extreme value appears more than once, the first record is used
+
+        Parameters
+        ----------
+        values : array_like
+            The value at each record
+        stat : str, default="max"
+            "max" or "min"
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        values = _as_array(values)
+        if values.dtype.kind in "mM":
+            missing = np.isnat(values)
+            values = values.view(np.int64).astype(np.float64)
+        elif values.dtype.kind in "OUS":
+            # e.g. cftime.datetime or strings. Use the rank of each value
+            missing = pd.isna(values)
+            _, values = np.unique(values, return_inverse=True)
+            values = values.astype(np.float64)
+        else:
+            missing = np.isnan(values)
+            values = values.astype(np.float64)
+
+        if stat == "max":
+            values = -values
+        elif stat != "min":
+            msg = "stat not recognized. Please use one of {min, max}"
+            raise NotImplementedError(msg)
+
+        # Sort the records of each track by missing, value, then position
+        group = np.repeat(np.arange(len(self)), self.lengths)
+        order = np.lexsort((self.order, values[self.order], missing[self.order], group))
+
+        return self.order[order[self.offsets]]
+
+    def grouped(self, values):
+        """The values with the records of each track next to each other, ordered by
+        track ID, so the values for track `n` start at `offsets[n]`
+
+        Parameters
+        ----------
+        values : array_like
+            The value at each record
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        values = _as_array(values)
+        if self._in_order:
+            return values
+        return values[self.order]
+
+    def reduce(self, values, how):
+        """Reduce the values over the records of each track
+
+        Missing values (NaN/NaT) are ignored, as for the default xarray reductions.
+        The reductions are calculated for all tracks at once with
+        :py:meth:`numpy.ufunc.reduceat`
+
+        Parameters
+        ----------
+        values : array_like
+            The value at each record
+        how : str
+            One of "max", "min", "sum", "mean", "count", "first", "last", "any",
+            "all", "mode", "argmax", "argmin". "mode" gives the most frequent value
+            (the smallest if there is more than one), and "argmax"/"argmin" give the
+            position of the record with the maximum/minimum value (see
+            :py:meth:`arg_extreme`). "first" and "last" give the first and last
+            values, even if they are missing. Datetimes can't use "sum", "any" or
+            "all", and their "mean" is rounded to the units of the values. Strings
+            and objects can only use "max", "min", "count", "first", "last", "mode",
+            "argmax" and "argmin"
+
+        Raises
+        ------
+        ValueError
+            If the reduction is not valid, or not supported for the type of values
+
+        Returns
+        -------
+        numpy.ndarray
+            The reduced value for each track, in the same order as `track_ids`
+        """
+        if how not in [*_reductions, "argmax", "argmin"]:
+            msg = (
+                f"{how} is not a valid reduction. Use one of"
+                f" {[*_reductions, 'argmax', 'argmin']}"
+            )
+            raise ValueError(msg)
+
+        values = _as_array(values)
+        kind = values.dtype.kind
+        if kind in _supported and how not in _supported[kind]:
+            msg = (
+                f"Can't calculate the {how} of {values.dtype} values. Use one of"
+                f" {_supported[kind]}"
+            )
+            raise ValueError(msg)
+
+        if how in ["argmax", "argmin"]:
+            return self.arg_extreme(values, stat=how[3:])
+        if how in ["max", "min"] and kind in "US":
+            # numpy.fmax/fmin don't support strings
+            return values[self.arg_extreme(values, stat=how)]
+
+        values = self.grouped(values)
+        if len(self) == 0:
+            return values[:0]
+
+        return _reductions[how](self, values)
+
+    def records(self, track_ids):
+        """The positions of the records of the given tracks, in the original order
+
+        Parameters
+        ----------
+        track_ids : array_like
+            The track IDs of the tracks to select
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        n = self.find(track_ids)
+        n = np.unique(n[n >= 0])
+
+        # Positions in order of each record to select
+        positions = np.repeat(
+            self.offsets[n] - np.cumsum(self.lengths[n]) + self.lengths[n],
+            self.lengths[n],
+        ) + np.arange(self.lengths[n].sum())
+
+        return np.sort(self.order[positions])
+
+
+def _missing(values):
+    if values.dtype.kind in "mM":
+        return np.isnat(values)
+    if values.dtype.kind in "fc":
+        return np.isnan(values)
+    return np.zeros(values.shape, dtype=bool)
+
+
+def _sum(index, values):
+    if values.dtype.kind == "b":
+        values = values.astype(int)
+    missing = _missing(values)
+    if missing.any():
+        values = np.where(missing, 0, values)
+    return np.add.reduceat(values, index.offsets)
+
+
+def _count(index, values):
+    return index.lengths - np.add.reduceat(_missing(values), index.offsets, dtype=int)
+
+
+def _mean(index, values):
+    if values.dtype.kind in "mM":
+        # Average the offsets from the earliest value in each track as numbers, then
+        # round back to the units of the values
+        reference = np.fmin.reduceat(values, index.offsets)
+        offsets = values - np.repeat(reference, index.lengths)
+        unit = offsets.dtype
+        offsets = np.where(_missing(values), np.nan, offsets.view(np.int64))
+        mean = _mean(index, offsets)
+        return np.where(
+            np.isnan(mean),
+            np.array("NaT", dtype=values.dtype),
+            reference + np.round(np.nan_to_num(mean)).astype(np.int64).astype(unit),
+        )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _sum(index, values) / _count(index, values)
+
+
+def _mode(index, values):
+    # Sort the values within each track, then count the runs of equal values. Missing
+    # values are never equal, and don't count, so are only used for all-missing tracks
+    group = np.repeat(np.arange(len(index)), index.lengths)
+    order = np.lexsort((values, group))
+    values, missing = values[order], _missing(values)[order]
+
+    is_new = np.ones(len(values), dtype=bool)
+    is_new[1:] = values[1:] != values[:-1]
+    is_new[index.offsets] = True
+    runs = np.flatnonzero(is_new)
+    counts = np.add.reduceat(~missing, runs, dtype=int)
+
+    # The longest run in each track. Ties give the first (smallest) value
+    best = runs[np.lexsort((runs, -counts, group[runs]))]
+    first = np.searchsorted(group[best], np.arange(len(index)))
+    return values[best[first]]
+
+
+# The reductions supported for each kind of values (numpy.dtype.kind). Numbers and
+# booleans support all reductions
+_with_order = ["max", "min", "count", "first", "last", "mode", "argmax", "argmin"]
+_supported = dict(
+    M=[*_with_order, "mean"],
+    m=[*_with_order, "sum", "mean"],
+    U=_with_order,
+    S=_with_order,
+    O=_with_order,
+)
+
+# Reductions for TrackIndex.reduce, taking the index and the values grouped by track
+_reductions = dict(
+    max=lambda index, values: np.fmax.reduceat(values, index.offsets),
+    min=lambda index, values: np.fmin.reduceat(values, index.offsets),
+    sum=_sum,
+    mean=_mean,
+    count=_count,
+    first=lambda index, values: values[index.offsets],
+    last=lambda index, values: values[index.offsets + index.lengths - 1],
+    any=lambda index, values: np.logical_or.reduceat(values, index.offsets),
+    all=lambda index, values: np.logical_and.reduceat(values, index.offsets),
+    mode=_mode,
+)
+
+
+def _as_array(track_ids):
+    if isinstance(track_ids, xr.DataArray):
+        track_ids = track_ids.values
+    # Remove units added by metpy
+    if hasattr(track_ids, "magnitude"):
+        track_ids = track_ids.magnitude
+    return np.asarray(track_ids)
@@ -3,6 +3,7 @@
 __all__ = [
     "density",
     "track_duration",
+    "track_reduce",
     "gen_vals",
     "apex_vals",
     "time_from_genesis",
@@ -22,5 +23,6 @@ from ._track_stats import (
     apex_vals,
     gen_vals,
     track_duration,
+    track_reduce,
 )
 from ._translation import azimuth, corral_radius, distance, translation_speed
@@ -2,7 +2,10 @@
 Module containing functions to compute lifecycle stage
 """
 
-import pandas as pd
+import numpy as np
+import xarray as xr
+
+from .._track_index import track_index
 
 
 def time_from_genesis(time, track_ids):
@@ -27,19 +30,7 @@ def time_from_genesis(time, track_ids):
         >>> )
 
     """
-    data_df = pd.DataFrame({"time": time, "track_id": track_ids})
-    data_df = data_df.merge(
-        data_df.groupby("track_id").time.min(),
-        on="track_id",
-        suffixes=["_actual", "_gen"],
-    )
-    time_from_start = data_df.time_actual - data_df.time_gen
-    return (
-        time_from_start.to_xarray()
-        .rename({"index": track_ids.dims[0]})
-        .drop_vars(track_ids.dims[0])
-        .rename("time_from_genesis")
-    )
+    return _time_from(time, track_ids, stat="min").rename("time_from_genesis")
 
 
 def time_from_apex(time, track_ids, intensity_var, stat="max"):
@@ -65,22 +56,21 @@ def time_from_apex(time, track_ids, intensity_var, stat="max"):
     xarray.DataArray
 
     """
-    if stat == "max":
-        asc = False
-    elif stat == "min":
-        asc = True
-    else:
-        msg = "stat not recognized. Please use one of {min, max}"
-        raise NotImplementedError(msg)
-    data_df = pd.DataFrame(
-        {"time": time, "track_id": track_ids, "intensity": intensity_var}
-    )
-    extr = data_df.sort_values("intensity", ascending=asc).groupby("track_id").first()
-    data_df = data_df.merge(extr, on="track_id", suffixes=["_actual", "_extr"])
-    time_from_extr = data_df.time_actual - data_df.time_extr
-    return (
-        time_from_extr.to_xarray()
-        .rename({"index": track_ids.dims[0]})
-        .drop_vars(track_ids.dims[0])
-        .rename("time_from_extremum")
+    return _time_from(time, track_ids, intensity_var, stat=stat).rename(
+        "time_from_extremum"
     )
+
+
+def _time_from(time, track_ids, variable=None, stat="min"):
+    # Time relative to the point with the extreme value of variable (or time) in each
+    # track
+    if variable is None:
+        variable = time
+
+    index = track_index(track_ids)
+    time = np.asarray(time)
+    reference_time = time[index.arg_extreme(variable, stat=stat)]
+
+    reference_time = index.expand(reference_time, fill_value=np.datetime64("NaT"))
+
+    return xr.DataArray(time - reference_time, dims=track_ids.dims)
@@ -9,6 +9,7 @@ from metpy.units import units
 from metpy.xarray import preprocess_and_wrap
 
 from .._metpy import dequantify_results
+from .._track_index import track_index
 
 
 def _dummy_track_id(var):
@@ -118,7 +119,7 @@ def rate(var, time, track_ids=None, centering="forward"):
 def _align_array(array, track_id, centering, centred=None):
     # Index n, where the track ID changes between n and n+1
     # array is already a difference. So index n in array
-    transition_points = np.where(track_id[1:] != track_id[:-1])[0]
+    transition_points = track_index(track_id).transitions
 
     # Mask points where track_id changes
     # Multiplying np.nan by an array element gives us the correct type of nan for both
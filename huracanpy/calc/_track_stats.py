@@ -3,7 +3,10 @@ Module containing functions to compute track statistics
 """
 
 import numpy as np
-import pandas as pd
+import xarray as xr
+
+from .._data._netcdf import _find_rowsize, is_ragged
+from .._track_index import track_index
 
 
 def track_duration(time, track_ids):
@@ -24,13 +27,93 @@ def track_duration(time, track_ids):
 
     """
     duration = (
-        time.groupby(track_ids).map(lambda x: x.max() - x.min()).rename("duration")
-    )
+        _reduce(time, track_ids, "max") - _reduce(time, track_ids, "min")
+    ).rename("duration")
     duration = duration / np.timedelta64(1, "h")
     duration.attrs["units"] = "hours"
     return duration
 
 
+def track_reduce(tracks, reductions, track_id):
+    """
+    Compute statistics of variables over each track
+
+    e.g. the maximum wind speed of each track and the point where it occurs, and the
+    first and last time of each track
+
+    >>> stats = huracanpy.calc.track_reduce(
+    >>>     tracks,
+    >>>     {"wind": ["max", "argmax"], "time": ["first", "last"]},
+    >>>     tracks.track_id,
+    >>> )
+
+    All the statistics are calculated for all tracks at once, rather than looping over
+    the tracks
+
+    Parameters
+    ----------
+    tracks : xarray.Dataset
+        The set of tracks
+    reductions : dict
+        The statistics to compute (str or list of str) for each variable. Can be
+        "min", "max", "sum", "mean", "count", "first", "last", "any", "all", "mode",
+        "argmin" or "argmax". Missing values are ignored, except by "first" and
+        "last". "mode" gives the most frequent value (the smallest if there is more
+        than one), and "argmin"/"argmax" give the position of the record with the
+        minimum/maximum value, which can be used with `tracks.isel`. Times can't use
+        "sum", "any" or "all", and strings can only use "min", "max", "count",
+        "first", "last", "mode", "argmin" and "argmax"
+    track_id : xarray.DataArray
+        Track ID at each point. If the tracks are stored as a contiguous ragged array
+        (see `netcdf_stretch_track_id` in :py:func:`huracanpy.load`), this has one
+        value per track
+
+    Returns
+    -------
+    xarray.Dataset
+        Dataset with track_id as index and a variable for each statistic, named
+        "{variable}_{statistic}" (e.g. "wind_max")
+
+    Raises
+    ------
+    ValueError
+        If a statistic is not valid, or not supported for the type of the variable
+
+    """
+    rowsize = _find_rowsize(tracks) if is_ragged(tracks, track_id) else None
+
+    result = dict()
+    for varname, stats in reductions.items():
+        if isinstance(stats, str):
+            stats = [stats]
+        for stat in stats:
+            result[f"{varname}_{stat}"] = _reduce(
+                tracks[varname], track_id, stat, rowsize=rowsize
+            )
+
+    return xr.Dataset(result)
+
+
+def _reduce(values, track_ids, stat, rowsize=None):
+    # Compute a statistic of values over each track as a DataArray with the track IDs as
+    # the coordinate, like values.groupby(track_ids).<stat>()
+    index = track_index(track_ids, rowsize=rowsize)
+    name = getattr(track_ids, "name", None) or "track_id"
+
+    # Keep the attributes (e.g. units) for statistics with the same units as the values
+    attrs = dict()
+    if stat not in ["count", "argmin", "argmax"]:
+        attrs = getattr(values, "attrs", dict())
+
+    return xr.DataArray(
+        index.reduce(values, stat),
+        dims=(name,),
+        coords={name: (name, index.track_ids, getattr(track_ids, "attrs", dict()))},
+        name=getattr(values, "name", None),
+        attrs=attrs,
+    )
+
+
 def gen_vals(tracks, time, track_id):
     """
     Shows the attributes for the genesis point of each track
@@ -50,17 +133,7 @@ def gen_vals(tracks, time, track_id):
         Dataset containing only genesis points, with track_id as index.
 
     """
-    # It is 470 times much faster to switch to a dataframe...
-    # Use the sortby/groupby with pandas to find the relevant indices in the original
-    # Dataset by passing an index (named idx to not clash with "index")
-    df = pd.DataFrame(
-        data=dict(
-            idx=np.arange(len(track_id)),
-            time=np.asarray(time),
-            track_id=np.asarray(track_id),
-        )
-    )
-    idx = np.asarray(df.sort_values("time").groupby("track_id").first().idx)
+    idx = track_index(track_id).arg_extreme(time, stat="min")
 
     # Could check that track_id is 1d, but the function would already have failed by now
     # if not
@@ -99,33 +172,7 @@ def apex_vals(tracks, variable, track_id, stat="max"):
         Dataset containing only extremum points, with track_id as index.
 
     """
-
-    # tracks will be sorted along var and then the first line of each track_id will be
-    # used
-    # asc determines whether the sorting must be ascending (True) or descending (False)
-    if stat == "max":
-        asc = False
-    elif stat == "min":
-        asc = True
-    else:
-        msg = "stat not recognized. Please use one of {min, max}"
-        raise NotImplementedError(msg)
-
-    # It is 350 times much faster to switch to a dataframe.
-    # Use the same trick as with gen_vals
-    df = pd.DataFrame(
-        data=dict(
-            idx=np.arange(len(variable)),
-            var=np.asarray(variable),
-            track_id=np.asarray(track_id),
-        )
-    )
-    idx = np.asarray(
-        df.sort_values(["var", "idx"], ascending=[asc, True])
-        .groupby("track_id")
-        .first()
-        .idx
-    )
+    idx = track_index(track_id).arg_extreme(variable, stat=stat)
 
     dim = track_id.dims[0]
     tracks = tracks.isel(**{dim: idx})
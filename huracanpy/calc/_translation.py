@@ -17,6 +17,7 @@ from metpy.xarray import preprocess_and_wrap
 from pint.errors import UnitStrippedWarning
 
 from .._metpy import dequantify_results
+from .._track_index import track_index
 from ._rates import _align_array, _dummy_track_id, delta
 
 
@@ -321,15 +322,11 @@ def corral_radius(lon, lat, time=None, track_id=None, *, window=None, min_points
         window = timedelta(hours=window)
 
     corral_radii = np.full(len(lon), np.nan)
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=UnitStrippedWarning)
-        track_id, indices, counts = np.unique(
-            np.asarray(track_id), return_index=True, return_counts=True
-        )
+    index = track_index(track_id)
 
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", category=UnitStrippedWarning)
-        for idx, count in zip(indices, counts):
+        for idx, count in zip(index.starts, index.lengths):
             if time is not None and window is not None:
                 times = time[idx : idx + count]
 
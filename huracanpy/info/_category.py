@@ -10,12 +10,12 @@ import pint
 from metpy.xarray import preprocess_and_wrap
 from pint.errors import UnitStrippedWarning
 
+from .._categorical import encode_categories
 from .._metpy import validate_units
 from ._conventions import _thresholds
 
 
-@preprocess_and_wrap(wrap_like="variable")
-def category(variable, bins, labels=None, variable_units=None):
+def category(variable, bins, labels=None, variable_units=None, categorical=False):
     """Calculate a generic category from a variable and a set of thresholds
 
     >>> huracanpy.info.category(tracks.wind, bins = [0,10,20,30], labels = [1,2,3])
@@ -32,6 +32,9 @@ def category(variable, bins, labels=None, variable_units=None):
         The units of the input variable. Only needs to be specified if they are
         different to the units of the bins and they are not already in the attributes of
         the variable.
+    categorical : bool, default=False
+        If True, return integer codes with the labels in the "categories" attribute.
+        See :py:func:`huracanpy.encode_categories`
 
     Returns
     -------
@@ -48,6 +51,14 @@ def category(variable, bins, labels=None, variable_units=None):
         )
         labels = [str(i) for i in range(len(bins) - 1)]
 
+    result = _category(variable, bins, labels, variable_units)
+    if categorical:
+        return encode_categories(result, categories=labels)
+    return result
+
+
+@preprocess_and_wrap(wrap_like="variable")
+def _category(variable, bins, labels, variable_units):
     # Account for one, both, or neither of the variable and bins having their units
     # specified
     variable = validate_units(
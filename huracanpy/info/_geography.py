@@ -13,6 +13,7 @@ from metpy.xarray import preprocess_and_wrap
 from pint.errors import UnitStrippedWarning
 
 from .._basins import basins
+from .._categorical import encode_categories
 from ..convert import to_geodataframe
 
 
@@ -32,8 +33,7 @@ def _wrap_arrays(*args):
     return arrays
 
 
-@preprocess_and_wrap(wrap_like="lat")
-def hemisphere(lat):
+def hemisphere(lat, categorical=False):
     """
     Function to detect which hemisphere each point corresponds to.
 
@@ -41,6 +41,9 @@ def hemisphere(lat):
     ----------
     lat : xarray.DataArray
         Latitude for each point
+    categorical : bool, default=False
+        If True, return integer codes with the labels ("N", "S") in the "categories"
+        attribute. See :py:func:`huracanpy.encode_categories`
 
     Returns
     -------
@@ -50,11 +53,17 @@ def hemisphere(lat):
 
         >>> tracks["hemisphere"] = get_hemisphere(tracks.lat)
     """
+    if categorical:
+        return encode_categories(_hemisphere(lat), categories=["N", "S"])
+    return _hemisphere(lat)
+
 
+@preprocess_and_wrap(wrap_like="lat")
+def _hemisphere(lat):
     return np.where(lat >= 0, "N", "S")
 
 
-def basin(lon, lat, convention="WMO-TC", crs=None):
+def basin(lon, lat, convention="WMO-TC", crs=None, categorical=False):
     """
     Function to determine the basin of each point, according to the selected convention.
 
@@ -98,6 +107,10 @@ def basin(lon, lat, convention="WMO-TC", crs=None):
         before checking the basin. If None is given, it will use cartopy.crs.Geodetic
         which is essentially the same, but allows the longitudes to be defined in ranges
         broader than -180, 180
+    categorical : bool, default=False
+        If True, return integer codes with the basin names of the convention (and ""
+        for no basin) in the "categories" attribute. See
+        :py:func:`huracanpy.encode_categories`
 
     Returns
     -------
@@ -105,7 +118,7 @@ def basin(lon, lat, convention="WMO-TC", crs=None):
         The basin series.
         You can append it to your tracks by running tracks["basin"] = get_basin(tracks)
     """
-    return _get_natural_earth_feature(
+    return _natural_earth_feature(
         lon,
         lat,
         feature="basin",
@@ -113,6 +126,7 @@ def basin(lon, lat, convention="WMO-TC", crs=None):
         name=convention,
         resolution=0,
         crs=crs,
+        categorical=categorical,
     )
 
 
@@ -137,6 +151,28 @@ def _cache_natural_earth_feature(feature, category, name, resolution):
     return df
 
 
+def _natural_earth_feature(
+    lon, lat, feature, category, name, resolution, crs=None, categorical=False
+):
+    # Get the feature at each point, optionally encoded using all the possible values
+    # of the feature as the categories
+    result = _get_natural_earth_feature(
+        lon,
+        lat,
+        feature=feature,
+        category=category,
+        name=name,
+        resolution=resolution,
+        crs=crs,
+    )
+
+    if categorical:
+        df = _cache_natural_earth_feature(feature, category, name, resolution)
+        labels = sorted(df[feature].dropna().astype(str).unique())
+        return encode_categories(result, categories=[*labels, ""])
+    return result
+
+
 @preprocess_and_wrap(wrap_like="lon")
 def _get_natural_earth_feature(
     lon,
@@ -262,7 +298,7 @@ def is_land(lon, lat, resolution="10m", crs=None):
     )
 
 
-def country(lon, lat, resolution="10m", crs=None):
+def country(lon, lat, resolution="10m", crs=None, categorical=False):
     """Detect the country each point is over
 
     Parameters
@@ -279,6 +315,10 @@ def country(lon, lat, resolution="10m", crs=None):
     crs : cartopy.crs.CRS, optional
         Coordinate reference system of the input data. If None, it is assumed to be
         Geodetic
+    categorical : bool, default=False
+        If True, return integer codes with all the country names (and "" for no
+        country) in the "categories" attribute. See
+        :py:func:`huracanpy.encode_categories`
 
     Returns
     -------
@@ -287,7 +327,7 @@ def country(lon, lat, resolution="10m", crs=None):
         Should return the same type of array as the input lon/lat, or a length 1
         :py:class:`numpy.ndarray` if lon/lat are floats
     """
-    return _get_natural_earth_feature(
+    return _natural_earth_feature(
         lon,
         lat,
         feature="NAME",
@@ -295,10 +335,11 @@ def country(lon, lat, resolution="10m", crs=None):
         name="admin_0_countries",
         resolution=resolution,
         crs=crs,
+        categorical=categorical,
     )
 
 
-def continent(lon, lat, resolution="10m", crs=None):
+def continent(lon, lat, resolution="10m", crs=None, categorical=False):
     """Detect the continent each point is over
 
     Parameters
@@ -315,6 +356,10 @@ def continent(lon, lat, resolution="10m", crs=None):
     crs : cartopy.crs.CRS, optional
         Coordinate reference system of the input data. If None, it is assumed to be
         Geodetic
+    categorical : bool, default=False
+        If True, return integer codes with all the continent names (and "" for no
+        continent) in the "categories" attribute. See
+        :py:func:`huracanpy.encode_categories`
 
     Returns
     -------
@@ -323,7 +368,7 @@ def continent(lon, lat, resolution="10m", crs=None):
         point. Should return the same type of array as the input lon/lat, or a length 1
         :py:class:`numpy.ndarray` if lon/lat are floats
     """
-    return _get_natural_earth_feature(
+    return _natural_earth_feature(
         lon,
         lat,
         feature="CONTINENT",
@@ -331,6 +376,7 @@ def continent(lon, lat, resolution="10m", crs=None):
         name="admin_0_countries",
         resolution=resolution,
         crs=crs,
+        categorical=categorical,
     )
 
 
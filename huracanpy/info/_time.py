@@ -9,6 +9,8 @@ import pandas as pd
 from metpy.xarray import preprocess_and_wrap
 from pint.errors import UnitStrippedWarning
 
+from .._categorical import encode_categories
+from .._track_index import track_index
 from ._geography import hemisphere
 
 
@@ -33,8 +35,7 @@ def timestep(time, track_id=None):
 
     if track_id is not None:
         # Ignore where the track_id changes
-        track_id = np.asarray(track_id)
-        step = step[track_id[1:] == track_id[:-1]]
+        step = np.delete(step, track_index(track_id).transitions)
 
     steps, counts = np.unique(step, return_counts=True)
 
@@ -72,8 +73,7 @@ def time_components(time, components=("year", "month", "day", "hour")):
     return [getattr(time.dt, component) for component in components]
 
 
-@preprocess_and_wrap(wrap_like="track_id")
-def season(track_id, lat, time, convention="tc-short"):
+def season(track_id, lat, time, convention="tc-short", categorical=False):
     """Determine the cyclone season for each track
 
     Parameters
@@ -93,6 +93,9 @@ def season(track_id, lat, time, convention="tc-short"):
         * 'tc-long' : In the Northern hemisphere, the season is the same as calendar
           year. In the southern hemisphere, the season from July n-1 to June n is named
           "(n-1)n"
+    categorical : bool, default=False
+        If True, return integer codes with the seasons in the "categories" attribute.
+        See :py:func:`huracanpy.encode_categories`
 
     Raises
     ------
@@ -105,7 +108,17 @@ def season(track_id, lat, time, convention="tc-short"):
         The season series. You can append it to your tracks by running
         tracks["season"] = get_season(tracks.track_id, tracks.lat, tracks.time)
     """
+    result = _season(track_id, lat, time, convention)
+    if categorical:
+        # "tc-short" seasons are years, but stored as floats
+        if np.issubdtype(result.dtype, np.floating):
+            result = result.astype(int)
+        return encode_categories(result)
+    return result
+
 
+@preprocess_and_wrap(wrap_like="track_id")
+def _season(track_id, lat, time, convention):
     # Derive values
     hemi = hemisphere(lat)
 
@@ -124,47 +137,36 @@ def season(track_id, lat, time, convention="tc-short"):
         year = np.asarray([t.year for t in time])
         month = np.asarray([t.month for t in time])
 
-    # Store in a dataframe
-    with warnings.catch_warnings():
-        warnings.filterwarnings(
-            "ignore",
-            category=UnitStrippedWarning,
-            message="The unit of the quantity is stripped",
-        )
-        df = pd.DataFrame(
-            {"hemi": hemi, "year": year, "month": month, "track_id": track_id}
-        )
     # Most frequent year, month and hemisphere for each track
     # Grouping is done to avoid labelling differently points in a track that might cross
     # hemisphere or seasons.
-    group = df.groupby("track_id")[["year", "month", "hemi"]].agg(
-        lambda x: pd.Series.mode(x)[0]
-    )
+    # The year is kept as a pandas Series so the "tc-long" seasons are concatenated as
+    # strings
+    index = track_index(track_id)
+    year = pd.Series(index.reduce(np.asarray(year), "mode"))
+    month = index.reduce(np.asarray(month), "mode")
+    hemi = index.reduce(np.asarray(hemi), "mode")
 
     # Assign season
     if convention == "tc-short":
-        season = np.where(group.hemi == "N", group.year, np.nan)
-        season = np.where(
-            (group.hemi == "S") & (group.month >= 7), group.year + 1, season
-        )
-        season = np.where((group.hemi == "S") & (group.month <= 6), group.year, season)
+        season = np.where(hemi == "N", year, np.nan)
+        season = np.where((hemi == "S") & (month >= 7), year + 1, season)
+        season = np.where((hemi == "S") & (month <= 6), year, season)
     elif convention == "tc-long":
-        season = np.where(group.hemi == "N", group.year.astype(str), np.nan)
+        season = np.where(hemi == "N", year.astype(str), np.nan)
         season = np.where(
-            (group.hemi == "S") & (group.month >= 7),
-            group.year.astype(str) + (group.year + 1).astype(str),
+            (hemi == "S") & (month >= 7),
+            year.astype(str) + (year + 1).astype(str),
             season,
         )
         season = np.where(
-            (group.hemi == "S") & (group.month <= 6),
-            (group.year - 1).astype(str) + group.year.astype(str),
+            (hemi == "S") & (month <= 6),
+            (year - 1).astype(str) + year.astype(str),
             season,
         )
     else:
         msg = "Convention not recognized"
         raise NotImplementedError(msg)
 
-    group["season"] = season
-    df = df.merge(group[["season"]], on="track_id")
-
-    return df.season.to_numpy()
+    # Expand back to each point
+    return index.expand(season)
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from cartopy.mpl.geoaxes import GeoAxes
 
+from .._categorical import categories, decode_categories, is_categorical
 from .._util import combine_kws
 
 _subplot_kws_default = dict(projection=ccrs.PlateCarree(180))
@@ -32,7 +33,8 @@ def tracks(
     lat : array_like
         Latitude points
     intensity_var : array_like, optional
-        Colour the individual points by
+        Colour the individual points by. Variables encoded with
+        :py:func:`huracanpy.encode_categories` are shown with their labels
     ax :  matplotlib.axes.Axes, optional
         The axes to draw the figure on. A new figure is created if ax is None
     subplot_kws : dict, optional
@@ -63,6 +65,12 @@ def tracks(
             scatter_kws["transform"] = ccrs.PlateCarree()
         ax.coastlines()
 
+    # Label the legend with the categories, in the order of the codes
+    if is_categorical(intensity_var):
+        if "hue_order" not in scatter_kws:
+            scatter_kws["hue_order"] = list(categories(intensity_var))
+        intensity_var = decode_categories(intensity_var)
+
     sns.scatterplot(
         x=lon,
         y=lat,
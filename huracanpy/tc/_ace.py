@@ -8,6 +8,7 @@ from numpy.polynomial.polynomial import Polynomial
 from sklearn.base import BaseEstimator
 
 from .._metpy import dequantify_results, validate_units
+from ..calc._track_stats import _reduce
 
 
 def ace(
@@ -69,7 +70,7 @@ def ace(
     ace_values = _ace(wind, threshold, wind_units)
 
     if sum_by is not None:
-        ace_values = ace_values.groupby(sum_by).sum()
+        ace_values = _reduce(ace_values, sum_by, "sum")
 
     return ace_values
 
@@ -172,7 +173,7 @@ def pace(
     )
 
     if sum_by is not None:
-        pace_values = pace_values.groupby(sum_by).sum()
+        pace_values = _reduce(pace_values, sum_by, "sum")
 
     return pace_values, model
 
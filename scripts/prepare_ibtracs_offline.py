@@ -40,6 +40,7 @@ def prepare_offline(wmo=True, jtwc=True):
 
         ## Save WMO file
         huracanpy.save(ib_wmo, ibtracs.wmo_file)
+        ibtracs.write_bundle(ibtracs.wmo_file, ibtracs.wmo_bundle)
 
     if jtwc:
         # - jtwc subset
@@ -86,6 +87,7 @@ def prepare_offline(wmo=True, jtwc=True):
 
         ## Save
         huracanpy.save(ib_usa, ibtracs.jtwc_file)
+        ibtracs.write_bundle(ibtracs.jtwc_file, ibtracs.jtwc_bundle)
 
     warnings.warn(
         "If you just updated the offline files within the package, do not forget to"
@@ -1,5 +1,7 @@
 import datetime
+import threading
 from collections import namedtuple
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
 import cftime
 import numpy as np
@@ -18,6 +20,39 @@ def pytest_addoption(parser):
     )
 
 
+@pytest.fixture
+def http_server(tmp_path):
+    # Local stand-in for a remote server, serving the files in tmp_path / "server".
+    # The first request for each file fails, to check that downloads are retried
+    directory = tmp_path / "server"
+    directory.mkdir()
+    requests = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(directory), **kwargs)
+
+        def do_GET(self):
+            requests.append(self.path)
+            if requests.count(self.path) == 1:
+                self.send_error(503)
+            else:
+                super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    Server = namedtuple("Server", ["url", "directory", "requests"])
+    yield Server(f"http://127.0.0.1:{server.server_port}/", directory, requests)
+
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def tracks_csv():
     return huracanpy.load(huracanpy.example_csv_file)
@@ -24,9 +24,16 @@ def test_accel_sel_id(tracks, request):
     xr.testing.assert_identical(result, expected)
 
 
-def test_accel_trackswhere():
-    # TODO accelerate trackswhere
-    pass
+def test_accel_trackswhere(tracks_csv):
+    result = huracanpy.trackswhere(
+        tracks_csv, tracks_csv.track_id, reductions=dict(lat="max"), op=">", value=-30
+    )
+
+    expected = huracanpy.trackswhere(
+        tracks_csv, tracks_csv.track_id, lambda track: track.lat.max() > -30
+    )
+
+    xr.testing.assert_identical(result, expected)
 
 
 @pytest.mark.parametrize(
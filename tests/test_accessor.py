@@ -18,6 +18,7 @@ _intentionally_missing = [
     "add_gen_vals",
     "add_density",
     "add_track_duration",
+    "add_track_reduce",
     "add_timestep",
     "add_pressure_wind_relation",
     # plot_ functions that are for multiple datasets
@@ -65,6 +66,11 @@ def test_nunique():
         (huracanpy.info.time_components, ["time"], {}),
         (huracanpy.calc.density, ["lon", "lat"], {}),
         (huracanpy.calc.track_duration, ["time", "track_id"], {}),
+        (
+            huracanpy.calc.track_reduce,
+            ["all", {"wind10": ["max", "argmax"]}, "track_id"],
+            {"reductions": {"wind10": ["max", "argmax"]}},
+        ),
         (huracanpy.calc.gen_vals, ["all", "time", "track_id"], {}),
         (
             huracanpy.calc.apex_vals,
@@ -306,6 +312,25 @@ def test_accessor_trackswhere(tracks_csv):
 
     xr.testing.assert_identical(result, expected)
 
+    result = tracks_csv.hrcn.trackswhere(reductions=dict(lat="max"), op=">", value=-30)
+    expected = huracanpy.trackswhere(
+        tracks_csv, tracks_csv.track_id, reductions=dict(lat="max"), op=">", value=-30
+    )
+
+    xr.testing.assert_identical(result, expected)
+
+
+def test_accessor_categories(tracks_csv):
+    hemisphere = huracanpy.info.hemisphere(tracks_csv.lat)
+    tracks_csv["hemisphere"] = hemisphere
+    result = tracks_csv.hrcn.encode_categories("hemisphere")
+    xr.testing.assert_identical(
+        result.hemisphere, huracanpy.encode_categories(hemisphere).rename("hemisphere")
+    )
+
+    result = result.hrcn.decode_categories("hemisphere")
+    np.testing.assert_array_equal(result.hemisphere, hemisphere)
+
 
 def test_accessor_namespace_matches():
     # Functions at the top level have the same name as in the module
@@ -1,4 +1,6 @@
+import numpy as np
 import pytest
+import xarray as xr
 
 import huracanpy
 
@@ -11,6 +13,106 @@ def test_duration():
     assert d.mean() == 210
 
 
+@pytest.mark.parametrize(
+    "stat", ["min", "max", "sum", "mean", "count", "first", "last", "argmax", "mode"]
+)
+def test_track_reduce(tracks_csv, stat):
+    result = huracanpy.calc.track_reduce(
+        tracks_csv, {"wind10": stat, "time": ["first", "last"]}, tracks_csv.track_id
+    )
+
+    assert list(result) == [f"wind10_{stat}", "time_first", "time_last"]
+    np.testing.assert_array_equal(result.track_id, [0, 1, 2])
+    for track_id, track in tracks_csv.groupby("track_id"):
+        stats = result.sel(track_id=track_id)
+        assert stats.time_first == track.time[0]
+        assert stats.time_last == track.time[-1]
+
+        if stat == "argmax":
+            expected = (
+                track.wind10.argmax()
+                + np.flatnonzero(tracks_csv.track_id == track_id)[0]
+            )
+        elif stat == "first":
+            expected = track.wind10[0]
+        elif stat == "last":
+            expected = track.wind10[-1]
+        elif stat == "mode":
+            expected = track.wind10.to_pandas().mode()[0]
+        else:
+            expected = getattr(track.wind10, stat)()
+        np.testing.assert_allclose(stats[f"wind10_{stat}"], expected)
+
+
+def test_track_reduce_matches_groupby(tracks_csv):
+    result = huracanpy.calc.track_reduce(
+        tracks_csv, {"wind10": "max", "slp": "min"}, tracks_csv.track_id
+    )
+    expected = tracks_csv[["wind10", "slp"]].groupby(tracks_csv.track_id)
+
+    xr.testing.assert_identical(
+        result.wind10_max, expected.max().wind10.rename("wind10_max")
+    )
+    xr.testing.assert_identical(result.slp_min, expected.min().slp.rename("slp_min"))
+
+
+def test_track_reduce_ragged():
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    tracks_ragged = huracanpy.load(
+        huracanpy.example_ERA20C_file, netcdf_stretch_track_id=False
+    )
+    reductions = dict(psl=["min", "argmin"], time=["first", "last"])
+
+    xr.testing.assert_identical(
+        tracks_ragged.hrcn.get_track_reduce(reductions),
+        tracks.hrcn.get_track_reduce(reductions),
+    )
+
+
+def test_track_reduce_non_float(tracks_csv):
+    tracks = tracks_csv.assign(
+        basin=huracanpy.info.basin(tracks_csv.lon, tracks_csv.lat).astype(str),
+        strong=tracks_csv.wind10 > 20,
+    )
+    result = huracanpy.calc.track_reduce(
+        tracks,
+        dict(
+            time=["mean", "min", "max"],
+            basin=["min", "max", "mode", "argmax"],
+            strong=["sum", "mean", "any"],
+            i=["sum", "mean"],
+        ),
+        tracks.track_id,
+    )
+
+    for track_id, track in tracks.groupby("track_id"):
+        stats = result.sel(track_id=track_id)
+        assert stats.time_mean == track.time.mean()
+        assert stats.time_min == track.time.min()
+        assert stats.time_max == track.time.max()
+        assert stats.basin_min == min(track.basin.values)
+        assert stats.basin_max == max(track.basin.values)
+        assert stats.basin_mode == track.basin.to_pandas().mode()[0]
+        assert tracks.basin[int(stats.basin_argmax)] == stats.basin_max
+        assert stats.strong_sum == track.strong.sum()
+        np.testing.assert_allclose(stats.strong_mean, track.strong.mean())
+        assert stats.strong_any == track.strong.any()
+        assert stats.i_sum == track.i.sum()
+        np.testing.assert_allclose(stats.i_mean, track.i.mean())
+
+
+@pytest.mark.parametrize(
+    ("varname", "stat"),
+    [("time", "sum"), ("time", "any"), ("basin", "mean"), ("basin", "sum")],
+)
+def test_track_reduce_unsupported(tracks_csv, varname, stat):
+    tracks = tracks_csv.assign(
+        basin=huracanpy.info.basin(tracks_csv.lon, tracks_csv.lat).astype(str)
+    )
+    with pytest.raises(ValueError, match=f"Can't calculate the {stat} of"):
+        huracanpy.calc.track_reduce(tracks, {varname: stat}, tracks.track_id)
+
+
 def test_gen_vals():
     data = huracanpy.load(huracanpy.example_csv_file, source="csv")
     g = huracanpy.calc.gen_vals(data, data.time, data.track_id)
@@ -30,3 +132,10 @@ def test_apex_vals_fails(tracks_csv):
         huracanpy.calc.apex_vals(
             tracks_csv, tracks_csv.wind10, tracks_csv.track_id, "nonsense"
         )
+
+
+def test_track_reduce_fails(tracks_csv):
+    with pytest.raises(ValueError, match="median is not a valid reduction"):
+        huracanpy.calc.track_reduce(
+            tracks_csv, {"wind10": "median"}, tracks_csv.track_id
+        )
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import huracanpy
+
+
+def test_encode_categories(tracks_csv):
+    basin = huracanpy.info.basin(tracks_csv.lon, tracks_csv.lat)
+    result = huracanpy.encode_categories(basin)
+
+    assert result.dtype == np.int8
+    assert result.attrs["categories"] == sorted(np.unique(basin))
+    np.testing.assert_array_equal(huracanpy.decode_categories(result), basin)
+
+
+def test_encode_categories_given(tracks_csv):
+    hemisphere = huracanpy.info.hemisphere(tracks_csv.lat)
+    result = huracanpy.encode_categories(hemisphere, categories=["N"])
+
+    # Values not in the categories are missing
+    assert (result == -1).all()
+    assert (huracanpy.decode_categories(result) == "nan").all()
+
+    # Change the categories of an encoded variable
+    result = huracanpy.encode_categories(result, categories=["nan", "N"])
+    assert (result == 0).all()
+
+
+def test_decode_categories_fails(tracks_csv):
+    with pytest.raises(ValueError, match="does not have a categories attribute"):
+        huracanpy.decode_categories(tracks_csv.track_id)
+
+
+def test_categories_concat(tracks_csv):
+    tracks = tracks_csv.assign(
+        hemisphere=huracanpy.info.hemisphere(tracks_csv.lat, categorical=True)
+    )
+    tracks_north = tracks.assign(
+        hemisphere=huracanpy.encode_categories(
+            huracanpy.decode_categories(tracks.hemisphere).str.replace("S", "N")
+        )
+    )
+    result = huracanpy.concat_tracks([tracks, tracks_north])
+
+    assert result.hemisphere.attrs["categories"] == ["N", "S"]
+    np.testing.assert_array_equal(
+        huracanpy.decode_categories(result.hemisphere),
+        ["S"] * len(tracks.record) + ["N"] * len(tracks.record),
+    )
+
+
+def test_categories_groupby(tracks_csv):
+    tracks_csv["season"] = huracanpy.info.season(
+        tracks_csv.track_id, tracks_csv.lat, tracks_csv.time, categorical=True
+    )
+    assert tracks_csv.season.attrs["categories"] == ["1980"]
+    assert len(tracks_csv.groupby("season")) == 1
+
+    subset = huracanpy.trackswhere(
+        tracks_csv, tracks_csv.track_id, lambda track: (track.season == 0).all()
+    )
+    assert len(subset.record) == len(tracks_csv.record)
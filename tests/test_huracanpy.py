@@ -1,7 +1,16 @@
+import gzip
+import os
+import pathlib
+import shutil
 from importlib.metadata import version
 
+import cftime
 import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
+import xarray as xr
 
 import huracanpy
 
@@ -166,12 +175,19 @@ def _fake_ibtracs_data(_, __):
     return huracanpy.example_csv_file, None
 
 
-def test_load_ibtracs_online(monkeypatch):
+@pytest.mark.parametrize("cache", [True, False])
+def test_load_ibtracs_online(cache, monkeypatch, tmp_path):
     with monkeypatch.context() as m:
         from huracanpy._data import ibtracs
 
         m.setattr(ibtracs, "urlretrieve", _fake_ibtracs_data)
-        tracks = huracanpy.load(source="ibtracs", ibtracs_subset="last3years")
+        m.setattr(
+            ibtracs, "online_url", pathlib.Path(huracanpy.example_csv_file).as_uri()
+        )
+        m.setenv("HURACANPY_CACHE_DIR", str(tmp_path))
+        tracks = huracanpy.load(
+            source="ibtracs", ibtracs_subset="last3years", cache=cache
+        )
 
     assert len(tracks) == 9
     assert len(tracks.coords) == 0
@@ -185,6 +201,262 @@ def test_load_ibtracs_online(monkeypatch):
         assert name in tracks
 
 
+def test_load_ibtracs_online_cache(monkeypatch, tmp_path):
+    from huracanpy._data import ibtracs
+
+    source = tmp_path / "ibtracs.csv"
+    shutil.copy(huracanpy.example_csv_file, source)
+    monkeypatch.setattr(ibtracs, "online_url", source.as_uri())
+    monkeypatch.setenv("HURACANPY_CACHE_DIR", str(tmp_path / "cache"))
+
+    cached = tmp_path / "cache" / "ibtracs" / "ibtracs.csv"
+    expected = huracanpy.load(source="ibtracs", ibtracs_subset="ALL")
+    assert cached.exists()
+    assert cached.with_name("ibtracs.csv.json").exists()
+    assert cached.with_name("ibtracs.csv.parquet").exists()
+
+    # Unchanged file loads from the parsed copy, without downloading or parsing again
+    modified = [f.stat().st_mtime_ns for f in cached.parent.iterdir()]
+    _assert_dataset_identical(
+        expected, huracanpy.load(source="ibtracs", ibtracs_subset="ALL")
+    )
+    assert modified == [f.stat().st_mtime_ns for f in cached.parent.iterdir()]
+
+    # Changed files are downloaded again
+    tracks = huracanpy.load(huracanpy.example_csv_file)
+    huracanpy.save(huracanpy.sel_id(tracks, tracks.track_id, 0), str(source))
+    os.utime(source, (0, 0))
+    tracks = huracanpy.load(source="ibtracs", ibtracs_subset="ALL")
+    assert len(tracks.groupby("track_id")) == 1
+
+    # Offline only uses the cache
+    source.unlink()
+    tracks = huracanpy.load(source="ibtracs", ibtracs_subset="ALL", cache="offline")
+    assert len(tracks.groupby("track_id")) == 1
+
+    monkeypatch.setenv("HURACANPY_CACHE_DIR", str(tmp_path / "empty"))
+    with pytest.raises(FileNotFoundError, match="is not in the cache"):
+        huracanpy.load(source="ibtracs", ibtracs_subset="ALL", cache="offline")
+
+
+def _fake_superbt(directory, years):
+    # SuperBT files have 33 columns and a trailing comma, and a separate file
+    # describing the variables
+    tracks = pd.read_csv(huracanpy.example_csv_file)
+    tracks.columns = tracks.columns.str.strip()
+    for n in range(33 - len(tracks.columns)):
+        tracks[f"x{n}"] = n
+    tracks[""] = np.nan
+    for year in years:
+        tracks.assign(year=year).to_csv(
+            directory / f"all-md3-{year}-MRG.csv", index=False
+        )
+
+    (directory / "h-meta-md3-vars.csv").write_text(
+        "lon,\"'longitude [degE]'\"\nslp,\"'sea level pressure [Pa]'\"\n"
+    )
+
+
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_load_superbt(n_workers, http_server, monkeypatch, tmp_path):
+    from huracanpy._data import _remote, superbt
+
+    years = list(range(2007, 2013))
+    _fake_superbt(http_server.directory, years)
+    monkeypatch.setattr(superbt, "path", http_server.url)
+    monkeypatch.setattr(superbt, "years", years)
+    monkeypatch.setattr(_remote, "retry_wait", 0)
+    monkeypatch.setenv("HURACANPY_CACHE_DIR", str(tmp_path / "cache"))
+
+    tracks = huracanpy.load(source="superbt", n_workers=n_workers)
+    assert len(tracks.time) == len(years) * 99
+    np.testing.assert_array_equal(np.unique(tracks.time.dt.year), years)
+    assert tracks.lon.attrs["units"] == "degrees_east"
+    assert tracks.slp.attrs["description"] == "sea level pressure"
+
+    # Each file failed once and was retried
+    assert len(http_server.requests) == 2 * (len(years) + 1)
+
+    # Unchanged files are not downloaded again
+    cached = tmp_path / "cache" / "superbt"
+    modified = {f: f.stat().st_mtime_ns for f in cached.iterdir()}
+    _assert_dataset_identical(tracks, huracanpy.load(source="superbt"))
+    assert modified == {f: f.stat().st_mtime_ns for f in cached.iterdir()}
+
+    _assert_dataset_identical(tracks, huracanpy.load(source="superbt", cache="offline"))
+
+
+def test_load_ibtracs_online_basins(http_server, monkeypatch, tmp_path):
+    from huracanpy._data import _remote, ibtracs
+
+    tracks = huracanpy.load(huracanpy.example_csv_file)
+    df = pd.DataFrame(
+        dict(
+            SID=[f"S{n}" for n in tracks.track_id.values],
+            SEASON=tracks.time.dt.year,
+            BASIN="NA",
+            SUBBASIN="MM",
+            ISO_TIME=tracks.time.dt.strftime("%Y-%m-%d %H:%M:%S"),
+            LAT=tracks.lat,
+            LON=tracks.lon,
+        )
+    )
+    # The second line of IBTrACS files is the units
+    units = pd.DataFrame([[""] * len(df.columns)], columns=df.columns)
+    for basin, track_ids in [("NA", [0, 1]), ("EP", [1, 2])]:
+        pd.concat([units, df[tracks.track_id.isin(track_ids).values]]).to_csv(
+            http_server.directory / f"ibtracs.{basin}.list.v04r01.csv", index=False
+        )
+
+    monkeypatch.setattr(
+        ibtracs, "online_url", http_server.url + "ibtracs.{subset}.list.v04r01.csv"
+    )
+    monkeypatch.setattr(_remote, "retry_wait", 0)
+    monkeypatch.setenv("HURACANPY_CACHE_DIR", str(tmp_path / "cache"))
+
+    result = huracanpy.load(source="ibtracs", ibtracs_subset=["NA", "EP"])
+
+    # The track in both basins is only included once
+    assert len(result.time) == len(tracks.time)
+    np.testing.assert_array_equal(np.unique(result.track_id), ["S0", "S1", "S2"])
+    np.testing.assert_allclose(result.lat, tracks.lat)
+
+
+def test_load_ibtracs_offline_bundle(monkeypatch, tmp_path):
+    from huracanpy._data import ibtracs
+
+    tracks = huracanpy.load(huracanpy.example_csv_file)
+    pd.DataFrame(
+        dict(
+            sid=[f"S{n}" for n in tracks.track_id.values],
+            season=tracks.time.dt.year,
+            basin="SI",
+            time=tracks.time.dt.strftime("%Y-%m-%d %H:%M:%S"),
+            lon=tracks.lon,
+            lat=tracks.lat,
+        )
+    ).to_csv(tmp_path / "jtwc.csv", index=False)
+
+    monkeypatch.setattr(ibtracs, "jtwc_file", str(tmp_path / "jtwc.csv"))
+    monkeypatch.setattr(ibtracs, "jtwc_bundle", tmp_path / "jtwc")
+    from_csv = _load_with_checked_warnings(
+        None, source="ibtracs", ibtracs_subset="jtwc"
+    )
+
+    ibtracs.write_bundle(ibtracs.jtwc_file, ibtracs.jtwc_bundle)
+    from_bundle = _load_with_checked_warnings(
+        None, source="ibtracs", ibtracs_subset="jtwc"
+    )
+
+    _assert_dataset_identical(from_csv, from_bundle)
+    with pytest.warns(UserWarning, match="This offline function loads a light"):
+        assert isinstance(ibtracs.offline("jtwc").lon.data, np.memmap)
+
+
+def test_load_old_hurdat_directory(tmp_path):
+    filenames = [str(tmp_path / f"{n}_atl") for n in range(3)]
+    for filename in filenames:
+        shutil.copy(huracanpy.example_old_HURDAT_file, filename)
+
+    tracks = huracanpy.load(str(tmp_path), source="ecmwf")
+
+    _assert_dataset_identical(tracks, huracanpy.load(filenames, source="ecmwf"))
+    assert len(np.unique(tracks.track_id)) == 3 * 29
+
+
+def test_load_old_hurdat_point_before_header(tmp_path):
+    with open(huracanpy.example_old_HURDAT_file) as f:
+        lines = f.readlines()
+    filename = str(tmp_path / "tracks_atl")
+    with open(filename, "w") as f:
+        f.writelines([lines[1], *lines])
+
+    with pytest.raises(ValueError, match="before the first track header"):
+        huracanpy.load(filename, source="ecmwf")
+
+
+def test_load_tilts_nans(tmp_path):
+    with open(huracanpy.example_TRACK_tilt_file) as f:
+        lines = f.readlines()
+    values = lines[3].split()
+    lines[3] = " ".join([*values[:2], "1.000000e+25", *values[3:]]) + "\n"
+    (tmp_path / "tilts.dat").write_text("".join(lines))
+
+    tracks = huracanpy.load(huracanpy.example_TRACK_tilt_file, source="TRACK.tilt")
+    tracks_nan = huracanpy.load(str(tmp_path / "tilts.dat"), source="TRACK.tilt")
+
+    expected = np.isnan(tracks.tilt.values)
+    expected[0, 1] = True
+    np.testing.assert_array_equal(np.isnan(tracks_nan.tilt.values), expected)
+
+
+def test_load_witrack_exponent(tmp_path):
+    # Values written with an uppercase exponent must not be confused with the "Event:"
+    # header lines
+    with open(huracanpy.example_WiTRACK_file) as f:
+        lines = f.readlines()
+    values = lines[3].split()
+    lines[3] = " ".join([*values[:-1], "1.53E-03"]) + "\n"
+    (tmp_path / "witrack.dat").write_text("".join(lines))
+
+    tracks = huracanpy.load(huracanpy.example_WiTRACK_file, source="witrack")
+    tracks_exp = huracanpy.load(str(tmp_path / "witrack.dat"), source="witrack")
+
+    xr.testing.assert_identical(tracks, tracks_exp)
+
+
+def test_load_tempestextremes_unstructured(tmp_path):
+    # Unstructured grids have a single grid index instead of i, j
+    with open(huracanpy.example_TE_file) as f:
+        lines = [
+            line
+            if line.startswith("start")
+            else "\t".join(line.split("\t")[:2] + line.split("\t")[3:])
+            for line in f
+        ]
+    (tmp_path / "unstructured.txt").write_text("".join(lines))
+
+    tracks = huracanpy.load(huracanpy.example_TE_file, source="tempestextremes")
+    tracks_unstructured = huracanpy.load(
+        str(tmp_path / "unstructured.txt"),
+        source="tempestextremes",
+        tempest_extremes_unstructured=True,
+    )
+
+    assert "j" not in tracks_unstructured
+    _assert_dataset_identical(tracks.drop_vars("j"), tracks_unstructured)
+
+
+def test_load_tempestextremes_empty_first_track(tmp_path):
+    # The fields are counted on the first point, not the header of the next track
+    with open(huracanpy.example_TE_file) as f:
+        text = "start\t0\t1999\t9\t1\t0\n" + f.read()
+    (tmp_path / "empty_first.txt").write_text(text)
+
+    tracks = huracanpy.load(huracanpy.example_TE_file, source="tempestextremes")
+    tracks_empty_first = huracanpy.load(
+        str(tmp_path / "empty_first.txt"), source="tempestextremes"
+    )
+
+    # The empty track still counts towards the track IDs
+    _assert_dataset_identical(
+        tracks.assign(track_id=tracks.track_id + 1), tracks_empty_first
+    )
+
+
+def test_load_iris_timestep():
+    tracks = huracanpy.load(huracanpy.example_IRIS_file, source="iris")
+    tracks_6h = huracanpy.load(
+        huracanpy.example_IRIS_file, source="iris", iris_timestep=6
+    )
+
+    # Times are counted in timesteps from the first time of each month
+    start = tracks.time.values.astype("datetime64[M]")
+    np.testing.assert_array_equal(
+        tracks_6h.time - start, 2 * (tracks.time - start).values
+    )
+
+
 @pytest.mark.parametrize(
     ("filename", "kwargs", "error", "message"),
     [
@@ -218,6 +490,85 @@ def test_load_units():
     np.testing.assert_allclose(tracks.slp.values, slp_hpa.data.magnitude * 100)
 
 
+@pytest.mark.parametrize(
+    "time",
+    [
+        np.array([2020010100, 2020022918, 1850123006]),
+        np.array(["2020010100", "2020022918", "1850123006"]),
+        np.array(["2020010100", "2020022918", "1850123006"], dtype=object),
+    ],
+)
+@pytest.mark.parametrize("calendar", [None, "360_day"])
+def test_parse_dates(time, calendar):
+    from huracanpy._data._load import _parse_dates
+
+    tracks = _parse_dates(xr.Dataset(dict(time=("record", time))), calendar=calendar)
+
+    expected = [(2020, 1, 1, 0), (2020, 2, 29, 18), (1850, 12, 30, 6)]
+    if calendar is None:
+        expected = [
+            np.datetime64(f"{y}-{m:02d}-{d:02d}T{h:02d}") for y, m, d, h in expected
+        ]
+    else:
+        expected = [cftime.datetime(*t, calendar=calendar) for t in expected]
+    np.testing.assert_array_equal(tracks.time.values, expected)
+
+
+@pytest.mark.parametrize(
+    "time",
+    [
+        [2020010100, 1979023000],
+        [2020010100, 2020010124],
+        [2020010100, 2020130100],
+        ["2020010100", "2019022900"],
+    ],
+)
+@pytest.mark.parametrize("calendar", [None, "noleap"])
+def test_parse_dates_invalid(time, calendar):
+    from huracanpy._data._load import _parse_dates
+
+    with pytest.raises(ValueError, match="Day out of range"):
+        _parse_dates(xr.Dataset(dict(time=("record", time))), calendar=calendar)
+
+
+@pytest.mark.parametrize("calendar", ["360_day", "noleap", "standard"])
+def test_parse_dates_iso_cftime(calendar):
+    from huracanpy._data._load import _parse_dates
+
+    time = ["2020-01-01 00:00", "2020-02-28T18:30:15", "1850-12-30", "2020-01-01 00:00"]
+    tracks = _parse_dates(xr.Dataset(dict(time=("record", time))), calendar=calendar)
+
+    expected = [
+        cftime.datetime(2020, 1, 1, calendar=calendar),
+        cftime.datetime(2020, 2, 28, 18, 30, 15, calendar=calendar),
+        cftime.datetime(1850, 12, 30, calendar=calendar),
+        cftime.datetime(2020, 1, 1, calendar=calendar),
+    ]
+    np.testing.assert_array_equal(tracks.time.values, expected)
+
+    with pytest.raises(ValueError, match="Day out of range"):
+        _parse_dates(
+            xr.Dataset(dict(time=("record", ["2020-02-31 00:00"]))), calendar=calendar
+        )
+
+
+def test_load_strings(tmp_path):
+    filename = str(tmp_path / "tracks.csv")
+    with open(filename, "w") as f:
+        f.write("track_id,time,lon,lat,basin,name\n")
+        f.write("0,2000-01-01,300,20,NA,ALPHA\n")
+        f.write("0,2000-01-02,301,21,NA,\n")
+        f.write("1,2000-01-01,200,20,EP,BETA\n")
+
+    tracks = huracanpy.load(filename)
+
+    # Strings are loaded as fixed-width numpy strings, and "NA" is not a missing value
+    assert np.issubdtype(tracks.basin.dtype, np.str_)
+    assert np.issubdtype(tracks.name.dtype, np.str_)
+    np.testing.assert_array_equal(tracks.basin, ["NA", "NA", "EP"])
+    np.testing.assert_array_equal(tracks.name, ["ALPHA", "nan", "BETA"])
+
+
 def test_load_baselon():
     tracks = huracanpy.load(huracanpy.example_csv_file, baselon=1000)
 
@@ -225,6 +576,217 @@ def test_load_baselon():
     assert tracks.lon.min() >= 1000
 
 
+@pytest.mark.parametrize(
+    ("filename", "kwargs"),
+    [
+        (huracanpy.example_TRACK_file, dict(source="TRACK")),
+        (huracanpy.example_csv_file, dict()),
+        (huracanpy.example_parquet_file, dict()),
+        (huracanpy.example_TE_file, dict(source="tempestextremes")),
+        (huracanpy.example_CHAZ_file, dict()),
+        (huracanpy.example_MIT_file, dict()),
+        (huracanpy.example_ERA20C_file, dict()),
+        (huracanpy.example_WiTRACK_file, dict(source="witrack")),
+    ],
+)
+@pytest.mark.parametrize("keep_whole_tracks", [False, True])
+def test_load_filters(filename, kwargs, keep_whole_tracks):
+    tracks = huracanpy.load(filename, **kwargs)
+    track_ids = np.unique(tracks.track_id)[1:3]
+    time_range = (tracks.time.values[len(tracks.time) // 3], None)
+    bbox = (-100, float(tracks.lat.median()), 350, 90)
+
+    tracks_subset = huracanpy.load(
+        filename,
+        **kwargs,
+        time_range=time_range,
+        bbox=bbox,
+        variables=["lat", "time"],
+        keep_whole_tracks=keep_whole_tracks,
+    )
+
+    in_box = (tracks.time >= time_range[0]) & (tracks.lat >= bbox[1])
+    in_box = in_box & ((tracks.lon - bbox[0]) % 360 <= bbox[2] - bbox[0])
+    if keep_whole_tracks:
+        in_box = tracks.track_id.isin(tracks.track_id[in_box])
+    assert "lon" not in tracks_subset
+    tracks = tracks.drop_vars(
+        [var for var in tracks.data_vars if var not in ["track_id", "lat", "time"]]
+    )
+    _assert_dataset_identical(tracks_subset, tracks.isel(record=in_box.values))
+
+    tracks = huracanpy.load(filename, **kwargs)
+    tracks_subset = huracanpy.load(filename, **kwargs, track_ids=track_ids)
+    _assert_dataset_identical(
+        tracks_subset, huracanpy.sel_id(tracks, tracks.track_id, track_ids)
+    )
+
+
+@pytest.mark.parametrize(
+    ("filename", "kwargs", "variables"),
+    [
+        (huracanpy.example_TRACK_file, dict(source="TRACK"), ["feature_9", "lat"]),
+        (huracanpy.example_TE_file, dict(source="tempestextremes"), ["feature_1"]),
+        (huracanpy.example_WiTRACK_file, dict(source="witrack"), ["ssian", "lat"]),
+        (huracanpy.example_IRIS_file, dict(source="iris"), ["vmax", "lat"]),
+    ],
+)
+def test_load_variables(filename, kwargs, variables):
+    tracks = huracanpy.load(filename, **kwargs)
+    tracks_subset = huracanpy.load(filename, **kwargs, variables=variables)
+
+    assert set(tracks_subset.data_vars) == {"track_id", *variables}
+    _assert_dataset_identical(tracks_subset, tracks[["track_id", *variables]])
+
+
+@pytest.mark.parametrize(
+    "filename", [huracanpy.example_csv_file, huracanpy.example_parquet_file]
+)
+def test_load_variables_split_time(filename):
+    # The year, month, day, and hour columns are needed to make the time
+    tracks = huracanpy.load(filename)
+    tracks_subset = huracanpy.load(filename, variables=["lon"])
+
+    assert set(tracks_subset.data_vars) == {"track_id", "lon"}
+    _assert_dataset_identical(tracks_subset, tracks[["track_id", "lon"]])
+
+
+@pytest.mark.parametrize("keep_whole_tracks", [False, True])
+def test_load_filters_parquet_row_groups(keep_whole_tracks, tmp_path):
+    # Row groups that don't line up with the tracks
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    filename = str(tmp_path / "tracks.parquet")
+    pq.write_table(
+        pa.Table.from_pandas(tracks.to_dataframe(), preserve_index=False),
+        filename,
+        row_group_size=333,
+    )
+    tracks = huracanpy.load(filename)
+
+    time_range = (np.datetime64("1950-01-01"), np.datetime64("1951-01-01"))
+    tracks_subset = huracanpy.load(
+        filename, time_range=time_range, keep_whole_tracks=keep_whole_tracks
+    )
+
+    in_range = (tracks.time >= time_range[0]) & (tracks.time <= time_range[1])
+    if keep_whole_tracks:
+        in_range = tracks.track_id.isin(tracks.track_id[in_range])
+    _assert_dataset_identical(tracks_subset, tracks.isel(record=in_range.values))
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        huracanpy.example_CHAZ_file,
+        huracanpy.example_MIT_file,
+        huracanpy.example_ERA20C_file,
+        huracanpy._test_non_ragged_netcdf_file,
+    ],
+)
+def test_load_lazy(filename):
+    pytest.importorskip("dask")
+    tracks = huracanpy.load(filename)
+    tracks_lazy = huracanpy.load(filename, lazy=True)
+
+    # Check that the data is still lazy after subsetting
+    track_ids = np.unique(tracks.track_id)[:2]
+    tracks_subset = huracanpy.sel_id(tracks_lazy, tracks_lazy.track_id, track_ids)
+    assert tracks_subset.lat.chunks is not None
+
+    _assert_dataset_identical(tracks, tracks_lazy.load())
+
+
+@pytest.mark.parametrize("track_id_prefix", [None, "{}_"])
+def test_load_n_workers(track_id_prefix):
+    filenames = [
+        huracanpy.example_csv_file,
+        huracanpy.example_year_file,
+        huracanpy.example_csv_file,
+    ]
+    tracks = huracanpy.load(filenames, track_id_prefix=track_id_prefix)
+    tracks_parallel = huracanpy.load(
+        filenames, track_id_prefix=track_id_prefix, n_workers=2
+    )
+
+    xr.testing.assert_identical(tracks, tracks_parallel)
+
+
+def test_load_multiple_no_match():
+    filenames = [huracanpy.example_csv_file, huracanpy.example_csv_file]
+    tracks = huracanpy.load(filenames, time_range=("2000-01-01", None))
+
+    assert tracks.sizes["record"] == 0
+    assert set(tracks.data_vars) == set(huracanpy.load(filenames[0]).data_vars)
+
+
+def test_load_track_gz(tmp_path):
+    filename = str(tmp_path / "tracks.gz")
+    with (
+        open(huracanpy.example_TRACK_file, "rb") as f_in,
+        gzip.open(filename, "wb") as f_out,
+    ):
+        shutil.copyfileobj(f_in, f_out)
+
+    tracks = huracanpy.load(huracanpy.example_TRACK_file, source="TRACK")
+    tracks_gz = huracanpy.load(filename, source="TRACK")
+
+    xr.testing.assert_identical(tracks, tracks_gz)
+
+
+def test_load_track_missing_tracks(tmp_path):
+    filename = str(tmp_path / "tracks.txt")
+    with open(huracanpy.example_TRACK_file) as f:
+        lines = f.readlines()
+    with open(filename, "w") as f:
+        # Only write the first track
+        f.writelines(lines[: 3 + 2 + 17])
+
+    with pytest.warns(UserWarning, match="Found 1 tracks but expected 2"):
+        tracks = huracanpy.load(filename, source="TRACK")
+
+    assert len(tracks.time) == 17
+    assert (tracks.track_id == 840).all()
+
+
+@pytest.mark.parametrize(
+    ("filename", "kwargs"),
+    [
+        (huracanpy.example_TRACK_file, dict(source="TRACK")),
+        (huracanpy.example_csv_file, dict()),
+        (huracanpy.example_parquet_file, dict()),
+        (huracanpy.example_TE_file, dict(source="tempestextremes")),
+        (huracanpy.example_CHAZ_file, dict()),
+        (huracanpy.example_ERA20C_file, dict()),
+        (huracanpy._test_non_ragged_netcdf_file, dict()),
+        (huracanpy.example_WiTRACK_file, dict(source="witrack")),
+        (huracanpy.example_IRIS_file, dict(source="iris")),
+        ([huracanpy.example_csv_file, huracanpy.example_year_file], dict()),
+    ],
+)
+@pytest.mark.parametrize("chunk_tracks", [1, 2, 1000])
+def test_load_chunk_tracks(filename, kwargs, chunk_tracks, monkeypatch):
+    # Read a small number of records at a time to check tracks are not split
+    from huracanpy._data import _load
+
+    monkeypatch.setattr(_load, "records_per_read", 7)
+
+    tracks = huracanpy.load(filename, **kwargs)
+    chunks = list(huracanpy.load(filename, chunk_tracks=chunk_tracks, **kwargs))
+
+    ntracks = [len(np.unique(chunk.track_id)) for chunk in chunks]
+    assert all(0 < n <= chunk_tracks for n in ntracks)
+    if isinstance(filename, str):
+        # Only the last chunk can be smaller. For a list of files, chunks don't span
+        # multiple files
+        assert all(n == chunk_tracks for n in ntracks[:-1])
+    assert sum(ntracks) == len(np.unique(tracks.track_id))
+
+    for chunk in chunks:
+        assert chunk.track_id.attrs["cf_role"] == "trajectory_id"
+
+    xr.testing.assert_identical(xr.concat(chunks, dim="record"), tracks)
+
+
 @pytest.mark.parametrize(
     ("filename", "source"),
     [
@@ -240,12 +802,12 @@ def test_load_baselon():
         (None, "ibtracs"),
     ],
 )
-@pytest.mark.parametrize("extension", ["csv", "nc"])
+@pytest.mark.parametrize("extension", ["csv", "nc", "parquet", "feather", "zarr"])
 @pytest.mark.parametrize(
     ("muddle", "use_accessor"), [(False, False), (True, False), (False, True)]
 )
 def test_save(filename, source, extension, muddle, use_accessor, tmp_path):
-    if extension == "csv" and (
+    if extension not in ["nc", "zarr"] and (
         filename == huracanpy.example_TRACK_tilt_file
         or (filename is not None and filename.split(".")[-1] == "nc")
     ):
@@ -254,6 +816,8 @@ def test_save(filename, source, extension, muddle, use_accessor, tmp_path):
             " dataframe leads to having rows equal to the product of the dimensions"
             " even though the dimensions cover different variables"
         )
+    if extension == "zarr":
+        pytest.importorskip("zarr")
     data = _load_with_checked_warnings(filename, source=source)
 
     # Check that save/load gives the same result when the track_id is not monotonic
@@ -275,12 +839,141 @@ def test_save(filename, source, extension, muddle, use_accessor, tmp_path):
 
     # Reload the data and check it is still the same
     # Saving as netcdf does force sorting by track_id so apply this
-    if extension == "nc":
+    if extension in ["nc", "zarr"]:
         data = data.sortby("track_id")
     data_reload = huracanpy.load(filename)
     _assert_dataset_identical(data, data_reload)
 
 
+@pytest.mark.parametrize("extension", ["csv", "nc"])
+def test_save_ragged(extension, tmp_path):
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    tracks_ragged = huracanpy.load(
+        huracanpy.example_ERA20C_file, netcdf_stretch_track_id=False
+    )
+
+    filename = str(tmp_path / f"tmp_file.{extension}")
+    huracanpy.save(tracks_ragged, filename)
+    tracks_reload = huracanpy.load(filename)
+
+    if extension == "nc":
+        _assert_dataset_identical(tracks, tracks_reload)
+    else:
+        # Coordinates, attributes, and float precision are not kept in CSV files, so
+        # just check the track_id has been stretched back out
+        np.testing.assert_array_equal(tracks.track_id, tracks_reload.track_id)
+        np.testing.assert_array_equal(tracks.time, tracks_reload.time)
+
+
+def test_save_parquet_row_groups(tmp_path):
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    tracks["basin"] = ("record", np.where(tracks.lon > 300, "NA", "EP"))
+
+    filename = str(tmp_path / "tmp_file.parquet")
+    huracanpy.save(tracks, filename, row_group_size=100)
+
+    # Each row group should contain whole tracks
+    parquet_file = pq.ParquetFile(filename)
+    assert parquet_file.num_row_groups > 1
+    track_ids = [
+        parquet_file.read_row_group(n, columns=["track_id"]).column(0).to_numpy()
+        for n in range(parquet_file.num_row_groups)
+    ]
+    for track_ids_1, track_ids_2 in zip(track_ids[:-1], track_ids[1:]):
+        assert track_ids_1[-1] != track_ids_2[0]
+
+    # Strings are dictionary encoded and statistics are stored for filtering
+    assert pa.types.is_dictionary(parquet_file.schema_arrow.field("basin").type)
+    assert parquet_file.metadata.row_group(0).column(0).statistics.has_min_max
+
+    tracks_reload = huracanpy.load(filename)
+    np.testing.assert_array_equal(tracks_reload.basin, tracks.basin)
+
+
+def test_save_zarr_append(tmp_path):
+    pytest.importorskip("zarr")
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    track_ids = np.unique(tracks.track_id)
+
+    filename = str(tmp_path / "tmp_file.zarr")
+    huracanpy.save(
+        huracanpy.sel_id(tracks, tracks.track_id, track_ids[:5]),
+        filename,
+        record_chunks=50,
+    )
+    huracanpy.save(
+        huracanpy.sel_id(tracks, tracks.track_id, track_ids[5:]), filename, append=True
+    )
+
+    _assert_dataset_identical(tracks, huracanpy.load(filename))
+
+    # Appending the same tracks again would duplicate the track IDs
+    with pytest.raises(ValueError, match="are already in"):
+        huracanpy.save(tracks, filename, append=True)
+
+
+def test_save_zarr_append_partial(tmp_path):
+    pytest.importorskip("zarr")
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    track_ids = np.unique(tracks.track_id)
+
+    filename = str(tmp_path / "tmp_file.zarr")
+    huracanpy.save(huracanpy.sel_id(tracks, tracks.track_id, track_ids[:5]), filename)
+
+    # Different variables are rejected before anything is written
+    new_tracks = huracanpy.sel_id(tracks, tracks.track_id, track_ids[5:])
+    with pytest.raises(ValueError, match="Can't append"):
+        huracanpy.save(new_tracks.drop_vars("psl"), filename, append=True)
+    with pytest.raises(ValueError, match="different dtypes"):
+        huracanpy.save(
+            new_tracks.assign(psl=new_tracks.psl.astype(np.float32)),
+            filename,
+            append=True,
+        )
+    with pytest.raises(ValueError, match="different dtypes"):
+        huracanpy.save(
+            new_tracks.assign(track_id=new_tracks.track_id.str.pad(9)),
+            filename,
+            append=True,
+        )
+    _assert_dataset_identical(
+        huracanpy.sel_id(tracks, tracks.track_id, track_ids[:5]),
+        huracanpy.load(filename),
+    )
+
+    # Points written without their tracks, as if an append was interrupted
+    new_tracks.drop_vars("track_id").to_zarr(filename, append_dim="record")
+    with pytest.raises(ValueError, match="partially written"):
+        huracanpy.load(filename)
+    with pytest.raises(ValueError, match="partially written"):
+        huracanpy.save(new_tracks, filename, append=True)
+
+
+@pytest.mark.parametrize("extension", ["csv", "nc", "parquet", "feather", "zarr"])
+def test_save_categorical(extension, tmp_path):
+    if extension == "zarr":
+        pytest.importorskip("zarr")
+    tracks = huracanpy.load(huracanpy.example_csv_file)
+    tracks["basin"] = huracanpy.info.basin(tracks.lon, tracks.lat, categorical=True)
+    tracks["hemisphere"] = huracanpy.info.hemisphere(tracks.lat, categorical=True)
+
+    filename = str(tmp_path / f"tmp_file.{extension}")
+    huracanpy.save(tracks, filename)
+    tracks_reload = huracanpy.load(filename)
+
+    for var in ["basin", "hemisphere"]:
+        if extension == "csv":
+            # Saved as labels
+            np.testing.assert_array_equal(
+                tracks_reload[var], huracanpy.decode_categories(tracks[var])
+            )
+        else:
+            np.testing.assert_array_equal(tracks_reload[var], tracks[var])
+            assert list(tracks_reload[var].attrs["categories"]) == list(
+                tracks[var].attrs["categories"]
+            )
+
+
 def test_save_fails(tracks_csv):
     with pytest.raises(NotImplementedError, match="File format not recognized"):
         huracanpy.save(tracks_csv, "filename.unsupported_extension")
@@ -39,6 +39,19 @@ def test_category_strings(tracks_csv):
     assert np.count_nonzero(result == "high") == 40
 
 
+def test_category_categorical(tracks_csv):
+    result = huracanpy.info.category(
+        tracks_csv.wind10,
+        bins=[0, 10, 20, 30],
+        labels=["low", "med", "high"],
+        categorical=True,
+    )
+
+    assert result.attrs["categories"] == ["low", "med", "high"]
+    assert np.count_nonzero(result == 1) == 59
+    assert np.count_nonzero(result == 2) == 40
+
+
 _expected = np.array(
     [
         7,
@@ -22,6 +22,10 @@ def test_hemisphere(data, expected, request):
     result = huracanpy.info.hemisphere(data.lat)
     np.testing.assert_equal(result, expected)
 
+    result = huracanpy.info.hemisphere(data.lat, categorical=True)
+    assert result.attrs["categories"] == ["N", "S"]
+    np.testing.assert_equal(huracanpy.decode_categories(result), expected)
+
 
 # Same answer for -180-180 and 0-360
 _expected = np.asarray(
@@ -52,6 +56,10 @@ def test_basin(data, expected, request):
 
     np.testing.assert_equal(result, expected)
 
+    result = huracanpy.info.basin(data.lon, data.lat, categorical=True)
+    assert result.attrs["categories"] == [*sorted(huracanpy.basins["WMO-TC"].index), ""]
+    np.testing.assert_equal(huracanpy.decode_categories(result), expected)
+
 
 @pytest.mark.parametrize(
     ("convention", "expected"),
@@ -1,5 +1,7 @@
 import pathlib
 
+import numpy as np
+import pandas as pd
 import pytest
 import xarray as xr
 
@@ -18,3 +20,94 @@ def test_interpolate_time(tracks_csv, prog_bar):
     del expected.track_id.attrs["cf_role"]
 
     xr.testing.assert_allclose(result, expected)
+
+
+def test_interpolate_time_missing_values(tracks_csv):
+    # Missing values should only affect the interpolation between the neighbouring
+    # points
+    tracks = tracks_csv.copy(deep=True)
+    tracks.slp[[5, 40, 41]] = np.nan
+
+    result = huracanpy.interp_time(tracks, tracks.track_id)
+
+    # Compare to interpolating each track separately with xarray
+    expected = xr.concat(
+        [
+            track.set_coords("time")
+            .swap_dims({"record": "time"})
+            .interp(
+                time=pd.date_range(
+                    track.time.values[0], track.time.values[-1], freq="1h"
+                )
+            )
+            .swap_dims({"time": "record"})
+            .reset_coords("time")
+            for _, track in tracks.groupby("track_id")
+        ],
+        dim="record",
+    )
+
+    assert np.isnan(result.slp).sum() == np.isnan(expected.slp).sum()
+    xr.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize(
+    ("lon", "expected"),
+    [
+        ([179.0, -179.0], [179.0, 179.5, -180.0, -179.5, -179.0]),
+        ([359.0, 1.0], [359.0, 359.5, 0.0, 0.5, 1.0]),
+        ([10.0, 12.0], [10.0, 10.5, 11.0, 11.5, 12.0]),
+    ],
+)
+def test_interpolate_time_dateline(lon, expected):
+    tracks = xr.Dataset(
+        dict(
+            track_id=("record", [0, 0]),
+            lon=("record", lon),
+            time=("record", np.array(["2000-01-01T00", "2000-01-01T04"], "M8[ns]")),
+        )
+    )
+
+    result = huracanpy.interp_time(tracks, tracks.track_id)
+
+    np.testing.assert_allclose(result.lon, expected)
+
+
+@pytest.mark.parametrize(
+    ("method_non_numeric", "expected"),
+    [
+        ("nearest", ["a", "a", "a", "c", "c", "c", "c", "b"]),
+        ("previous", ["a", "a", "a", "a", "a", "a", "c", "b"]),
+    ],
+)
+def test_interpolate_time_non_numeric(method_non_numeric, expected):
+    # Tracks and times out of order, with a string variable
+    tracks = xr.Dataset(
+        dict(
+            track_id=("record", [1, 0, 0]),
+            wind=("record", [5, 40, 10]),
+            name=("record", ["b", "c", "a"]),
+            time=(
+                "record",
+                np.array(["2000-01-01T00", "2000-01-01T06", "2000-01-01T00"], "M8[ns]"),
+            ),
+        )
+    )
+
+    result = huracanpy.interp_time(
+        tracks, tracks.track_id, method_non_numeric=method_non_numeric
+    )
+
+    np.testing.assert_array_equal(result.track_id, [0] * 7 + [1])
+    np.testing.assert_array_equal(result.wind, [10, 15, 20, 25, 30, 35, 40, 5])
+    np.testing.assert_array_equal(result.name, expected)
+
+
+def test_interpolate_time_fails(tracks_csv):
+    with pytest.raises(ValueError, match="freq must be a fixed frequency"):
+        huracanpy.interp_time(tracks_csv, tracks_csv.track_id, freq="MS")
+
+    with pytest.raises(ValueError, match="method_non_numeric must be"):
+        huracanpy.interp_time(
+            tracks_csv, tracks_csv.track_id, method_non_numeric="linear"
+        )
@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+import xarray as xr
 
 import huracanpy
 
@@ -35,6 +36,49 @@ def test_sel_id_array(tracks_csv):
     assert npoints == len(tracks_csv.record)
 
 
+def test_sel_id_unsorted(tracks_csv):
+    # Tracks that are not contiguous give the same records as checking every record
+    rng = np.random.default_rng(0)
+    tracks = tracks_csv.isel(record=rng.permutation(len(tracks_csv.record)))
+
+    for track_id in [0, [2, 0], [1, 5], 5]:
+        expected = tracks.isel(record=np.isin(tracks.track_id, track_id))
+        result = huracanpy.sel_id(tracks, tracks.track_id, track_id)
+        xr.testing.assert_identical(result, expected)
+
+
+def test_sel_id_view(tracks_csv):
+    # A contiguous track is a view of the original data
+    tracks_subset = huracanpy.sel_id(tracks_csv, tracks_csv.track_id, 1)
+
+    assert np.shares_memory(tracks_subset.lon.values, tracks_csv.lon.values)
+    xr.testing.assert_identical(
+        tracks_subset, tracks_csv.isel(record=tracks_csv.track_id == 1)
+    )
+
+
+def test_sel_id_ragged():
+    tracks = huracanpy.load(huracanpy.example_ERA20C_file)
+    tracks_ragged = huracanpy.load(
+        huracanpy.example_ERA20C_file, netcdf_stretch_track_id=False
+    )
+    assert tracks_ragged.track_id.dims == ("trajectory",)
+
+    track_ids = np.unique(tracks.track_id)[[5, 1, 3]]
+    tracks_subset = huracanpy.sel_id(tracks, tracks.track_id, track_ids)
+    tracks_ragged_subset = huracanpy.sel_id(
+        tracks_ragged, tracks_ragged.track_id, track_ids
+    )
+
+    assert tracks_ragged_subset.rowSize.sum() == len(tracks_subset.record)
+    np.testing.assert_array_equal(
+        np.repeat(tracks_ragged_subset.track_id, tracks_ragged_subset.rowSize),
+        tracks_subset.track_id,
+    )
+    for var in tracks_subset.drop_vars("track_id"):
+        np.testing.assert_array_equal(tracks_subset[var], tracks_ragged_subset[var])
+
+
 def test_trackswhere():
     tracks = huracanpy.load(huracanpy.example_csv_file)
 
@@ -47,6 +91,74 @@ def test_trackswhere():
     assert set(tracks_subset.track_id.data) == {0, 2}
 
 
+@pytest.mark.parametrize(
+    ("reductions", "op", "value", "expected"),
+    [
+        (dict(category="max"), ">=", 2, {0, 2}),
+        (dict(lat="min"), ">", -40, {0}),
+        (dict(lat="max", category="max"), "<", 2, {1}),
+        (dict(time="count"), "==", 0, set()),
+    ],
+)
+def test_trackswhere_reductions(reductions, op, value, expected):
+    tracks = huracanpy.load(huracanpy.example_csv_file)
+    tracks["category"] = huracanpy.tc.pressure_category(tracks.slp, slp_units="Pa")
+
+    tracks_subset = huracanpy.trackswhere(
+        tracks, tracks.track_id, reductions=reductions, op=op, value=value
+    )
+
+    assert set(tracks_subset.track_id.data) == expected
+    for track_id in expected:
+        xr.testing.assert_identical(
+            huracanpy.sel_id(tracks_subset, tracks_subset.track_id, track_id),
+            huracanpy.sel_id(tracks, tracks.track_id, track_id),
+        )
+
+
+def test_trackswhere_reductions_ragged(tracks_csv, tmp_path):
+    filename = str(tmp_path / "tracks.nc")
+    huracanpy.save(tracks_csv, filename)
+    tracks = huracanpy.load(filename)
+    tracks_ragged = huracanpy.load(filename, netcdf_stretch_track_id=False)
+
+    result = huracanpy.trackswhere(
+        tracks_ragged,
+        tracks_ragged.track_id,
+        reductions=dict(lat="min"),
+        op="<",
+        value=-40,
+    )
+    expected = huracanpy.trackswhere(
+        tracks, tracks.track_id, reductions=dict(lat="min"), op="<", value=-40
+    )
+
+    np.testing.assert_array_equal(result.track_id, [1, 2])
+    np.testing.assert_array_equal(
+        np.repeat(result.track_id, result.rowSize), expected.track_id
+    )
+    for var in expected.drop_vars("track_id"):
+        np.testing.assert_array_equal(result[var], expected[var])
+
+
+def test_trackswhere_reductions_names(tracks_csv):
+    # Variables can have the same names as the other arguments
+    tracks = tracks_csv.assign(value=tracks_csv.lat, op=tracks_csv.lat)
+
+    result = huracanpy.trackswhere(
+        tracks,
+        tracks.track_id,
+        reductions=dict(value="max", op="max"),
+        op=">",
+        value=-30,
+    )
+    expected = huracanpy.trackswhere(
+        tracks, tracks.track_id, reductions=dict(lat="max"), op=">", value=-30
+    )
+
+    xr.testing.assert_identical(result, expected)
+
+
 def test_trackswhere_fails(tracks_csv):
     with pytest.raises(ValueError, match="track_ids must be 1d"):
         huracanpy.trackswhere(
@@ -54,3 +166,25 @@ def test_trackswhere_fails(tracks_csv):
             np.asarray([tracks_csv.track_id.values, tracks_csv.track_id.values]),
             lambda track: (track.track_id == 0).all(),
         )
+
+    with pytest.raises(ValueError, match="Use either condition or reductions"):
+        huracanpy.trackswhere(
+            tracks_csv,
+            tracks_csv.track_id,
+            lambda track: (track.track_id == 0).all(),
+            reductions=dict(lat="max"),
+            op=">",
+            value=0,
+        )
+
+    with pytest.raises(ValueError, match="Either condition or reductions"):
+        huracanpy.trackswhere(tracks_csv, tracks_csv.track_id)
+
+    with pytest.raises(ValueError, match="op must be one of"):
+        huracanpy.trackswhere(
+            tracks_csv,
+            tracks_csv.track_id,
+            reductions=dict(lat="max"),
+            op="=>",
+            value=0,
+        )
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+import huracanpy
+
+
+def test_track_index(tracks_csv):
+    index = huracanpy.track_index(tracks_csv.track_id)
+
+    np.testing.assert_array_equal(index.track_ids, [0, 1, 2])
+    assert index.contiguous
+    assert index.lengths.sum() == len(tracks_csv.record)
+    for track_id, start, length in zip(index.track_ids, index.starts, index.lengths):
+        track = tracks_csv.track_id.values[start : start + length]
+        np.testing.assert_array_equal(track, track_id)
+
+    np.testing.assert_array_equal(index.inverse, tracks_csv.track_id)
+    np.testing.assert_array_equal(index.transitions, index.ends[:-1])
+
+
+def test_track_index_not_contiguous():
+    track_ids = np.array([3, 3, 1, 1, 3, 2])
+    index = huracanpy.track_index(track_ids)
+
+    assert not index.contiguous
+    np.testing.assert_array_equal(index.track_ids, [1, 2, 3])
+    np.testing.assert_array_equal(index.starts, [2, 5, 0])
+    np.testing.assert_array_equal(index.ends, [3, 5, 4])
+    np.testing.assert_array_equal(index.transitions, [1, 3, 4])
+    np.testing.assert_array_equal(index.find([3, 4, 1]), [2, -1, 0])
+    np.testing.assert_array_equal(index.records([3, 2]), [0, 1, 4, 5])
+
+
+def test_track_index_cached(tracks_csv):
+    index = tracks_csv.hrcn.track_index()
+    assert huracanpy.track_index(tracks_csv.track_id) is index
+
+    # A new track_id gives a new index
+    tracks_csv["track_id"] = tracks_csv.track_id + 1
+    new_index = tracks_csv.hrcn.track_index()
+    assert new_index is not index
+    np.testing.assert_array_equal(new_index.track_ids, [1, 2, 3])
+
+
+def test_track_index_missing_ids():
+    # Records with a missing track ID are not part of any track, like xarray groupby
+    track_ids = np.array([np.nan, 1.0, 1.0, np.nan, 0.0, np.nan])
+    index = huracanpy.track_index(track_ids)
+
+    np.testing.assert_array_equal(index.track_ids, [0, 1])
+    np.testing.assert_array_equal(index.lengths, [1, 2])
+    np.testing.assert_array_equal(index.inverse, [-1, 1, 1, -1, 0, -1])
+    np.testing.assert_array_equal(index.transitions, [0, 2, 3, 4])
+    np.testing.assert_array_equal(
+        index.expand([10, 20]), [np.nan, 20, 20, np.nan, 10, np.nan]
+    )
+    np.testing.assert_array_equal(index.find([np.nan, 1.0]), [-1, 1])
+    np.testing.assert_array_equal(index.records([0, 1]), [1, 2, 4])
+    np.testing.assert_array_equal(index.reduce(np.arange(6), "sum"), [4, 3])
+
+
+def test_track_index_missing_ids_sum_by(tracks_csv):
+    sum_by = (tracks_csv.lat // 10).where(tracks_csv.lat > -40)
+
+    result = huracanpy.tc.ace(tracks_csv.wind10, sum_by=sum_by)
+    expected = huracanpy.tc.ace(tracks_csv.wind10).groupby(sum_by).sum()
+
+    xr.testing.assert_allclose(result, expected)
+
+
+def test_track_index_rowsize():
+    # Tracks stored as a ragged array, unsorted, with an empty track and a missing ID
+    track_ids = np.array([3.0, np.nan, 1.0, 4.0, 2.0])
+    rowsize = np.array([2, 1, 2, 0, 3])
+    index = huracanpy.track_index(track_ids, rowsize=rowsize)
+    expected = huracanpy.track_index(np.repeat(track_ids, rowsize))
+
+    for attr in ["track_ids", "starts", "lengths", "offsets", "order", "inverse"]:
+        np.testing.assert_array_equal(getattr(index, attr), getattr(expected, attr))
+    assert index.size == expected.size
+    assert huracanpy.track_index(track_ids, rowsize=rowsize) is index
+
+
+@pytest.mark.parametrize(
+    ("stat", "expected"),
+    [("max", [1, 3, 6]), ("min", [0, 4, 6])],
+)
+def test_track_index_arg_extreme(stat, expected):
+    index = huracanpy.track_index([0, 0, 0, 1, 1, 1, 2])
+    # Ties give the first point, and NaNs are ignored unless the track is all NaN
+    values = np.array([1.0, 2.0, 2.0, 5.0, 0.0, np.nan, np.nan])
+
+    np.testing.assert_array_equal(index.arg_extreme(values, stat=stat), expected)
+
+
+@pytest.mark.parametrize(
+    ("how", "expected"),
+    [
+        ("max", [4.0, np.nan, 1.0]),
+        ("min", [3.0, np.nan, 1.0]),
+        ("sum", [7.0, 0.0, 1.0]),
+        ("mean", [3.5, np.nan, 1.0]),
+        ("count", [2, 0, 1]),
+        ("first", [3.0, np.nan, 1.0]),
+        ("last", [np.nan, np.nan, np.nan]),
+    ],
+)
+def test_track_index_reduce(how, expected):
+    index = huracanpy.track_index([2, 2, 0, 0, 0, 1])
+    values = np.array([1.0, np.nan, 3.0, 4.0, np.nan, np.nan])
+
+    with np.errstate(invalid="ignore"):
+        result = index.reduce(values, how)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_track_index_fails():
+    with pytest.raises(ValueError, match="track_ids must be 1d"):
+        huracanpy.track_index(np.zeros((2, 2)))
+
+    with pytest.raises(ValueError, match="median is not a valid reduction"):
+        huracanpy.track_index([0, 0, 1]).reduce([1, 2, 3], "median")